@@ -1,6 +1,10 @@
 """API routes."""
+from app.api.changes import router as changes_router
+from app.api.feed import router as feed_router
 from app.api.grades import router as grades_router
+from app.api.health import router as health_router
+from app.api.reports import router as reports_router
 from app.api.students import router as students_router
 
-__all__ = ["students_router", "grades_router"]
+__all__ = ["students_router", "grades_router", "feed_router", "changes_router", "health_router", "reports_router"]
 
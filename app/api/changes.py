@@ -0,0 +1,41 @@
+"""Change feed API routes."""
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.admission import admit_read
+from app.core.database import get_db
+from app.core.timeouts import query_timeout
+from app.core.tracing import TracedRoute
+from app.schemas.change import ChangePage
+from app.services.change import list_changes
+
+router = APIRouter(prefix="/changes", tags=["changes"], route_class=TracedRoute)
+
+
+@router.get(
+    "",
+    response_model=ChangePage,
+    dependencies=[Depends(admit_read), Depends(query_timeout("list_changes"))],
+)
+async def list_changes_endpoint(
+    cursor: str | None = Query(
+        None,
+        description="next_cursor of the previous page; omit to start from the beginning",
+    ),
+    limit: int = Query(
+        100,
+        ge=1,
+        le=1000,
+        description="Maximum number of changes per page (1-1000)",
+    ),
+    db: AsyncSession = Depends(get_db),
+) -> ChangePage:
+    """
+    List students and grades created after a cursor, for incremental sync.
+    
+    Returns 400 for a malformed cursor, 503 when the read limiter is saturated.
+    """
+    try:
+        return await list_changes(db, cursor=cursor, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
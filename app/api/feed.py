@@ -0,0 +1,93 @@
+"""Live feed routes (Server-Sent Events and WebSocket)."""
+import asyncio
+import json
+from collections.abc import AsyncIterator
+
+from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+
+from app.core.broadcast import Subscription, grade_feed
+from app.core.config import settings
+from app.core.tenancy import Tenant, resolve_tenant
+
+router = APIRouter(prefix="/feed", tags=["feed"])
+
+KEEPALIVE = b": keepalive\n\n"
+
+
+async def sse_events(subscription: Subscription, heartbeat: float) -> AsyncIterator[bytes]:
+    """
+    Encode a subscription as a Server-Sent Events stream.
+    
+    Sends a "dropped" event with the number of missed events when the
+    subscriber fell behind, and a comment line after heartbeat seconds of
+    silence so proxies keep the connection open and disconnects are noticed.
+    """
+    while True:
+        try:
+            event = await asyncio.wait_for(subscription.get(), heartbeat)
+        except asyncio.TimeoutError:
+            yield KEEPALIVE
+            continue
+        if event is None:
+            return
+        dropped = subscription.take_dropped()
+        if dropped:
+            yield f"event: dropped\ndata: {json.dumps({'count': dropped})}\n\n".encode()
+        yield event.sse
+
+
+@router.get("/grades", response_class=StreamingResponse)
+async def grade_events(tenant: Tenant | None = Depends(resolve_tenant)) -> StreamingResponse:
+    """
+    Stream grades as they are committed, as Server-Sent Events.
+    
+    Each grade is a "grade" event whose data is the GradeResponse JSON.
+    Only grades committed after the connection opens are sent, and only
+    those added through this worker (for the same tenant).
+    """
+    async def stream() -> AsyncIterator[bytes]:
+        with grade_feed.subscribe(tenant.id if tenant else None) as subscription:
+            async for chunk in sse_events(subscription, settings.feed_heartbeat_interval):
+                yield chunk
+    
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _close_on_disconnect(websocket: WebSocket, subscription: Subscription) -> None:
+    # Client messages are ignored; receiving is how a close is noticed while idle
+    try:
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        subscription.close()
+
+
+@router.websocket("/grades/ws")
+async def grade_socket(websocket: WebSocket, tenant: Tenant | None = Depends(resolve_tenant)) -> None:
+    """
+    Push grades as they are committed over a WebSocket.
+    
+    Each grade is one text message {"event": "grade", "data": GradeResponse};
+    {"event": "dropped", "data": {"count": n}} reports events missed by a
+    slow client.
+    """
+    await websocket.accept()
+    with grade_feed.subscribe(tenant.id if tenant else None) as subscription:
+        watcher = asyncio.create_task(_close_on_disconnect(websocket, subscription))
+        try:
+            while (event := await subscription.get()) is not None:
+                dropped = subscription.take_dropped()
+                if dropped:
+                    await websocket.send_text(json.dumps({"event": "dropped", "data": {"count": dropped}}))
+                await websocket.send_text(event.ws)
+        except WebSocketDisconnect:
+            pass
+        finally:
+            watcher.cancel()
@@ -1,18 +1,28 @@
 """Grade API routes."""
 import uuid
+from datetime import datetime
+from typing import Literal
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.admission import admit_read, admit_write
 from app.core.database import get_db
-from app.schemas.grade import GradeCreate, GradeCreateBody, GradeResponse
-from app.services.grade import add_grade
+from app.core.timeouts import query_timeout
+from app.core.tracing import TracedRoute
+from app.schemas.grade import GradeCreate, GradeCreateBody, GradePage, GradeResponse
+from app.services.grade import add_grade, decode_history_cursor, list_student_grades
 
-router = APIRouter(prefix="/students", tags=["grades"])
+router = APIRouter(prefix="/students", tags=["grades"], route_class=TracedRoute)
 
 
-@router.post("/{student_id}/grades", response_model=GradeResponse, status_code=201)
+@router.post(
+    "/{student_id}/grades",
+    response_model=GradeResponse,
+    status_code=201,
+    dependencies=[Depends(admit_write), Depends(query_timeout("create_grade"))],
+)
 async def create_grade(
     student_id: uuid.UUID,
     grade_data: GradeCreateBody,
@@ -21,7 +31,8 @@ async def create_grade(
     """
     Add a grade for a student.
     
-    Returns 201 on success, 404 if student not found, 400 on validation/database errors.
+    Returns 201 on success, 404 if student not found, 400 on validation/database errors,
+    503 when the write limiter is saturated.
     """
     # Create grade data with student_id from path parameter
     grade_create = GradeCreate(
@@ -41,3 +52,44 @@ async def create_grade(
             detail="Database integrity error. Check constraint violation (score must be 0-100).",
         )
 
+
+@router.get(
+    "/{student_id}/grades",
+    response_model=GradePage,
+    dependencies=[Depends(admit_read), Depends(query_timeout("list_grades"))],
+)
+async def list_grades(
+    student_id: uuid.UUID,
+    cursor: str | None = Query(
+        None,
+        description="next_cursor of the previous page; omit for the first page",
+    ),
+    since: datetime | None = Query(None, description="Only grades created at or after this time"),
+    until: datetime | None = Query(None, description="Only grades created before this time"),
+    order: Literal["asc", "desc"] = Query("desc", description="desc for newest first"),
+    limit: int = Query(
+        100,
+        ge=1,
+        le=1000,
+        description="Maximum number of grades per page (1-1000)",
+    ),
+    db: AsyncSession = Depends(get_db),
+) -> GradePage:
+    """
+    List a student's grades, newest first by default.
+    
+    Returns 404 if student not found, 400 for a malformed cursor,
+    503 when the read limiter is saturated.
+    """
+    try:
+        after = decode_history_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    try:
+        return await list_student_grades(
+            db, student_id, after=after, since=since, until=until, order=order, limit=limit
+        )
+    except ValueError as e:
+        # Student not found
+        raise HTTPException(status_code=404, detail=str(e))
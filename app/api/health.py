@@ -0,0 +1,53 @@
+"""Liveness, readiness and event-loop API routes."""
+from fastapi import APIRouter, Request, Response
+
+from app.core.admission import read_limiter, write_limiter
+from app.core.database import shard_engines
+from app.core.health import loop_lag_monitor
+from app.core.tracing import TracedRoute
+from app.schemas.health import Liveness, LoopStats, Readiness
+from app.services.health import loop_stats, readiness
+
+router = APIRouter(prefix="/health", tags=["health"], route_class=TracedRoute)
+
+
+@router.get("/live", response_model=Liveness)
+async def liveness_endpoint() -> Liveness:
+    """
+    Liveness probe: the process is up and its event loop answers.
+    
+    Never touches the database, so a slow database does not get the worker
+    restarted.
+    """
+    return Liveness()
+
+
+@router.get("/ready", response_model=Readiness)
+async def readiness_endpoint(request: Request, response: Response) -> Readiness:
+    """
+    Readiness probe: database ping, pool and admission saturation, loop lag.
+    
+    Returns 503 with the same report when any check fails, so load
+    balancers stop routing to a saturated worker until it recovers.
+    Bypasses admission control: a saturated worker must still answer.
+    Also reports the worker's startup timings.
+    """
+    report = await readiness(
+        shard_engines,
+        [read_limiter, write_limiter],
+        getattr(request.app.state, "startup_timings", None),
+    )
+    if not report.ready:
+        response.status_code = 503
+    return report
+
+
+@router.get("/loop", response_model=LoopStats)
+async def loop_endpoint() -> LoopStats:
+    """
+    Event-loop lag metrics: last and largest lag, and recent stalls.
+    
+    With LOOP_DEBUG each stall carries the stack of the code that blocked
+    the loop. Bypasses admission control, like the other probes.
+    """
+    return loop_stats(loop_lag_monitor)
@@ -0,0 +1,90 @@
+"""Report job API routes."""
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse
+
+from app.core.admission import admit_read
+from app.core.config import settings
+from app.core.reports import ReportQueueFull
+from app.core.tenancy import Tenant, resolve_tenant
+from app.core.tracing import TracedRoute
+from app.schemas.report import ReportCreate, ReportJob
+from app.services.report import get_report, report_path, submit_report
+
+router = APIRouter(prefix="/reports", tags=["reports"], route_class=TracedRoute)
+
+
+@router.post(
+    "",
+    response_model=ReportJob,
+    status_code=202,
+    dependencies=[Depends(admit_read)],
+)
+async def submit_report_endpoint(
+    report: ReportCreate,
+    tenant: Tenant | None = Depends(resolve_tenant),
+) -> ReportJob:
+    """
+    Start building a report in the background.
+    
+    Returns 202 with the job; poll GET /reports/{job_id} until its status is
+    done, then fetch /reports/{job_id}/download. Returns 503 when this
+    worker has too many unfinished report jobs.
+    """
+    try:
+        return await submit_report(report.kind, tenant)
+    except ReportQueueFull as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(settings.admission_retry_after)},
+        )
+
+
+@router.get(
+    "/{job_id}",
+    response_model=ReportJob,
+    dependencies=[Depends(admit_read)],
+)
+async def get_report_endpoint(
+    job_id: uuid.UUID,
+    tenant: Tenant | None = Depends(resolve_tenant),
+) -> ReportJob:
+    """
+    Status of a report job.
+    
+    Returns 404 if the job is unknown or its files have expired.
+    """
+    try:
+        return await get_report(job_id, tenant)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.get(
+    "/{job_id}/download",
+    response_class=FileResponse,
+    dependencies=[Depends(admit_read)],
+)
+async def download_report(
+    job_id: uuid.UUID,
+    tenant: Tenant | None = Depends(resolve_tenant),
+) -> FileResponse:
+    """
+    Download a finished report as CSV.
+    
+    Served from its file, with sendfile where the server supports it.
+    Returns 404 if the job is unknown or expired, 409 while it is not done.
+    """
+    try:
+        job = await get_report(job_id, tenant)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    if job.status != "done":
+        raise HTTPException(status_code=409, detail=f"Report job {job_id} is {job.status}")
+    return FileResponse(
+        report_path(job_id, tenant),
+        media_type="text/csv",
+        filename=f"{job.kind}-{job_id}.csv",
+    )
@@ -1,20 +1,31 @@
 """Student API routes."""
+import uuid
 from typing import Literal
 
 
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.admission import admit_read, admit_write
 from app.core.database import get_db
-from app.schemas.student import StudentCreate, StudentResponse
-from app.services.student import create_student, list_students_with_avg
+from app.core.timeouts import query_timeout
+from app.core.tracing import TracedRoute
+from app.schemas.student import StudentCreate, StudentPercentile, StudentResponse, student_fields_list
+from app.services.student import count_students, create_student, list_student_fields, list_students_with_avg, student_percentile
 
-router = APIRouter(prefix="/students", tags=["students"])
+router = APIRouter(prefix="/students", tags=["students"], route_class=TracedRoute)
 
+_FIELD = "(id|name|created_at|avg_grade)"
 
-@router.post("", response_model=StudentResponse, status_code=201)
+
+@router.post(
+    "",
+    response_model=StudentResponse,
+    status_code=201,
+    dependencies=[Depends(admit_write), Depends(query_timeout("create_student"))],
+)
 async def create_student_endpoint(
     student_data: StudentCreate,
     db: AsyncSession = Depends(get_db),
@@ -22,7 +33,8 @@ async def create_student_endpoint(
     """
     Create a new student.
     
-    Returns 201 on success, 400 on validation/database errors.
+    Returns 201 on success, 400 on validation/database errors,
+    503 when the write limiter is saturated.
     """
     try:
         return await create_student(db, student_data)
@@ -34,8 +46,13 @@ async def create_student_endpoint(
         )
 
 
-@router.get("", response_model=list[StudentResponse])
+@router.get(
+    "",
+    response_model=list[StudentResponse],
+    dependencies=[Depends(admit_read), Depends(query_timeout("list_students"))],
+)
 async def list_students(
+    response: Response,
     min_avg_grade: float | None = Query(
         None,
         ge=0,
@@ -61,14 +78,47 @@ async def list_students(
         ge=0,
         description="Number of results to skip for pagination (0-based)",
     ),
+    include_total: bool = Query(
+        False,
+        description="Return the total number of matching students in the X-Total-Count header",
+    ),
+    fields: str | None = Query(
+        None,
+        pattern=f"^{_FIELD}(,{_FIELD})*$",
+        description="Comma-separated subset of id, name, created_at, avg_grade to return",
+    ),
     db: AsyncSession = Depends(get_db),
 ) -> list[StudentResponse]:
     """
     List students with their average grades.
     
-    Supports filtering, sorting, and pagination.
-    Returns empty list if no students match criteria.
+    Supports filtering, sorting, pagination and sparse fieldsets.
+    Returns empty list if no students match criteria,
+    503 when the read limiter is saturated.
     """
+    headers = {}
+    if include_total:
+        total = await count_students(db, min_avg_grade=min_avg_grade)
+        headers["X-Total-Count"] = str(total)
+    
+    if fields is not None:
+        # Sparse fieldset: bypass response_model so only requested keys are sent
+        rows = await list_student_fields(
+            session=db,
+            fields=tuple(dict.fromkeys(fields.split(","))),
+            min_avg_grade=min_avg_grade,
+            sort_by=sort_by,
+            order=order,
+            limit=limit,
+            offset=offset,
+        )
+        return Response(
+            content=student_fields_list.dump_json(rows),
+            media_type="application/json",
+            headers=headers,
+        )
+    
+    response.headers.update(headers)
     return await list_students_with_avg(
         session=db,
         min_avg_grade=min_avg_grade,
@@ -78,3 +128,23 @@ async def list_students(
         offset=offset,
     )
 
+
+@router.get(
+    "/{student_id}/percentile",
+    response_model=StudentPercentile,
+    dependencies=[Depends(admit_read), Depends(query_timeout("student_percentile"))],
+)
+async def get_student_percentile(
+    student_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+) -> StudentPercentile:
+    """
+    Percentile rank of a student's average grade among graded students.
+    
+    Returns 404 if student not found, 503 when the read limiter is saturated.
+    avg_grade and percentile_rank are null for students without grades.
+    """
+    try:
+        return await student_percentile(db, student_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
@@ -0,0 +1 @@
+"""Command-line tools (run with ``python -m app.cli``)."""
@@ -0,0 +1,288 @@
+"""Command-line entry point: ``python -m app.cli <command> ...``."""
+import argparse
+import asyncio
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+from app.core.config import settings
+
+
+def _utc_datetime(value: str) -> datetime:
+    # created_at is stored as naive UTC; convert offsets rather than drop them
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        return parsed
+    return parsed.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _print_progress(progress) -> None:
+    print(
+        f"\r{progress.kind}: {progress.rows:,} rows committed "
+        f"({progress.rows_per_second:,.0f} rows/s)",
+        end="",
+        file=sys.stderr,
+        flush=True,
+    )
+
+
+def _print_seed_progress(progress) -> None:
+    print(
+        f"\r{progress.students:,} students, {progress.grades:,} grades "
+        f"({progress.rows_per_second:,.0f} rows/s)",
+        end="",
+        file=sys.stderr,
+        flush=True,
+    )
+
+
+def _print_archive_progress(progress) -> None:
+    print(
+        f"\r{progress.grades:,} grades archived in {progress.batches:,} batches "
+        f"({progress.rows_per_second:,.0f} rows/s)",
+        end="",
+        file=sys.stderr,
+        flush=True,
+    )
+
+
+async def run_import(args: argparse.Namespace) -> int:
+    """Run the bulk importer."""
+    from sqlalchemy.ext.asyncio import create_async_engine
+    
+    from app.cli.importer import RecordError, import_file
+    from app.core.migrations import SchemaOutdatedError, ensure_schema
+    
+    if settings.shard_database_urls:
+        print("error: bulk import does not support sharded storage (SHARD_DATABASE_URLS)", file=sys.stderr)
+        return 1
+    
+    engine = create_async_engine(args.database_url)
+    try:
+        await ensure_schema(engine, auto_migrate=False)
+        inserted = await import_file(
+            engine,
+            args.path,
+            args.kind,
+            fmt=args.format,
+            batch_size=args.batch_size,
+            resume=not args.no_resume,
+            rebuild_indexes=args.rebuild_indexes,
+            progress=None if args.quiet else _print_progress,
+        )
+    except SchemaOutdatedError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    except RecordError as e:
+        print(f"\nerror: {e}. Fix the input and re-run to resume.", file=sys.stderr)
+        return 1
+    finally:
+        await engine.dispose()
+    
+    print(f"\nimported {inserted:,} {args.kind}", file=sys.stderr)
+    return 0
+
+
+async def run_seed(args: argparse.Namespace) -> int:
+    """Generate a synthetic fixture database."""
+    from app.cli.seed import SeedSpec, seed_database
+    
+    spec = SeedSpec(
+        students=args.students,
+        grades_per_student=args.grades_per_student,
+        grade_distribution=args.grade_distribution,
+        score_mean=args.score_mean,
+        score_concentration=args.score_concentration,
+        score_noise=args.score_noise,
+        days=args.days,
+        seed=args.seed,
+    )
+    try:
+        result = await seed_database(
+            args.path,
+            spec,
+            batch_size=args.batch_size,
+            progress=None if args.quiet else _print_seed_progress,
+        )
+    except FileExistsError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    
+    print(
+        f"\nseeded {result.students:,} students and {result.grades:,} grades "
+        f"into {args.path} in {result.elapsed:.1f}s",
+        file=sys.stderr,
+    )
+    return 0
+
+
+async def run_archive(args: argparse.Namespace) -> int:
+    """Fold grades older than the cutoff into summaries, on every shard."""
+    from sqlalchemy.ext.asyncio import create_async_engine
+    
+    from app.cli.archive import archive_grades
+    from app.core.migrations import SchemaOutdatedError, ensure_schema
+    
+    archive_engine = None
+    if args.archive_db is not None:
+        archive_engine = create_async_engine(f"sqlite+aiosqlite:///{args.archive_db}")
+    status = 0
+    try:
+        for url in [args.database_url, *settings.shard_database_urls]:
+            engine = create_async_engine(url)
+            try:
+                await ensure_schema(engine, auto_migrate=False)
+                result = await archive_grades(
+                    engine,
+                    args.before,
+                    archive_engine=archive_engine,
+                    batch_size=args.batch_size,
+                    pause=args.pause,
+                    progress=None if args.quiet else _print_archive_progress,
+                )
+            except SchemaOutdatedError as e:
+                print(f"error: {e}", file=sys.stderr)
+                status = 1
+                continue
+            finally:
+                await engine.dispose()
+            print(f"\n{engine.url!r}: archived {result.grades:,} grades", file=sys.stderr)
+    finally:
+        if archive_engine is not None:
+            await archive_engine.dispose()
+    return status
+
+
+async def run_migrate(args: argparse.Namespace) -> int:
+    """
+    Apply pending schema migrations to every shard, or only report with --check.
+    
+    With --tenant, provision those tenants' databases instead: created if
+    missing, then migrated.
+    """
+    from sqlalchemy.ext.asyncio import create_async_engine
+    
+    from app.core.migrations import LATEST_VERSION, get_schema_version, migrate
+    from app.core.tenancy import sqlite_file, tenant_database_url
+    
+    urls = [args.database_url, *settings.shard_database_urls]
+    if args.tenant:
+        if not settings.tenant_database_url:
+            print("error: --tenant needs TENANT_DATABASE_URL", file=sys.stderr)
+            return 1
+        try:
+            urls = [tenant_database_url(settings.tenant_database_url, tenant_id) for tenant_id in args.tenant]
+        except ValueError as e:
+            print(f"error: {e}", file=sys.stderr)
+            return 1
+    
+    status = 0
+    for url in urls:
+        path = sqlite_file(url) if args.tenant else None
+        if path is not None and not path.exists():
+            if args.check:
+                # Connecting would create the file
+                print(f"{url!r}: not provisioned")
+                status = 1
+                continue
+            path.parent.mkdir(parents=True, exist_ok=True)
+        engine = create_async_engine(url)
+        try:
+            current = await get_schema_version(engine)
+            if args.check:
+                print(f"{engine.url!r}: schema version {current}, latest {LATEST_VERSION}")
+                status = status or int(current != LATEST_VERSION)
+                continue
+            version = await migrate(engine)
+        finally:
+            await engine.dispose()
+        print(f"{engine.url!r}: schema version {current} -> {version}")
+    return status
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for all commands."""
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description=settings.api_title)
+    parser.add_argument(
+        "--database-url",
+        default=settings.database_url,
+        help="Database URL (default: DATABASE_URL setting)",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    migrator = commands.add_parser("migrate", help="Apply pending schema migrations")
+    migrator.add_argument(
+        "--check",
+        action="store_true",
+        help="Only report the schema version; exit 1 if migrations are pending",
+    )
+    migrator.add_argument(
+        "--tenant",
+        action="append",
+        metavar="ID",
+        help="Provision this tenant's database (TENANT_DATABASE_URL) instead of the shards; repeatable",
+    )
+    migrator.set_defaults(handler=run_migrate)
+    
+    importer = commands.add_parser("import", help="Bulk import students or grades from CSV/JSONL")
+    importer.add_argument("kind", choices=["students", "grades"])
+    importer.add_argument("path", type=Path)
+    importer.add_argument("--format", choices=["csv", "jsonl"], help="Default: from file suffix")
+    importer.add_argument("--batch-size", type=int, default=10_000, help="Rows per INSERT/commit")
+    importer.add_argument("--no-resume", action="store_true", help="Ignore an existing checkpoint")
+    importer.add_argument(
+        "--rebuild-indexes",
+        action="store_true",
+        help="Drop the table's indexes before loading and recreate them afterwards",
+    )
+    importer.add_argument("--quiet", action="store_true", help="Do not report progress")
+    importer.set_defaults(handler=run_import)
+    
+    seeder = commands.add_parser("seed", help="Generate a synthetic SQLite database for performance testing")
+    seeder.add_argument("path", type=Path, help="Output database file (must not exist)")
+    seeder.add_argument("--students", type=int, default=1_000_000)
+    seeder.add_argument("--grades-per-student", type=float, default=10.0, help="Mean grades per student")
+    seeder.add_argument(
+        "--grade-distribution",
+        choices=["fixed", "uniform", "exponential"],
+        default="exponential",
+        help="Spread of grades per student (default: exponential, a long tail)",
+    )
+    seeder.add_argument("--score-mean", type=float, default=75.0, help="Mean student level (0-100)")
+    seeder.add_argument(
+        "--score-concentration",
+        type=float,
+        default=8.0,
+        help="Beta concentration of student levels; higher clusters them around the mean",
+    )
+    seeder.add_argument("--score-noise", type=float, default=8.0, help="Stddev of grades around a student's level")
+    seeder.add_argument("--days", type=int, default=365, help="Spread of created_at, ending now")
+    seeder.add_argument("--seed", type=int, default=0, help="Random seed (same seed, same data)")
+    seeder.add_argument("--batch-size", type=int, default=20_000, help="Students per transaction")
+    seeder.add_argument("--quiet", action="store_true", help="Do not report progress")
+    seeder.set_defaults(handler=run_seed)
+    
+    archiver = commands.add_parser("archive", help="Fold old grades into per-student summaries")
+    archiver.add_argument(
+        "--before",
+        type=_utc_datetime,
+        required=True,
+        help="Archive grades created before this date/time (ISO 8601, UTC unless it has an offset)",
+    )
+    archiver.add_argument("--archive-db", type=Path, help="Also copy archived grades to this SQLite file")
+    archiver.add_argument("--batch-size", type=int, default=1000, help="Grades per transaction")
+    archiver.add_argument("--pause", type=float, default=0.01, help="Seconds to yield to writers between batches")
+    archiver.add_argument("--quiet", action="store_true", help="Do not report progress")
+    archiver.set_defaults(handler=run_archive)
+    
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Parse arguments and run the selected command."""
+    args = build_parser().parse_args(argv)
+    return asyncio.run(args.handler(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
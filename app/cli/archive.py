@@ -0,0 +1,181 @@
+"""Grade archival: fold old grades into per-student summaries."""
+import asyncio
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import Row, case, delete, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Dialect
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.dal.counter import increment_counter
+from app.models.counter import ARCHIVED_GRADES, SUMMARIES_ENABLED, Counter
+from app.models.grade import Grade
+from app.models.grade_summary import GradeSummary
+
+
+@dataclass
+class ArchiveProgress:
+    """Progress of a running archival, passed to the progress callback."""
+    
+    grades: int
+    batches: int
+    elapsed: float
+    
+    @property
+    def rows_per_second(self) -> float:
+        return self.grades / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def _insert(dialect: Dialect):
+    # INSERT with ON CONFLICT support
+    return postgresql.insert if dialect.name == "postgresql" else sqlite.insert
+
+
+def _summary_upsert(dialect: Dialect):
+    """INSERT a summary row, or fold it into the existing one."""
+    table = GradeSummary.__table__
+    stmt = _insert(dialect)(table)
+    new = stmt.excluded
+    return stmt.on_conflict_do_update(
+        index_elements=[table.c.student_id],
+        set_={
+            "score_sum": table.c.score_sum + new.score_sum,
+            "score_count": table.c.score_count + new.score_count,
+            "score_min": case((new.score_min < table.c.score_min, new.score_min), else_=table.c.score_min),
+            "score_max": case((new.score_max > table.c.score_max, new.score_max), else_=table.c.score_max),
+            "archived_until": case(
+                (new.archived_until > table.c.archived_until, new.archived_until),
+                else_=table.c.archived_until,
+            ),
+        },
+    )
+
+
+async def _enable_summaries(engine: AsyncEngine, wait: float) -> None:
+    """
+    Switch workers over to averages that include grade_summaries.
+    
+    Sets the one-way summaries_enabled flag, then waits `wait` seconds so
+    every worker has re-read it before the first grade moves; otherwise a
+    worker could average without the summaries for a moment. Nothing to do
+    once the database has archived grades or the flag is set.
+    """
+    async with engine.begin() as conn:
+        enabled = await conn.execute(
+            select(func.sum(Counter.value)).where(Counter.name.in_([ARCHIVED_GRADES, SUMMARIES_ENABLED]))
+        )
+        if enabled.scalar():
+            return
+        updated = await conn.execute(update(Counter).where(Counter.name == SUMMARIES_ENABLED).values(value=1))
+        if not updated.rowcount:
+            # Databases created before the flag existed
+            await conn.execute(insert(Counter).values(name=SUMMARIES_ENABLED, value=1))
+    await asyncio.sleep(wait)
+
+
+def summarize(rows: Sequence[Row]) -> list[dict[str, Any]]:
+    """Summary rows (one per student) for deleted (student_id, score, created_at) rows."""
+    summaries: dict[Any, dict[str, Any]] = {}
+    for student_id, score, created_at in rows:
+        summary = summaries.get(student_id)
+        if summary is None:
+            summaries[student_id] = {
+                "student_id": student_id,
+                "score_sum": score,
+                "score_count": 1,
+                "score_min": score,
+                "score_max": score,
+                "archived_until": created_at,
+            }
+            continue
+        summary["score_sum"] += score
+        summary["score_count"] += 1
+        summary["score_min"] = min(summary["score_min"], score)
+        summary["score_max"] = max(summary["score_max"], score)
+        summary["archived_until"] = max(summary["archived_until"], created_at)
+    return list(summaries.values())
+
+
+async def archive_grades(
+    engine: AsyncEngine,
+    cutoff: datetime,
+    archive_engine: AsyncEngine | None = None,
+    batch_size: int = 1000,
+    pause: float = 0.01,
+    progress: Callable[[ArchiveProgress], None] | None = None,
+    switch_wait: float | None = None,
+) -> ArchiveProgress:
+    """
+    Move grades created before cutoff into grade_summaries.
+    
+    Works oldest first through the created_at index, batch_size grades at a
+    time. Each batch is deleted with RETURNING and folded into its students'
+    summary rows in one short transaction, so averages (which combine
+    summaries and live grades) never change, not even mid-run, and writers
+    wait for at most one batch; pause seconds between batches let them in.
+    
+    With archive_engine the full rows are copied there first, ignoring rows
+    already present, so an interrupted run can simply be repeated. Caches
+    are left alone: no average changes. Archived grades leave the change
+    feed.
+    
+    The first archival of a database first switches the workers over to
+    the summaries and waits switch_wait seconds (default
+    settings.archive_check_interval) for them to notice.
+    """
+    grades = Grade.__table__
+    batch = (
+        select(grades)
+        .where(grades.c.created_at < cutoff)
+        .order_by(grades.c.created_at)
+        .limit(batch_size)
+    )
+    upsert = _summary_upsert(engine.dialect)
+    if archive_engine is not None:
+        async with archive_engine.begin() as conn:
+            await conn.run_sync(grades.create, checkfirst=True)
+        copy = _insert(archive_engine.dialect)(grades).on_conflict_do_nothing()
+    
+    started = time.perf_counter()
+    archived = batches = 0
+    while True:
+        async with engine.connect() as conn:
+            rows = (await conn.execute(batch)).mappings().all()
+        if not rows:
+            break
+        if not batches:
+            await _enable_summaries(
+                engine, settings.archive_check_interval if switch_wait is None else switch_wait
+            )
+        
+        if archive_engine is not None:
+            async with archive_engine.begin() as conn:
+                await conn.execute(copy, [dict(row) for row in rows])
+        
+        async with engine.begin() as conn:
+            # Summarize what was actually deleted, whatever happened since the read
+            deleted = await conn.execute(
+                delete(grades)
+                .where(grades.c.id.in_([row["id"] for row in rows]))
+                .returning(grades.c.student_id, grades.c.score, grades.c.created_at)
+            )
+            summaries = summarize(deleted.all())
+            moved = sum(summary["score_count"] for summary in summaries)
+            if summaries:
+                await conn.execute(upsert, summaries)
+                await increment_counter(conn, ARCHIVED_GRADES, moved)
+        
+        archived += moved
+        batches += 1
+        if progress is not None:
+            progress(ArchiveProgress(archived, batches, time.perf_counter() - started))
+        if len(rows) < batch_size:
+            break
+        await asyncio.sleep(pause)
+    
+    return ArchiveProgress(archived, batches, time.perf_counter() - started)
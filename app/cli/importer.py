@@ -0,0 +1,231 @@
+"""Streaming bulk import of students and grades from CSV/JSONL files."""
+import csv
+import json
+import os
+import time
+import uuid
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from itertools import islice
+from pathlib import Path
+from typing import Any, Literal
+
+from sqlalchemy import Table, insert
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.core.ids import new_id
+from app.dal.counter import increment_counter
+from app.models.counter import DATA_VERSION, STUDENT_COUNT
+from app.models.grade import Grade
+from app.models.student import Student
+
+Kind = Literal["students", "grades"]
+Format = Literal["csv", "jsonl"]
+
+TABLES: dict[Kind, Table] = {
+    "students": Student.__table__,
+    "grades": Grade.__table__,
+}
+
+
+class RecordError(ValueError):
+    """Raised when an input record cannot be imported."""
+    
+    def __init__(self, line: int, message: str) -> None:
+        super().__init__(f"record {line}: {message}")
+        self.line = line
+
+
+@dataclass
+class ImportProgress:
+    """Progress of a running import, passed to the progress callback."""
+    
+    kind: Kind
+    rows: int  # committed so far, including earlier resumed runs
+    inserted: int  # committed by this run
+    elapsed: float
+    
+    @property
+    def rows_per_second(self) -> float:
+        return self.inserted / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def detect_format(path: Path) -> Format:
+    """Infer the input format from the file suffix."""
+    if path.suffix.lower() in (".jsonl", ".ndjson"):
+        return "jsonl"
+    return "csv"
+
+
+def read_records(path: Path, fmt: Format) -> Iterator[dict[str, Any]]:
+    """Yield raw records one at a time without loading the file into memory."""
+    with path.open(newline="", encoding="utf-8") as f:
+        if fmt == "csv":
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def _parse_timestamp(value: Any, default: datetime) -> datetime:
+    if value in (None, ""):
+        return default
+    parsed = datetime.fromisoformat(value)
+    # created_at is stored in UTC; SQLite drops offsets instead of converting
+    if parsed.tzinfo is None:
+        return parsed
+    return parsed.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def parse_student(record: dict[str, Any], line: int, now: datetime) -> dict[str, Any]:
+    """Convert a raw record to a students row."""
+    name = (record.get("name") or "").strip()
+    if not 1 <= len(name) <= 100:
+        raise RecordError(line, "name must be 1-100 characters")
+    try:
+        return {
+            "id": uuid.UUID(record["id"]) if record.get("id") else new_id(),
+            "name": name,
+            "created_at": _parse_timestamp(record.get("created_at"), now),
+        }
+    except (TypeError, ValueError) as e:
+        raise RecordError(line, f"invalid student ({e})") from e
+
+
+def parse_grade(record: dict[str, Any], line: int, now: datetime) -> dict[str, Any]:
+    """Convert a raw record to a grades row."""
+    try:
+        row = {
+            "id": uuid.UUID(record["id"]) if record.get("id") else new_id(),
+            "student_id": uuid.UUID(str(record["student_id"])),
+            "score": int(record["score"]),
+            "created_at": _parse_timestamp(record.get("created_at"), now),
+        }
+    except (KeyError, TypeError, ValueError) as e:
+        raise RecordError(line, f"invalid grade ({e})") from e
+    if not 0 <= row["score"] <= 100:
+        raise RecordError(line, "score must be 0-100")
+    return row
+
+
+PARSERS: dict[Kind, Callable[[dict[str, Any], int, datetime], dict[str, Any]]] = {
+    "students": parse_student,
+    "grades": parse_grade,
+}
+
+
+def parse_records(
+    records: Iterable[dict[str, Any]],
+    kind: Kind,
+    first_line: int = 1,
+) -> Iterator[dict[str, Any]]:
+    """Validate and convert raw records into table rows."""
+    parse = PARSERS[kind]
+    now = datetime.now(timezone.utc)
+    for line, record in enumerate(records, start=first_line):
+        yield parse(record, line, now)
+
+
+def batched(rows: Iterable[dict[str, Any]], size: int) -> Iterator[list[dict[str, Any]]]:
+    """Group rows into lists of at most size rows."""
+    iterator = iter(rows)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def checkpoint_path(path: Path) -> Path:
+    """Location of the resume checkpoint for an input file."""
+    return path.with_name(path.name + ".checkpoint")
+
+
+def read_checkpoint(path: Path) -> int:
+    """Return the number of records already committed for an input file."""
+    try:
+        return int(json.loads(checkpoint_path(path).read_text())["rows"])
+    except FileNotFoundError:
+        return 0
+
+
+def write_checkpoint(path: Path, rows: int) -> None:
+    """Atomically record the number of committed records."""
+    target = checkpoint_path(path)
+    tmp = target.with_name(target.name + ".tmp")
+    tmp.write_text(json.dumps({"rows": rows}))
+    os.replace(tmp, target)
+
+
+async def drop_indexes(conn: AsyncConnection, table: Table) -> None:
+    """Drop a table's secondary indexes ahead of a bulk load."""
+    for index in table.indexes:
+        await conn.run_sync(index.drop, checkfirst=True)
+
+
+async def create_indexes(conn: AsyncConnection, table: Table) -> None:
+    """Create a table's secondary indexes that do not exist."""
+    for index in table.indexes:
+        await conn.run_sync(index.create, checkfirst=True)
+
+
+async def import_file(
+    engine: AsyncEngine,
+    path: Path,
+    kind: Kind,
+    fmt: Format | None = None,
+    batch_size: int = 10_000,
+    resume: bool = True,
+    rebuild_indexes: bool = False,
+    progress: Callable[[ImportProgress], None] | None = None,
+) -> int:
+    """
+    Stream a file into the students or grades table.
+    
+    Records flow through a generator pipeline (read -> parse -> batch), so
+    memory is bounded by batch_size. Each batch is one executemany INSERT
+    committed in its own transaction, after which a checkpoint next to the
+    input file records how far the load got. With resume=True a later run
+    skips the records already committed.
+    
+    With rebuild_indexes=True the table's secondary indexes are dropped for
+    the load and recreated afterwards, whether or not it succeeds.
+    
+    Returns the number of rows inserted by this run.
+    
+    Note: grades must reference students that already exist.
+    """
+    table = TABLES[kind]
+    fmt = fmt or detect_format(path)
+    skip = read_checkpoint(path) if resume else 0
+    
+    records = islice(read_records(path, fmt), skip, None)
+    batches = batched(parse_records(records, kind, first_line=skip + 1), batch_size)
+    
+    if rebuild_indexes:
+        async with engine.begin() as conn:
+            await drop_indexes(conn, table)
+    
+    inserted = 0
+    started = time.perf_counter()
+    try:
+        for batch in batches:
+            async with engine.begin() as conn:
+                # One change feed position per row, allocated before the insert
+                last_seq = await increment_counter(conn, DATA_VERSION, len(batch))
+                for seq, row in enumerate(batch, start=last_seq - len(batch) + 1):
+                    row["change_seq"] = seq
+                await conn.execute(insert(table), batch)
+                if kind == "students":
+                    await increment_counter(conn, STUDENT_COUNT, len(batch))
+            inserted += len(batch)
+            write_checkpoint(path, skip + inserted)
+            if progress is not None:
+                progress(ImportProgress(kind, skip + inserted, inserted, time.perf_counter() - started))
+    finally:
+        # Also after a failed load: the table must never be left without them
+        if rebuild_indexes:
+            async with engine.begin() as conn:
+                await create_indexes(conn, table)
+    
+    checkpoint_path(path).unlink(missing_ok=True)
+    return inserted
@@ -0,0 +1,187 @@
+"""Synthetic dataset generation for performance testing."""
+import random
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Literal
+
+from sqlalchemy import insert, update
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+
+from app.cli.importer import batched, create_indexes, drop_indexes
+from app.core.ids import seeded_id
+from app.core.migrations import migrate
+from app.models.counter import DATA_VERSION, STUDENT_COUNT, Counter
+from app.models.grade import Grade
+from app.models.student import Student
+
+GradeDistribution = Literal["fixed", "uniform", "exponential"]
+
+FIRST_NAMES = (
+    "Ada", "Alan", "Barbara", "Claude", "Donald", "Edsger", "Frances", "Grace",
+    "Hedy", "Ivan", "John", "Katherine", "Leslie", "Margaret", "Niklaus", "Radia",
+)
+LAST_NAMES = (
+    "Allen", "Backus", "Cerf", "Dijkstra", "Floyd", "Hamilton", "Hopper", "Kay",
+    "Knuth", "Lamport", "Liskov", "Lovelace", "Perlman", "Ritchie", "Turing", "Wirth",
+)
+
+# Applied to the load connection only. With the journal off a crash leaves a
+# corrupt file, which is acceptable for a fixture that is deleted on failure.
+LOAD_PRAGMAS = (
+    "PRAGMA journal_mode = OFF",
+    "PRAGMA synchronous = OFF",
+    "PRAGMA locking_mode = EXCLUSIVE",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -262144",  # 256 MiB
+)
+
+
+@dataclass
+class SeedSpec:
+    """Size and distributions of a generated dataset."""
+    
+    students: int
+    grades_per_student: float = 10.0
+    grade_distribution: GradeDistribution = "exponential"
+    score_mean: float = 75.0
+    score_concentration: float = 8.0  # higher: student averages closer to score_mean
+    score_noise: float = 8.0  # stddev of single grades around the student's level
+    days: int = 365  # created_at spread, ending now
+    seed: int = 0
+
+
+@dataclass
+class SeedProgress:
+    """Progress of a running seed, passed to the progress callback."""
+    
+    students: int
+    grades: int
+    elapsed: float
+    
+    @property
+    def rows_per_second(self) -> float:
+        rows = self.students + self.grades
+        return rows / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def _grade_count(rng: random.Random, spec: SeedSpec) -> int:
+    mean = spec.grades_per_student
+    if spec.grade_distribution == "fixed":
+        return round(mean)
+    if spec.grade_distribution == "uniform":
+        return rng.randint(0, round(2 * mean))
+    # Long tail: most students have a few grades, some have many
+    return int(rng.expovariate(1 / (mean + 0.5))) if mean > 0 else 0
+
+
+def generate(spec: SeedSpec, now: datetime) -> Iterator[tuple[dict[str, Any], list[dict[str, Any]]]]:
+    """
+    Yield (student row, grade rows) pairs, reproducible for a given seed.
+    
+    Each student gets a level drawn from a beta distribution with mean
+    score_mean (left-skewed for high means, as real grades are), and each
+    grade scatters around that level with score_noise. Students are created
+    uniformly over the last spec.days days; their grades fall between their
+    creation and now.
+    """
+    rng = random.Random(spec.seed)
+    mean = min(max(spec.score_mean / 100, 0.01), 0.99)
+    alpha, beta = mean * spec.score_concentration, (1 - mean) * spec.score_concentration
+    span = timedelta(days=spec.days).total_seconds()
+    
+    for _ in range(spec.students):
+        created_at = now - timedelta(seconds=rng.random() * span)
+        student = {
+            "id": seeded_id(rng, created_at),
+            "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            "created_at": created_at,
+        }
+        level = 100 * rng.betavariate(alpha, beta)
+        age = (now - created_at).total_seconds()
+        grades = []
+        for _ in range(_grade_count(rng, spec)):
+            graded_at = created_at + timedelta(seconds=rng.random() * age)
+            grades.append({
+                "id": seeded_id(rng, graded_at),
+                "student_id": student["id"],
+                "score": min(100, max(0, round(rng.gauss(level, spec.score_noise)))),
+                "created_at": graded_at,
+            })
+        yield student, grades
+
+
+async def _insert(conn: AsyncConnection, table, rows: list[dict[str, Any]], next_seq: int, batch_size: int) -> int:
+    for batch in batched(rows, batch_size):
+        for seq, row in enumerate(batch, start=next_seq):
+            row["change_seq"] = seq
+        next_seq += len(batch)
+        await conn.execute(insert(table), batch)
+    return next_seq
+
+
+async def seed_database(
+    path: Path,
+    spec: SeedSpec,
+    batch_size: int = 20_000,
+    progress: Callable[[SeedProgress], None] | None = None,
+) -> SeedProgress:
+    """
+    Generate a SQLite database file at path with the current schema.
+    
+    Rows are written with executemany INSERTs of batch_size students (plus
+    their grades) per transaction, with journaling and fsync disabled and
+    secondary indexes dropped during the load; indexes are rebuilt and
+    ANALYZE run at the end. Counters and change_seq are filled in as if the
+    rows had been written through the API, so the file can be served or
+    copied as a benchmark fixture. The file is removed if the load fails.
+    
+    Raises FileExistsError if path exists.
+    """
+    if path.exists():
+        raise FileExistsError(f"{path} already exists")
+    
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    tables = (Student.__table__, Grade.__table__)
+    now = datetime.now(timezone.utc)
+    try:
+        await migrate(engine)
+        started = time.perf_counter()
+        students = grades = 0
+        next_seq = 1
+        async with engine.connect() as conn:
+            for pragma in LOAD_PRAGMAS:
+                await conn.exec_driver_sql(pragma)
+            await conn.commit()
+            
+            async with conn.begin():
+                for table in tables:
+                    await drop_indexes(conn, table)
+            
+            for chunk in batched(generate(spec, now), batch_size):
+                student_rows = [student for student, _ in chunk]
+                grade_rows = [grade for _, student_grades in chunk for grade in student_grades]
+                async with conn.begin():
+                    # Students first so the change feed never shows a grade before its student
+                    next_seq = await _insert(conn, Student.__table__, student_rows, next_seq, batch_size)
+                    next_seq = await _insert(conn, Grade.__table__, grade_rows, next_seq, batch_size)
+                students += len(student_rows)
+                grades += len(grade_rows)
+                if progress is not None:
+                    progress(SeedProgress(students, grades, time.perf_counter() - started))
+            
+            async with conn.begin():
+                await conn.execute(update(Counter).where(Counter.name == STUDENT_COUNT).values(value=students))
+                await conn.execute(update(Counter).where(Counter.name == DATA_VERSION).values(value=next_seq - 1))
+                for table in tables:
+                    await create_indexes(conn, table)
+                await conn.exec_driver_sql("ANALYZE")
+            await conn.exec_driver_sql("PRAGMA journal_mode = DELETE")
+    except BaseException:
+        await engine.dispose()
+        path.unlink(missing_ok=True)
+        raise
+    await engine.dispose()
+    return SeedProgress(students, grades, time.perf_counter() - started)
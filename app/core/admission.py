@@ -0,0 +1,125 @@
+"""Admission control for database-bound routes."""
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator, Callable
+
+from fastapi import HTTPException
+
+from app.core.config import settings
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request cannot be admitted in time."""
+
+
+class AdmissionLimiter:
+    """
+    Concurrency limit with a bounded, deadline-limited wait queue.
+    
+    At most max_concurrent requests hold a slot. Up to max_queue more wait
+    for one in FIFO order, each for at most wait_timeout seconds. Anything
+    beyond that is rejected immediately, so under overload requests fail
+    fast instead of piling up on the database and inflating latency for
+    everyone already admitted.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        max_concurrent: int,
+        max_queue: int,
+        wait_timeout: float,
+    ) -> None:
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.wait_timeout = wait_timeout
+        self.active = 0
+        self.rejected = 0
+        self._waiters: deque[asyncio.Future] = deque()
+    
+    @property
+    def waiting(self) -> int:
+        """Number of requests currently queued for a slot."""
+        return len(self._waiters)
+    
+    async def acquire(self) -> None:
+        """Take a slot, waiting in the queue if needed. Raises AdmissionRejected."""
+        if self.active < self.max_concurrent and not self._waiters:
+            self.active += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            self.rejected += 1
+            raise AdmissionRejected(f"Too many concurrent {self.name} requests")
+        
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            # release() hands its slot directly to the waiter, so active is
+            # already accounted for when the future completes
+            await asyncio.wait_for(waiter, self.wait_timeout)
+        except asyncio.TimeoutError:
+            self._discard(waiter)
+            self.rejected += 1
+            raise AdmissionRejected(
+                f"Timed out waiting for a {self.name} slot after {self.wait_timeout}s"
+            ) from None
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # A slot was handed over just as we were cancelled
+                self.release()
+            else:
+                self._discard(waiter)
+            raise
+    
+    def release(self) -> None:
+        """Give the slot to the next live waiter, or free it."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+    
+    def _discard(self, waiter: asyncio.Future) -> None:
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+
+read_limiter = AdmissionLimiter(
+    "read",
+    max_concurrent=settings.read_max_concurrency,
+    max_queue=settings.read_max_queue,
+    wait_timeout=settings.admission_wait_timeout,
+)
+write_limiter = AdmissionLimiter(
+    "write",
+    max_concurrent=settings.write_max_concurrency,
+    max_queue=settings.write_max_queue,
+    wait_timeout=settings.admission_wait_timeout,
+)
+
+
+def admission(limiter: AdmissionLimiter) -> Callable[[], AsyncIterator[None]]:
+    """Build a route dependency that holds a limiter slot for the request."""
+    async def dependency() -> AsyncIterator[None]:
+        try:
+            await limiter.acquire()
+        except AdmissionRejected as e:
+            raise HTTPException(
+                status_code=503,
+                detail=str(e),
+                headers={"Retry-After": str(settings.admission_retry_after)},
+            )
+        try:
+            yield
+        finally:
+            limiter.release()
+    
+    return dependency
+
+
+admit_read = admission(read_limiter)
+admit_write = admission(write_limiter)
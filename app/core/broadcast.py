@@ -0,0 +1,114 @@
+"""In-process fan-out of events to live subscribers."""
+import asyncio
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import cached_property
+
+from app.core.config import settings
+
+
+@dataclass(frozen=True)
+class FeedEvent:
+    """One published event, serialized once and shared by every subscriber."""
+    
+    name: str
+    data: str  # JSON document
+    
+    @cached_property
+    def sse(self) -> bytes:
+        """Server-Sent Events frame, built on first use and then reused."""
+        return f"event: {self.name}\ndata: {self.data}\n\n".encode()
+    
+    @cached_property
+    def ws(self) -> str:
+        """WebSocket text message, built on first use and then reused."""
+        return f'{{"event": "{self.name}", "data": {self.data}}}'
+
+
+class Subscription:
+    """
+    Bounded queue of events for one subscriber.
+    
+    When the subscriber falls behind and the queue is full, the oldest event
+    is dropped to make room, so a slow consumer never blocks publishing or
+    grows memory. dropped counts the events it has missed.
+    """
+    
+    def __init__(self, max_queue: int) -> None:
+        self._queue: deque[FeedEvent] = deque(maxlen=max_queue)
+        self._ready = asyncio.Event()
+        self.dropped = 0
+        self.closed = False
+    
+    def push(self, event: FeedEvent) -> None:
+        """Queue an event without blocking, evicting the oldest when full."""
+        if len(self._queue) == self._queue.maxlen:
+            self.dropped += 1
+        self._queue.append(event)
+        self._ready.set()
+    
+    def close(self) -> None:
+        """Wake the consumer; get() returns None once the queue is drained."""
+        self.closed = True
+        self._ready.set()
+    
+    async def get(self) -> FeedEvent | None:
+        """Wait for the next event; None after close()."""
+        while not self._queue:
+            if self.closed:
+                return None
+            self._ready.clear()
+            await self._ready.wait()
+        return self._queue.popleft()
+    
+    def take_dropped(self) -> int:
+        """Return and reset the number of events dropped since the last call."""
+        dropped, self.dropped = self.dropped, 0
+        return dropped
+
+
+class Broadcaster:
+    """
+    Publish events to any number of subscribers of this worker.
+    
+    publish() only appends the same FeedEvent object to each subscriber's
+    queue: serialization (and SSE framing) happens once per event, not once
+    per subscriber, and publishing never waits on a consumer. With
+    multi-tenancy, subscribers only receive the events of their own tenant.
+    """
+    
+    def __init__(self, max_queue: int) -> None:
+        self.max_queue = max_queue
+        self._subscribers: dict[str | None, set[Subscription]] = {}
+    
+    @property
+    def subscribers(self) -> int:
+        """Number of active subscriptions, all tenants included."""
+        return sum(len(subscriptions) for subscriptions in self._subscribers.values())
+    
+    @contextmanager
+    def subscribe(self, tenant: str | None = None) -> Iterator[Subscription]:
+        """Subscribe to a tenant's events for the duration of the with block."""
+        subscription = Subscription(self.max_queue)
+        self._subscribers.setdefault(tenant, set()).add(subscription)
+        try:
+            yield subscription
+        finally:
+            subscriptions = self._subscribers[tenant]
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscribers[tenant]
+            subscription.close()
+    
+    def publish(self, name: str, data: str, tenant: str | None = None) -> FeedEvent:
+        """Fan a serialized event out to every subscriber of the tenant."""
+        event = FeedEvent(name, data)
+        for subscription in self._subscribers.get(tenant, ()):
+            subscription.push(event)
+        return event
+
+
+# Committed grades, published by the grade service
+grade_feed = Broadcaster(settings.feed_queue_size)
@@ -0,0 +1,96 @@
+"""In-process caches kept coherent across worker processes."""
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+from app.core.config import settings
+from app.core.tenancy import TenantLocal
+
+
+class VersionedCache:
+    """
+    LRU cache tied to the shared data version.
+    
+    Every write bumps the ``data_version`` counter in the database, in the
+    same transaction as the write. Before serving from the cache, callers read
+    that counter (one primary-key lookup) and pass it to ``validate``; if any
+    worker has written since the entries were stored, they are all dropped.
+    This needs no external services and works for SQLite and PostgreSQL alike.
+    """
+    
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self._version: int | None = None
+    
+    def validate(self, version: int) -> None:
+        """Drop all entries if the data version has moved since they were stored."""
+        if version != self._version:
+            self._entries.clear()
+            self._version = version
+    
+    def get(self, key: Hashable) -> Any | None:
+        """Return the cached value for key, or None on a miss."""
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+    
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entry when full."""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Drop all entries and forget the version."""
+        self._entries.clear()
+        self._version = None
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Results of list_students_with_avg, keyed by query parameters (per tenant)
+list_cache: VersionedCache = TenantLocal(lambda: VersionedCache(settings.list_cache_max_entries))
+
+# Filtered student counts, keyed by min_avg_grade (per tenant)
+count_cache: VersionedCache = TenantLocal(lambda: VersionedCache(settings.list_cache_max_entries))
+
+
+class ArchivedFlag:
+    """
+    Whether averages must include grade_summaries, as known to this worker.
+    
+    The flag only ever goes from false to true, and the archive command sets
+    it in the database and then waits archive_check_interval seconds before
+    it moves any grade. So while false it only needs re-reading that often,
+    and once true never again: list requests pay no extra query.
+    """
+    
+    def __init__(self) -> None:
+        self.archived = False
+        self._checked_at: float | None = None
+    
+    def known(self) -> bool | None:
+        """True or False if still valid, None when the database must be read."""
+        if self.archived:
+            return True
+        if self._checked_at is not None and time.monotonic() - self._checked_at < settings.archive_check_interval:
+            return False
+        return None
+    
+    def set(self, archived: bool) -> None:
+        """Record the value just read from the database."""
+        self.archived = archived
+        self._checked_at = time.monotonic()
+    
+    def clear(self) -> None:
+        """Forget what was read."""
+        self.archived = False
+        self._checked_at = None
+
+
+# Whether grades have been archived (per tenant)
+archived_flag: ArchivedFlag = TenantLocal(ArchivedFlag)
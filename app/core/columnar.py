@@ -0,0 +1,216 @@
+"""In-process columnar copy of students and their averages for list serving."""
+import uuid
+from array import array
+from bisect import bisect_left, insort
+from collections.abc import Callable, Iterable
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from typing import Any, Literal
+
+from app.core.tenancy import TenantLocal
+
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+
+SortBy = Literal["name", "avg_grade", "created_at"]
+
+
+def _micros(value: datetime) -> int:
+    # Aware values (PostgreSQL) are stored in UTC like SQLite's naive ones
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return (value - EPOCH) // MICROSECOND
+
+
+class ColumnarStore:
+    """
+    Students and their grade totals as parallel column arrays.
+    
+    Row i of every column describes one student: 16-byte ids, UTF-8 names in
+    one buffer with end offsets, created_at as int64 microseconds since the
+    epoch, and int64 score sums and grade counts (averages are sum / count).
+    Rows are only ever appended. Each sort key has a permutation of row
+    numbers kept in key order, ties broken by row number, so a list page
+    is a slice of a permutation (O(offset + limit)) and a min_avg_grade
+    threshold is a binary search in the average order.
+    
+    Like AverageIndex, it is only trusted for the data version it was built
+    at: writes by this worker are applied in place, any other write makes it
+    stale until the next rebuild.
+    """
+    
+    def __init__(self) -> None:
+        self.version: int | None = None
+        self.aware = False
+        self._ids = bytearray()
+        self._names = bytearray()
+        self._name_ends = array("q")
+        self._created = array("q")
+        self._sums = array("q")
+        self._counts = array("q")
+        self._orders: dict[str, array] = {}
+    
+    def _id_key(self, row: int) -> bytes:
+        return bytes(self._ids[16 * row:16 * row + 16])
+    
+    def _name(self, row: int) -> bytes:
+        start = self._name_ends[row - 1] if row else 0
+        return bytes(self._names[start:self._name_ends[row]])
+    
+    def _name_key(self, row: int) -> tuple[bytes, int]:
+        # UTF-8 byte order is code point order, as SQLite compares names
+        return self._name(row), row
+    
+    def _created_key(self, row: int) -> tuple[int, int]:
+        return self._created[row], row
+    
+    def _avg_key(self, row: int) -> tuple[bool, float, int]:
+        # Students without grades (NULL) first ascending, as in SQLite
+        count = self._counts[row]
+        return count > 0, self._sums[row] / count if count else 0.0, row
+    
+    def _keys(self) -> dict[str, Callable[[int], Any]]:
+        return {
+            "id": self._id_key,
+            "name": self._name_key,
+            "created_at": self._created_key,
+            "avg_grade": self._avg_key,
+        }
+    
+    def rebuild(
+        self,
+        students: Iterable[tuple[uuid.UUID, str, datetime]],
+        totals: Iterable[tuple[uuid.UUID, int, int]],
+        version: int,
+    ) -> None:
+        """Replace the contents from (id, name, created_at) and (student_id, score sum, grade count) rows."""
+        self.clear()
+        totals_by_id = {student_id: (total, count) for student_id, total, count in totals}
+        for student_id, name, created_at in students:
+            self._append(student_id, name, created_at, *totals_by_id.get(student_id, (0, 0)))
+        rows = range(len(self._created))
+        self._orders = {sort_by: array("q", sorted(rows, key=key)) for sort_by, key in self._keys().items()}
+        self.version = version
+    
+    def _append(self, student_id: uuid.UUID, name: str, created_at: datetime, total: int, count: int) -> int:
+        self.aware = created_at.tzinfo is not None
+        self._ids += student_id.bytes
+        self._names += name.encode()
+        self._name_ends.append(len(self._names))
+        self._created.append(_micros(created_at))
+        self._sums.append(total)
+        self._counts.append(count)
+        return len(self._created) - 1
+    
+    def _find(self, student_id: uuid.UUID) -> int | None:
+        order = self._orders["id"]
+        position = bisect_left(order, student_id.bytes, key=self._id_key)
+        if position < len(order) and self._id_key(order[position]) == student_id.bytes:
+            return order[position]
+        return None
+    
+    def apply_write(
+        self,
+        version: int,
+        student: tuple[uuid.UUID, str, datetime] | None = None,
+        student_id: uuid.UUID | None = None,
+        score: int | None = None,
+    ) -> None:
+        """
+        Account for one write committed at data version `version`.
+        
+        Pass student as (id, name, created_at) for a new student, or
+        student_id and score for a new grade. Applied only when it is the
+        very next version, otherwise someone else wrote in between and the
+        store is left stale.
+        """
+        if self.version is None or version != self.version + 1:
+            return
+        if student is not None:
+            row = self._append(*student, 0, 0)
+            for sort_by, key in self._keys().items():
+                insort(self._orders[sort_by], row, key=key)
+        if student_id is not None:
+            row = self._find(student_id)
+            if row is None:
+                # Unknown student: cannot be placed, reload on next read
+                self.version = None
+                return
+            order = self._orders["avg_grade"]
+            del order[bisect_left(order, self._avg_key(row), key=self._avg_key)]
+            self._sums[row] += score
+            self._counts[row] += 1
+            insort(order, row, key=self._avg_key)
+        self.version = version
+    
+    def _matching_start(self, min_avg_grade: float | None) -> int:
+        """Position in the average order of the first student passing the filter."""
+        if min_avg_grade is None:
+            return 0
+        return bisect_left(self._orders["avg_grade"], (True, min_avg_grade, -1), key=self._avg_key)
+    
+    def page(
+        self,
+        min_avg_grade: float | None,
+        sort_by: SortBy,
+        order: Literal["asc", "desc"],
+        limit: int,
+        offset: int,
+    ) -> list[int]:
+        """Row numbers of one list page, with list_students_with_avg semantics."""
+        rows = self._orders[sort_by]
+        if sort_by == "avg_grade" or min_avg_grade is None:
+            # Matching rows are a suffix of the average order, or all rows
+            start = self._matching_start(min_avg_grade if sort_by == "avg_grade" else None)
+            end = len(rows)
+            if order == "asc":
+                return list(rows[start + offset:min(end, start + offset + limit)])
+            return list(reversed(rows[max(start, end - offset - limit):max(start, end - offset)]))
+        
+        ordered = rows if order == "asc" else reversed(rows)
+        matching = (
+            row for row in ordered
+            if self._counts[row] and self._sums[row] / self._counts[row] >= min_avg_grade
+        )
+        return list(islice(matching, offset, offset + limit))
+    
+    def count(self, min_avg_grade: float | None = None) -> int:
+        """Number of students passing the min_avg_grade filter (all without one)."""
+        return len(self._created) - self._matching_start(min_avg_grade)
+    
+    def row(self, row: int) -> dict[str, Any]:
+        """Fields of one row: id, name, created_at and avg_grade."""
+        created_at = EPOCH + self._created[row] * MICROSECOND
+        if self.aware:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        count = self._counts[row]
+        return {
+            "id": uuid.UUID(bytes=self._id_key(row)),
+            "name": self._name(row).decode(),
+            "created_at": created_at,
+            "avg_grade": self._sums[row] / count if count else None,
+        }
+    
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the column and order buffers."""
+        columns = (self._name_ends, self._created, self._sums, self._counts, *self._orders.values())
+        return len(self._ids) + len(self._names) + sum(len(a) * a.itemsize for a in columns)
+    
+    def clear(self) -> None:
+        """Drop all rows and forget the version."""
+        self.version = None
+        self._ids = bytearray()
+        self._names = bytearray()
+        self._name_ends = array("q")
+        self._created = array("q")
+        self._sums = array("q")
+        self._counts = array("q")
+        self._orders = {}
+    
+    def __len__(self) -> int:
+        return len(self._created)
+
+
+# Students served by GET /students when columnar serving is enabled (per tenant)
+columnar_store: ColumnarStore = TenantLocal(ColumnarStore)
@@ -0,0 +1,248 @@
+"""Response compression negotiated via Accept-Encoding."""
+import zlib
+from collections.abc import Callable
+from typing import Protocol
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Optional codecs: used only when installed
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on environment
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - depends on environment
+    zstandard = None
+
+
+class Encoder(Protocol):
+    """Incremental compressor for one response body."""
+    
+    def compress(self, data: bytes) -> bytes: ...
+    
+    def flush(self) -> bytes: ...
+    
+    def finish(self) -> bytes: ...
+
+
+class GzipEncoder:
+    """gzip via zlib."""
+    
+    def __init__(self, level: int) -> None:
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+    
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+    
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class BrotliEncoder:
+    """br via the brotli package."""
+    
+    def __init__(self, quality: int) -> None:
+        self._compressor = brotli.Compressor(quality=quality)
+    
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+    
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+    
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class ZstdEncoder:
+    """zstd via the zstandard package."""
+    
+    def __init__(self, level: int) -> None:
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+    
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+    
+    def flush(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+    
+    def finish(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH)
+
+
+def available_encodings() -> list[str]:
+    """Supported content codings in server preference order."""
+    encodings = []
+    if zstandard is not None:
+        encodings.append("zstd")
+    if brotli is not None:
+        encodings.append("br")
+    encodings.append("gzip")
+    return encodings
+
+
+def negotiate(accept_encoding: str, supported: list[str]) -> str | None:
+    """
+    Pick a content coding from an Accept-Encoding header.
+    
+    Highest client q-value wins, ties go to server preference (order of
+    supported). Returns None when the body should be sent uncompressed.
+    """
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[coding] = q
+    
+    best, best_q = None, 0.0
+    for coding in supported:
+        q = weights.get(coding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+class CompressionMiddleware:
+    """
+    Compress response bodies with the best coding the client accepts.
+    
+    Complete bodies smaller than minimum_size are sent as is, and so are
+    server-sent event streams and files. Streaming bodies (no
+    Content-Length) are compressed chunk by chunk and flushed after each
+    one; their headers are sent at once, so they are never buffered and
+    clients see data as it is produced.
+    """
+    
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        zstd_level: int = 3,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.supported = available_encodings()
+        self.factories: dict[str, Callable[[], Encoder]] = {
+            "gzip": lambda: GzipEncoder(gzip_level),
+            "br": lambda: BrotliEncoder(brotli_quality),
+            "zstd": lambda: ZstdEncoder(zstd_level),
+        }
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""), self.supported)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        
+        responder = _CompressionResponder(send, encoding, self.factories[encoding], self.minimum_size)
+        await self.app(scope, receive, responder)
+
+
+class _CompressionResponder:
+    """send() wrapper compressing one response."""
+    
+    def __init__(
+        self,
+        send: Send,
+        encoding: str,
+        factory: Callable[[], Encoder],
+        minimum_size: int,
+    ) -> None:
+        self.send = send
+        self.encoding = encoding
+        self.factory = factory
+        self.minimum_size = minimum_size
+        self.start_message: Message | None = None
+        self.encoder: Encoder | None = None
+        self.passthrough = False
+    
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            if self._sent_as_is(headers):
+                self.passthrough = True
+                await self.send(message)
+            elif "content-length" in headers:
+                # A complete body follows at once: held back to send its
+                # compressed length (or nothing, if it turns out empty)
+                self.start_message = message
+            else:
+                # Streamed: the headers go out now, chunks as they come
+                self._start_encoding(message)
+                await self.send(message)
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self._flush_start()
+            await self.send(message)
+            return
+        
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        
+        if self.start_message is not None:
+            if not more_body and len(body) < self.minimum_size:
+                self.passthrough = True
+                await self._flush_start()
+                await self.send(message)
+                return
+            
+            headers = self._start_encoding(self.start_message)
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                body = self.encoder.compress(body) + self.encoder.finish()
+                headers["Content-Length"] = str(len(body))
+                await self._flush_start()
+                await self.send({"type": "http.response.body", "body": body})
+                return
+            await self._flush_start()
+        
+        if more_body:
+            chunk = self.encoder.compress(body) + self.encoder.flush()
+        else:
+            chunk = self.encoder.compress(body) + self.encoder.finish()
+        await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+    
+    def _sent_as_is(self, headers: Headers) -> bool:
+        # Already encoded; server-sent events, which must not wait on an
+        # encoder; files (Accept-Ranges), whose byte ranges and sendfile
+        # refer to the file itself; bodies known to be small
+        if "content-encoding" in headers or "accept-ranges" in headers:
+            return True
+        if headers.get("content-type", "").startswith("text/event-stream"):
+            return True
+        content_length = headers.get("content-length")
+        return content_length is not None and int(content_length) < self.minimum_size
+    
+    def _start_encoding(self, start_message: Message) -> MutableHeaders:
+        self.encoder = self.factory()
+        headers = MutableHeaders(raw=start_message["headers"])
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        return headers
+    
+    async def _flush_start(self) -> None:
+        if self.start_message is not None:
+            message, self.start_message = self.start_message, None
+            await self.send(message)
@@ -1,4 +1,6 @@
 """Application configuration settings."""
+from typing import Literal
+
 from pydantic import ConfigDict
 from pydantic_settings import BaseSettings
 
@@ -13,6 +15,154 @@ class Settings(BaseSettings):
     
     # Database
     database_url: str = "sqlite+aiosqlite:///./students_grades.db"
+    # Apply pending migrations at startup (under a lock, so workers starting
+    # together take turns). Disable in production and run
+    # `python -m app.cli migrate` once per deploy instead.
+    auto_migrate: bool = True
+    # Log every SQL statement. Logging runs on the event loop, so this slows
+    # down and stalls every request; for debugging only.
+    database_echo: bool = False
+    # Connections per worker and database: database_pool_size kept open,
+    # plus up to database_max_overflow more under load (-1: unbounded).
+    # Not used for in-memory SQLite, which shares one connection.
+    database_pool_size: int = 5
+    database_max_overflow: int = 10
+    
+    # Identifiers
+    # uuid7 ids are time-ordered, so inserts append to the end of id indexes.
+    # binary_ids stores ids as 16-byte blobs on SQLite instead of 32-char hex;
+    # it must be chosen before the database is created.
+    id_generation: Literal["uuid4", "uuid7"] = "uuid4"
+    binary_ids: bool = False
+    
+    # Sharding
+    # Extra database URLs; students and their grades are hash-partitioned by
+    # student id across database_url (shard 0) and these. Each file has its
+    # own writer, so write throughput scales with the number of shards. (On
+    # PostgreSQL too: every write updates its shard's data_version counter
+    # row, which serializes the writers of each shard until they commit.)
+    shard_database_urls: list[str] = []
+    
+    # Multi-tenancy
+    # With tenant_database_url set, every request names its tenant in the
+    # tenant_header header and uses that tenant's own database: "{tenant}" in
+    # the URL is replaced by the tenant id, e.g.
+    # "sqlite+aiosqlite:///./tenants/{tenant}.db". Engines are opened on
+    # first use; beyond tenant_max_engines the least recently used is closed.
+    # Tenants are provisioned with `python -m app.cli migrate --tenant <id>`;
+    # other ids get 404. With tenant_ids set, only those tenants are served
+    # (required for backends other than SQLite files).
+    tenant_database_url: str = ""
+    tenant_header: str = "X-Tenant-ID"
+    tenant_max_engines: int = 64
+    tenant_ids: list[str] = []
+    
+    # Grade archival
+    # Workers re-check whether grades have been archived at most every
+    # archive_check_interval seconds; the archive command waits as long
+    # after switching them over, before it first moves grades.
+    archive_check_interval: float = 5.0
+    
+    # Caching
+    # Per-worker cache of GET /students results. Entries are dropped as soon as
+    # any worker writes (see app.core.cache), so it is safe with many workers.
+    list_cache_enabled: bool = False
+    list_cache_max_entries: int = 256
+    
+    # Columnar serving
+    # Per-worker copy of students and their averages in compact column arrays,
+    # loaded at startup. GET /students and its counts are answered from it
+    # without SQL; this worker's writes go to the database and the arrays,
+    # writes by other workers trigger one reload on the next read.
+    columnar_enabled: bool = False
+    
+    # Admission control, per route class
+    # Requests beyond max_concurrency wait in a queue of max_queue for at most
+    # admission_wait_timeout seconds; the rest get 503 with Retry-After.
+    read_max_concurrency: int = 64
+    read_max_queue: int = 256
+    write_max_concurrency: int = 4
+    write_max_queue: int = 64
+    admission_wait_timeout: float = 1.0
+    admission_retry_after: int = 1
+    
+    # Query timeouts, in seconds (0 disables)
+    # query_timeouts overrides query_timeout per route name (list_students,
+    # student_percentile, list_changes, create_student, create_grade,
+    # list_grades).
+    # Queries are also stopped as soon as the client disconnects.
+    query_timeout: float = 5.0
+    query_timeouts: dict[str, float] = {}
+    
+    # Readiness (GET /health/ready)
+    # Not ready when a database ping takes longer than readiness_max_db_latency,
+    # the event loop lags more than readiness_max_loop_lag, a connection pool
+    # is exhausted or an admission queue is full. Loop lag is sampled every
+    # loop_lag_interval seconds.
+    readiness_max_db_latency: float = 0.5
+    readiness_max_loop_lag: float = 0.2
+    loop_lag_interval: float = 0.5
+    
+    # Event-loop stalls (GET /health/loop)
+    # A lag sample over loop_stall_threshold seconds counts as a stall; the
+    # last loop_stall_history are kept. With loop_debug, a watchdog thread
+    # captures the stack of the code blocking the loop during each stall and
+    # logs it (it wakes every quarter threshold, so enable it to hunt stalls).
+    loop_stall_threshold: float = 0.1
+    loop_stall_history: int = 20
+    loop_debug: bool = False
+    
+    # Warm-up
+    # Started with each worker, which reports not ready until it finishes or
+    # warmup_timeout seconds pass (0 disables it). It reads the hot tables
+    # and indexes into the page cache and runs the GET /students query
+    # strings of warmup_shapes. With warmup_stats_file set, the
+    # warmup_learned_shapes most requested first pages are saved there at
+    # shutdown and warmed up too at the next start.
+    warmup_timeout: float = 30.0
+    warmup_shapes: list[str] = ["sort_by=name&order=asc", "sort_by=avg_grade&order=desc"]
+    warmup_stats_file: str = ""
+    warmup_learned_shapes: int = 10
+    
+    # Reports
+    # Report jobs (POST /reports) run in a pool of report_workers processes
+    # per worker, each with its own read-only database connection, and write
+    # CSV files under reports_dir (shared by all workers), deleted after
+    # report_retention seconds. Beyond report_max_pending unfinished jobs a
+    # worker answers 503.
+    report_workers: int = 2
+    report_max_pending: int = 16
+    reports_dir: str = "./reports"
+    report_retention: float = 86400.0
+    
+    # Live grade feed (SSE and WebSocket)
+    # Each subscriber buffers at most feed_queue_size events; when it falls
+    # behind, the oldest are dropped. SSE streams send a keep-alive comment
+    # after feed_heartbeat_interval seconds without events.
+    feed_queue_size: int = 256
+    feed_heartbeat_interval: float = 15.0
+    
+    # Response compression (gzip; zstd and br when zstandard/brotli are installed)
+    compression_enabled: bool = True
+    compression_minimum_size: int = 1024
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 4
+    compression_zstd_level: int = 3
+    
+    # Profiling
+    # With profiling_enabled, requests sent with an X-Profile header run under
+    # cProfile and the stats are written to profiling_dir. When disabled the
+    # middleware is not installed at all.
+    profiling_enabled: bool = False
+    profiling_dir: str = "./profiles"
+    
+    # Tracing
+    # With tracing_enabled, a tracing_sample_rate fraction of requests record
+    # spans for the route, services, DAL calls and SQL statements, appended
+    # as JSON lines to tracing_file. When disabled nothing is installed.
+    tracing_enabled: bool = False
+    tracing_sample_rate: float = 0.01
+    tracing_file: str = "./traces.jsonl"
     
     # API
     api_title: str = "Students Grades API"
@@ -1,8 +1,16 @@
 """Database setup and session management."""
+from typing import Any
+
+from fastapi import Depends
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 
 from app.core.config import settings
+from app.core.sharding import DEFAULT_SHARD, sharded_sessionmaker
+from app.core.tenancy import Tenant, resolve_tenant
+from app.core.timeouts import install_query_guards
+from app.core.tracing import install_sql_tracing
 
 
 class Base(DeclarativeBase):
@@ -10,23 +18,43 @@ class Base(DeclarativeBase):
     pass
 
 
+def engine_options(url: str) -> dict[str, Any]:
+    """create_async_engine options of the application's engines, from settings."""
+    options: dict[str, Any] = {"echo": settings.database_echo}
+    parsed = make_url(url)
+    # In-memory SQLite uses a single shared connection, not a sized pool
+    if parsed.get_backend_name() != "sqlite" or parsed.database not in (None, "", ":memory:"):
+        options.update(pool_size=settings.database_pool_size, max_overflow=settings.database_max_overflow)
+    return options
+
+
 # Create async engine
-engine = create_async_engine(
-    settings.database_url,
-    echo=True,  # Log SQL queries
-)
+engine = create_async_engine(settings.database_url, **engine_options(settings.database_url))
+
+# One engine per shard; shard "0" is the main database
+shard_engines = {DEFAULT_SHARD: engine}
+for shard_number, shard_url in enumerate(settings.shard_database_urls, start=1):
+    shard_engines[str(shard_number)] = create_async_engine(shard_url, **engine_options(shard_url))
+for shard_engine in shard_engines.values():
+    install_query_guards(shard_engine)
+    if settings.tracing_enabled:
+        install_sql_tracing(shard_engine)
 
 # Create async session factory
-AsyncSessionLocal = async_sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-)
+if len(shard_engines) > 1:
+    AsyncSessionLocal = sharded_sessionmaker(shard_engines, expire_on_commit=False)
+else:
+    AsyncSessionLocal = async_sessionmaker(
+        engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
+    )
 
 
-async def get_db() -> AsyncSession:
-    """Dependency for getting database session."""
-    async with AsyncSessionLocal() as session:
+async def get_db(tenant: Tenant | None = Depends(resolve_tenant)) -> AsyncSession:
+    """Dependency for getting database session (of the request's tenant, if any)."""
+    session_factory = AsyncSessionLocal if tenant is None else tenant.sessionmaker
+    async with session_factory() as session:
         try:
             yield session
         finally:
@@ -34,7 +62,15 @@ async def get_db() -> AsyncSession:
 
 
 async def init_db() -> None:
-    """Initialize database tables."""
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    """
+    Make sure the database schema is current.
+    
+    Only reads the schema version of each shard; tables are created or
+    changed by migrations (auto-applied when settings.auto_migrate is set).
+    """
+    # Imported here: migrations depend on the models, which depend on Base
+    from app.core.migrations import ensure_schema
+    
+    for shard_engine in shard_engines.values():
+        await ensure_schema(shard_engine, auto_migrate=settings.auto_migrate)
 
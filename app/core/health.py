@@ -0,0 +1,163 @@
+"""Probes for the liveness and readiness endpoints."""
+import asyncio
+import contextlib
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import QueuePool
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LoopStall:
+    """One sample that woke up later than the stall threshold."""
+    
+    at: datetime
+    lag: float
+    # Loop thread's stack while it was blocked, captured in debug mode
+    stack: list[str] | None = None
+
+
+class LoopLagMonitor:
+    """
+    Measure event-loop lag: how late a periodic sleep wakes up.
+    
+    Synchronous or CPU-bound work on the loop delays every request the
+    worker is serving by the same amount, which a database ping alone does
+    not show. Samples later than stall_threshold are counted as stalls and
+    the last `history` of them kept.
+    
+    With debug set, a watchdog thread checks the loop every quarter
+    threshold; once a sample is overdue by more than the threshold it
+    captures the loop thread's stack, which shows the blocking callback
+    while it is still running, and logs it with the stall.
+    """
+    
+    def __init__(self, interval: float, stall_threshold: float, history: int = 20, debug: bool = False) -> None:
+        self.interval = interval
+        self.stall_threshold = stall_threshold
+        self.debug = debug
+        self.lag = 0.0
+        self.max_lag = 0.0
+        self.samples = 0
+        self.stall_count = 0
+        self.stalls: deque[LoopStall] = deque(maxlen=history)
+        self._task: asyncio.Task | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+        # Monotonic time the current sample should wake up at, None between samples
+        self._due: float | None = None
+        self._stack: list[str] | None = None
+    
+    def start(self) -> None:
+        """Start sampling on the running loop (and the watchdog in debug mode)."""
+        self._task = asyncio.create_task(self._run())
+        if self.debug:
+            self._stopped.clear()
+            self._watchdog = threading.Thread(
+                target=self._watch,
+                args=(threading.get_ident(),),
+                name="loop-watchdog",
+                daemon=True,
+            )
+            self._watchdog.start()
+    
+    async def stop(self) -> None:
+        """Stop sampling."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        if self._watchdog is not None:
+            self._stopped.set()
+            self._watchdog.join()
+            self._watchdog = None
+    
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            self._due = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            self._record(max(0.0, loop.time() - started - self.interval))
+    
+    def _record(self, lag: float) -> None:
+        with self._lock:
+            self._due, stack, self._stack = None, self._stack, None
+        self.lag = lag
+        self.max_lag = max(self.max_lag, lag)
+        self.samples += 1
+        if lag <= self.stall_threshold:
+            return
+        self.stall_count += 1
+        self.stalls.append(LoopStall(datetime.now(timezone.utc), lag, stack))
+        if stack is not None:
+            logger.warning("Event loop blocked for %.0fms in:\n%s", lag * 1000, "".join(stack))
+    
+    def _watch(self, loop_thread: int) -> None:
+        check = max(self.stall_threshold / 4, 0.001)
+        while not self._stopped.wait(check):
+            with self._lock:
+                due = self._due
+                if due is None or self._stack is not None or time.monotonic() - due <= self.stall_threshold:
+                    continue
+                frame = sys._current_frames().get(loop_thread)
+                if frame is not None:
+                    self._stack = traceback.format_stack(frame)
+
+
+loop_lag_monitor = LoopLagMonitor(
+    settings.loop_lag_interval,
+    stall_threshold=settings.loop_stall_threshold,
+    history=settings.loop_stall_history,
+    debug=settings.loop_debug,
+)
+
+
+def pool_stats(engine: AsyncEngine) -> dict[str, int | None]:
+    """
+    Connection pool usage of an engine.
+    
+    capacity is pool size plus settings.database_max_overflow, with which
+    the application's engines are created (None when unbounded). Pools that
+    do not queue (StaticPool for in-memory SQLite, NullPool) report None
+    throughout.
+    """
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return {"size": None, "checked_out": None, "overflow": None, "capacity": None}
+    max_overflow = settings.database_max_overflow
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        # overflow() counts up from -size until the pool is full
+        "overflow": max(0, pool.overflow()),
+        "capacity": pool.size() + max_overflow if max_overflow >= 0 else None,
+    }
+
+
+async def ping(engine: AsyncEngine, timeout: float) -> float:
+    """
+    Round-trip a SELECT 1 and return its latency in seconds.
+    
+    Includes waiting for a pooled connection, so an exhausted pool shows up
+    as latency. Raises TimeoutError after timeout seconds.
+    """
+    started = time.perf_counter()
+    async with asyncio.timeout(timeout):
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    return time.perf_counter() - started
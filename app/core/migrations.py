@@ -0,0 +1,215 @@
+"""Schema versioning and migrations."""
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+
+from sqlalchemy import Connection, Table, bindparam, delete, func, insert, inspect, literal, select, text, update
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.core.database import Base
+from app.models import Counter, Grade, GradeSummary, SchemaVersion, Student
+from app.models.counter import ARCHIVED_GRADES, DATA_VERSION, STUDENT_COUNT
+
+
+def _initial_schema(conn: Connection) -> None:
+    """v1: all tables. Idempotent, so it also adopts databases created before versioning."""
+    Base.metadata.create_all(conn)
+
+
+def _count_students(conn: Connection) -> None:
+    """v2: seed the maintained student counter from the existing rows."""
+    conn.execute(delete(Counter).where(Counter.name == STUDENT_COUNT))
+    conn.execute(
+        insert(Counter).from_select(
+            ["name", "value"],
+            select(literal(STUDENT_COUNT), func.count(Student.id)),
+        )
+    )
+
+
+def _drop_duplicate_id_indexes(conn: Connection) -> None:
+    """v3: drop ix_*_id, which duplicated the primary key indexes."""
+    conn.execute(text("DROP INDEX IF EXISTS ix_students_id"))
+    conn.execute(text("DROP INDEX IF EXISTS ix_grades_id"))
+
+
+def _backfill_change_seq(conn: Connection, table: Table, first_seq: int) -> int:
+    """Number rows without a change_seq in created_at order; return the next free seq."""
+    rows = conn.execute(
+        select(table.c.id)
+        .where(table.c.change_seq.is_(None))
+        .order_by(table.c.created_at, table.c.id)
+        .execution_options(yield_per=10_000)
+    )
+    stmt = update(table).where(table.c.id == bindparam("row_id")).values(change_seq=bindparam("seq"))
+    seq = first_seq
+    for ids in rows.partitions():
+        conn.execute(stmt, [{"row_id": row_id, "seq": seq + i} for i, (row_id,) in enumerate(ids)])
+        seq += len(ids)
+    return seq
+
+
+def _add_change_seq(conn: Connection) -> None:
+    """
+    v4: change_seq on students and grades for the change feed.
+    
+    Existing rows are numbered after the current data version, students
+    before grades, so replaying the feed never sees a grade before its
+    student. The data version then continues after the last number.
+    """
+    tables = (Student.__table__, Grade.__table__)
+    for table in tables:
+        if "change_seq" not in {column["name"] for column in inspect(conn).get_columns(table.name)}:
+            conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN change_seq INTEGER"))
+    
+    version = select(Counter.value).where(Counter.name == DATA_VERSION)
+    seq = conn.execute(version).scalar_one() + 1
+    for table in tables:
+        seq = _backfill_change_seq(conn, table, seq)
+        for index in table.indexes:
+            if "change_seq" in index.columns:
+                index.create(conn, checkfirst=True)
+    conn.execute(update(Counter).where(Counter.name == DATA_VERSION).values(value=seq - 1))
+
+
+def _add_grade_summaries(conn: Connection) -> None:
+    """v5: grade_summaries and its counter for archival, and the grades.created_at index it scans."""
+    GradeSummary.__table__.create(conn, checkfirst=True)
+    conn.execute(delete(Counter).where(Counter.name == ARCHIVED_GRADES))
+    conn.execute(
+        insert(Counter).from_select(
+            ["name", "value"],
+            select(literal(ARCHIVED_GRADES), func.coalesce(func.sum(GradeSummary.score_count), 0)),
+        )
+    )
+    for index in Grade.__table__.indexes:
+        if "created_at" in index.columns:
+            index.create(conn, checkfirst=True)
+
+
+def _add_grade_history_index(conn: Connection) -> None:
+    """
+    v6: (student_id, created_at, id) index for grade history pages.
+    
+    It replaces ix_grades_student_id, its prefix. On SQLite, created_at
+    values written by CURRENT_TIMESTAMP get the microseconds SQLAlchemy
+    writes, so they compare correctly against bound datetimes.
+    """
+    if conn.dialect.name == "sqlite":
+        conn.execute(text("UPDATE grades SET created_at = created_at || '.000000' WHERE length(created_at) = 19"))
+    for index in Grade.__table__.indexes:
+        if index.name == "ix_grades_student_id_created_at":
+            index.create(conn, checkfirst=True)
+    conn.execute(text("DROP INDEX IF EXISTS ix_grades_student_id"))
+
+
+# Migration N brings the schema from version N-1 to N. Append only; every
+# step must be safe on a database freshly created by _initial_schema.
+MIGRATIONS: list[Callable[[Connection], None]] = [
+    _initial_schema,
+    _count_students,
+    _drop_duplicate_id_indexes,
+    _add_change_seq,
+    _add_grade_summaries,
+    _add_grade_history_index,
+]
+
+LATEST_VERSION = len(MIGRATIONS)
+
+
+class SchemaOutdatedError(RuntimeError):
+    """Raised at startup when the database needs migrating."""
+
+
+async def get_schema_version(engine: AsyncEngine) -> int:
+    """Return the schema version recorded in the database (0 if unversioned)."""
+    try:
+        async with engine.connect() as conn:
+            result = await conn.execute(select(func.max(SchemaVersion.version)))
+            return result.scalar() or 0
+    except (OperationalError, ProgrammingError):
+        # schema_version table does not exist yet
+        return 0
+
+
+# Key of the PostgreSQL advisory lock held while migrating
+MIGRATION_LOCK_KEY = 0x5C4E3A
+
+
+@asynccontextmanager
+async def _locked_transaction(engine: AsyncEngine) -> AsyncIterator[AsyncConnection]:
+    """
+    A transaction holding the migration lock, so one process migrates at a time.
+    
+    SQLite: BEGIN IMMEDIATE takes the write lock up front (waiting for it
+    as long as another process holds it). PostgreSQL: a transaction-level
+    advisory lock.
+    """
+    if engine.dialect.name == "sqlite":
+        async with engine.connect() as conn:
+            # The driver must not open transactions itself: this one is explicit
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            while True:
+                try:
+                    await conn.exec_driver_sql("BEGIN IMMEDIATE")
+                    break
+                except OperationalError as e:
+                    if "locked" not in str(e):
+                        raise
+            try:
+                yield conn
+            except BaseException:
+                await conn.exec_driver_sql("ROLLBACK")
+                raise
+            await conn.exec_driver_sql("COMMIT")
+    else:
+        async with engine.begin() as conn:
+            await conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+            yield conn
+
+
+def _locked_version(conn: Connection) -> int:
+    if not inspect(conn).has_table(SchemaVersion.__tablename__):
+        return 0
+    return conn.execute(select(func.max(SchemaVersion.version))).scalar() or 0
+
+
+async def migrate(engine: AsyncEngine) -> int:
+    """
+    Apply pending migrations and return the resulting schema version.
+    
+    Each step runs in its own transaction together with its version row,
+    under the migration lock; the version is re-read once the lock is held,
+    so steps applied meanwhile by another worker are skipped.
+    """
+    current = await get_schema_version(engine)
+    for version, step in enumerate(MIGRATIONS[current:], start=current + 1):
+        async with _locked_transaction(engine) as conn:
+            if await conn.run_sync(_locked_version) >= version:
+                continue
+            await conn.run_sync(step)
+            await conn.execute(insert(SchemaVersion).values(version=version))
+    return max(current, LATEST_VERSION)
+
+
+async def ensure_schema(engine: AsyncEngine, auto_migrate: bool) -> int:
+    """
+    Check the schema version at startup.
+    
+    A current database costs a single query, with no table reflection.
+    Pending migrations are applied only when auto_migrate is set, otherwise
+    SchemaOutdatedError tells the operator to run the migrate command.
+    """
+    version = await get_schema_version(engine)
+    if version == LATEST_VERSION:
+        return version
+    if version > LATEST_VERSION:
+        raise SchemaOutdatedError(
+            f"Database schema version {version} is newer than this code ({LATEST_VERSION})"
+        )
+    if not auto_migrate:
+        raise SchemaOutdatedError(
+            f"Database schema version {version}, expected {LATEST_VERSION}. "
+            "Run `python -m app.cli migrate`."
+        )
+    return await migrate(engine)
@@ -0,0 +1,85 @@
+"""In-process sorted index of student averages for percentile ranks."""
+import uuid
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Iterable
+
+from app.core.tenancy import TenantLocal
+
+
+class AverageIndex:
+    """
+    Sorted array of per-student average grades, tied to the data version.
+    
+    A percentile rank is two binary searches over the sorted averages
+    (O(log n)). Adding a grade updates one student's running total and
+    moves their average within the array, so the index is maintained
+    without re-aggregating. Like VersionedCache, it is only trusted for the
+    data version it was built at: writes by this worker advance it in place,
+    any other write makes it stale until the next rebuild.
+    
+    Only students with grades are ranked, matching the min_avg_grade filter.
+    """
+    
+    def __init__(self) -> None:
+        self.version: int | None = None
+        self._averages: list[float] = []
+        self._totals: dict[uuid.UUID, tuple[int, int]] = {}
+    
+    def rebuild(self, totals: Iterable[tuple[uuid.UUID, int, int]], version: int) -> None:
+        """Replace the contents from (student_id, score sum, grade count) rows."""
+        self._totals = {student_id: (total, count) for student_id, total, count in totals}
+        self._averages = sorted(total / count for total, count in self._totals.values())
+        self.version = version
+    
+    def apply_write(
+        self,
+        version: int,
+        student_id: uuid.UUID | None = None,
+        score: int | None = None,
+    ) -> None:
+        """
+        Account for one write committed at data version `version`.
+        
+        Pass student_id and score for a new grade; other writes (new
+        students) leave the averages unchanged. Applied only when it is the
+        very next version, otherwise someone else wrote in between and the
+        index is left stale.
+        """
+        if self.version is None or version != self.version + 1:
+            return
+        if student_id is not None:
+            total, count = self._totals.get(student_id, (0, 0))
+            if count:
+                del self._averages[bisect_left(self._averages, total / count)]
+            total, count = total + score, count + 1
+            self._totals[student_id] = (total, count)
+            insort(self._averages, total / count)
+        self.version = version
+    
+    def rank(self, student_id: uuid.UUID) -> tuple[float, float] | None:
+        """
+        Return (average, percentile rank) of a student, None without grades.
+        
+        The percentile rank is the share of graded students with a lower
+        average, counting ties as half: 100 * (below + equal / 2) / n.
+        """
+        totals = self._totals.get(student_id)
+        if totals is None:
+            return None
+        average = totals[0] / totals[1]
+        below = bisect_left(self._averages, average)
+        equal = bisect_right(self._averages, average) - below
+        return average, 100 * (below + equal / 2) / len(self._averages)
+    
+    def clear(self) -> None:
+        """Drop all entries and forget the version."""
+        self.version = None
+        self._averages = []
+        self._totals = {}
+    
+    def __len__(self) -> int:
+        return len(self._averages)
+
+
+# Averages of all graded students, shared by the requests of this worker (per tenant)
+average_index: AverageIndex = TenantLocal(AverageIndex)
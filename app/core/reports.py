@@ -0,0 +1,203 @@
+"""Report jobs: CPU-bound exports run in a process pool, results kept as files."""
+import asyncio
+import json
+import os
+import time
+import uuid
+from collections.abc import Callable, Iterator
+from concurrent.futures import Executor
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import Connection, Engine, create_engine, text
+from sqlalchemy.engine import make_url
+
+from app.core.config import settings
+
+
+class ReportQueueFull(Exception):
+    """Raised when this worker already has report_max_pending unfinished jobs."""
+
+
+def read_only_url(url: str) -> str:
+    """
+    Synchronous, read-only variant of an async database URL.
+    
+    SQLite files are opened with mode=ro (an in-memory database cannot be
+    shared with another process); other backends use their default
+    synchronous driver, and report transactions are set READ ONLY.
+    """
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend == "sqlite":
+        if parsed.database in (None, "", ":memory:"):
+            raise ValueError("Reports need a file database, not an in-memory one")
+        parsed = parsed.set(
+            drivername="sqlite",
+            database=f"file:{os.path.abspath(parsed.database)}",
+            query={"mode": "ro", "uri": "true"},
+        )
+    else:
+        parsed = parsed.set(drivername=backend)
+    return parsed.render_as_string(hide_password=False)
+
+
+# Engines of this report process, one per database, reused across its jobs
+_engines: dict[str, Engine] = {}
+
+
+@contextmanager
+def read_only_connection(url: str) -> Iterator[Connection]:
+    """A read-only connection of this report process to an async database URL."""
+    engine = _engines.get(url)
+    if engine is None:
+        engine = _engines[url] = create_engine(read_only_url(url), pool_size=1)
+    with engine.connect() as conn:
+        if conn.dialect.name != "sqlite":
+            conn.execute(text("SET TRANSACTION READ ONLY"))
+        yield conn
+
+
+def _write_json(path: Path, data: dict[str, Any]) -> None:
+    # Atomic, so other workers never read a half-written status
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(data))
+    os.replace(tmp, path)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class ReportJobs:
+    """
+    Report jobs of this worker, run in a pool of processes.
+    
+    A job calls build(path, *args) in a pool process, which streams its CSV
+    to a temporary file renamed to <id>.csv when complete. The job's status
+    is a <id>.json file next to it, so every worker sharing the directory
+    can answer status and download requests. Jobs still running when their
+    worker stops stay "running". Files older than retention seconds are
+    deleted as new jobs are submitted.
+    
+    The pool is started on the first submission and uses spawn, so pool
+    processes do not inherit the event loop or open connections.
+    """
+    
+    def __init__(self, directory: str, max_workers: int, max_pending: int, retention: float) -> None:
+        self.directory = Path(directory)
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.retention = retention
+        self.pending = 0
+        self._executor: Executor | None = None
+    
+    def _scope_dir(self, scope: str | None) -> Path:
+        # Tenant ids never look like the hex job ids kept at the top level
+        return self.directory if scope is None else self.directory / "tenants" / scope
+    
+    def result_path(self, job_id: uuid.UUID, scope: str | None = None) -> Path:
+        """Where a finished job's CSV is stored."""
+        return self._scope_dir(scope) / f"{job_id.hex}.csv"
+    
+    def status(self, job_id: uuid.UUID, scope: str | None = None) -> dict[str, Any] | None:
+        """The job's status record, None if unknown (or deleted after the retention)."""
+        try:
+            return json.loads((self._scope_dir(scope) / f"{job_id.hex}.json").read_text())
+        except FileNotFoundError:
+            return None
+    
+    def submit(
+        self,
+        kind: str,
+        build: Callable[..., int],
+        *args: Any,
+        scope: str | None = None,
+    ) -> dict[str, Any]:
+        """
+        Start a job calling build(path, *args) and return its status record.
+        
+        build must be a module-level function (it is pickled by reference)
+        returning the number of rows written. Raises ReportQueueFull when
+        max_pending jobs of this worker are unfinished.
+        """
+        if self.pending >= self.max_pending:
+            raise ReportQueueFull(f"{self.pending} report jobs already pending")
+        directory = self._scope_dir(scope)
+        directory.mkdir(parents=True, exist_ok=True)
+        self.prune(directory)
+        
+        job_id = uuid.uuid4()
+        record = {
+            "id": str(job_id),
+            "kind": kind,
+            "status": "running",
+            "created_at": _now(),
+            "finished_at": None,
+            "rows": None,
+            "size": None,
+            "error": None,
+        }
+        status_path = directory / f"{job_id.hex}.json"
+        _write_json(status_path, record)
+        
+        if self._executor is None:
+            # Imported here: workers that never build a report never load multiprocessing
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            
+            self._executor = ProcessPoolExecutor(self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+        # Wrapped so completion is handled on the event loop, not the pool's thread
+        future = asyncio.wrap_future(self._executor.submit(_run, build, self.result_path(job_id, scope), *args))
+        self.pending += 1
+        future.add_done_callback(lambda f: self._finished(f, status_path, dict(record)))
+        return record
+    
+    def _finished(self, future: asyncio.Future, status_path: Path, record: dict[str, Any]) -> None:
+        self.pending -= 1
+        record["finished_at"] = _now()
+        if future.cancelled():
+            record.update(status="failed", error="Cancelled at shutdown")
+        elif future.exception() is not None:
+            record.update(status="failed", error=f"{type(future.exception()).__name__}: {future.exception()}")
+        else:
+            record.update(status="done", **future.result())
+        _write_json(status_path, record)
+    
+    def prune(self, directory: Path) -> int:
+        """Delete job files in directory older than the retention; return how many."""
+        cutoff = time.time() - self.retention
+        removed = 0
+        for path in directory.iterdir():
+            if path.is_file() and path.stat().st_mtime < cutoff:
+                path.unlink(missing_ok=True)
+                removed += 1
+        return removed
+    
+    def shutdown(self) -> None:
+        """Cancel queued jobs and stop the pool once the running ones finish."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+def _run(build: Callable[..., int], path: Path, *args: Any) -> dict[str, int]:
+    """Pool side of a job: build into a temporary file, then publish it."""
+    tmp = path.with_name(f"{path.name}.tmp")
+    try:
+        rows = build(tmp, *args)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return {"rows": rows, "size": path.stat().st_size}
+
+
+# Report jobs of this worker
+report_jobs = ReportJobs(
+    settings.reports_dir,
+    max_workers=settings.report_workers,
+    max_pending=settings.report_max_pending,
+    retention=settings.report_retention,
+)
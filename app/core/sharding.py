@@ -0,0 +1,92 @@
+"""Hash partitioning of students and grades across database files."""
+import operator
+import uuid
+import zlib
+from collections.abc import Mapping
+
+from sqlalchemy import BinaryExpression, BindParameter, Column, Select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.ext.horizontal_shard import ShardedSession
+
+# Shard holding everything when sharding is off; also the main database
+DEFAULT_SHARD = "0"
+
+# Session.info key listing the shards behind a session
+SHARD_IDS = "shard_ids"
+
+
+def shard_of(student_id: uuid.UUID, shard_count: int) -> str:
+    """Shard for a student and all of their grades (stable across processes)."""
+    return str(zlib.crc32(student_id.bytes) % shard_count)
+
+
+def session_shards(session: AsyncSession) -> list[str]:
+    """Shard ids behind a session ([DEFAULT_SHARD] when it is not sharded)."""
+    return session.info.get(SHARD_IDS, [DEFAULT_SHARD])
+
+
+def student_shard(session: AsyncSession, student_id: uuid.UUID) -> str:
+    """
+    Shard that holds a student's rows, for bind_arguments={"shard_id": ...}.
+    
+    Unsharded sessions ignore the shard_id bind argument, so the DAL can pass
+    it unconditionally.
+    """
+    return shard_of(student_id, len(session_shards(session)))
+
+
+def _filtered_student_id(statement) -> uuid.UUID | None:
+    """Student id a SELECT is restricted to by a top-level equality, if any."""
+    if not isinstance(statement, Select) or statement.whereclause is None:
+        return None
+    clause = statement.whereclause
+    if (
+        isinstance(clause, BinaryExpression)
+        and clause.operator is operator.eq
+        and isinstance(clause.left, Column)
+        and isinstance(clause.right, BindParameter)
+        and (clause.left.table.name, clause.left.name) in (("students", "id"), ("grades", "student_id"))
+    ):
+        return clause.right.effective_value
+    return None
+
+
+def sharded_sessionmaker(engines: Mapping[str, AsyncEngine], **kw) -> async_sessionmaker[AsyncSession]:
+    """
+    Build a session factory partitioning rows across engines keyed "0".."N-1".
+    
+    Students are placed by their id and grades by their student_id, so a
+    student and their grades always share a shard and per-student
+    aggregates never cross shards. Statements without an explicit shard_id
+    run on the student's shard when they filter on one student id, otherwise
+    on every shard with the rows concatenated; the DAL merges ordered
+    results itself. Each shard keeps its own counters table.
+    """
+    shard_ids = [str(i) for i in range(len(engines))]
+    
+    def shard_chooser(mapper, instance, clause=None) -> str:
+        key = getattr(instance, "student_id", None) or instance.id
+        return shard_of(key, len(shard_ids))
+    
+    def identity_chooser(mapper, primary_key, **kw) -> list[str]:
+        # Only students can be located from their primary key alone
+        if mapper.local_table.name == "students":
+            return [shard_of(primary_key[0], len(shard_ids))]
+        return shard_ids
+    
+    def execute_chooser(context) -> list[str]:
+        student_id = _filtered_student_id(context.statement)
+        if student_id is not None:
+            return [shard_of(student_id, len(shard_ids))]
+        return shard_ids
+    
+    return async_sessionmaker(
+        class_=AsyncSession,
+        sync_session_class=ShardedSession,
+        shards={shard_id: engines[shard_id].sync_engine for shard_id in shard_ids},
+        shard_chooser=shard_chooser,
+        identity_chooser=identity_chooser,
+        execute_chooser=execute_chooser,
+        info={SHARD_IDS: shard_ids},
+        **kw,
+    )
@@ -0,0 +1,220 @@
+"""Multi-tenancy: one database per tenant behind a bounded engine registry."""
+import asyncio
+import re
+from collections import OrderedDict
+from collections.abc import Callable, Collection
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Generic, TypeVar
+
+from fastapi import HTTPException, WebSocketException, status
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from starlette.requests import HTTPConnection
+
+from app.core.config import settings
+from app.core.timeouts import install_query_guards
+from app.core.tracing import install_sql_tracing
+
+# Tenant ids become file names: no separators, dots or empty ids
+TENANT_ID = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+T = TypeVar("T")
+
+
+class UnknownTenantError(LookupError):
+    """Raised for a tenant whose database has not been provisioned."""
+
+
+def tenant_database_url(url_template: str, tenant_id: str) -> URL:
+    """Database URL of a tenant. Raises ValueError for an invalid tenant id."""
+    if not TENANT_ID.match(tenant_id):
+        raise ValueError(f"Invalid tenant id {tenant_id!r}")
+    return make_url(url_template.format(tenant=tenant_id))
+
+
+def sqlite_file(url: URL) -> Path | None:
+    """Database file of a SQLite URL, None for other backends and in-memory databases."""
+    if url.get_backend_name() != "sqlite" or url.database in (None, "", ":memory:"):
+        return None
+    return Path(url.database)
+
+
+@dataclass(eq=False)
+class Tenant:
+    """An open tenant database and the per-worker state derived from it."""
+    
+    id: str
+    engine: AsyncEngine
+    sessionmaker: async_sessionmaker[AsyncSession]
+    # TenantLocal instances, dropped together with the engine
+    state: dict["TenantLocal", Any] = field(default_factory=dict)
+
+
+# Tenant of the current request; None without multi-tenancy
+current_tenant: ContextVar[Tenant | None] = ContextVar("current_tenant", default=None)
+
+
+def current_tenant_id() -> str | None:
+    """Id of the current request's tenant, None without multi-tenancy."""
+    tenant = current_tenant.get()
+    return tenant.id if tenant is not None else None
+
+
+class TenantLocal(Generic[T]):
+    """
+    Process-wide object with one instance per tenant.
+    
+    Wraps in-process caches and indexes whose validity is checked against
+    the data version: versions of different tenant databases are unrelated,
+    so each tenant needs its own instance. Attribute access goes to the
+    current tenant's instance, created on first use and dropped when the
+    registry closes the tenant's engine; outside any tenant it goes to a
+    default instance.
+    """
+    
+    def __init__(self, factory: Callable[[], T]) -> None:
+        self._factory = factory
+        self._default = factory()
+    
+    def _target(self) -> T:
+        tenant = current_tenant.get()
+        if tenant is None:
+            return self._default
+        instance = tenant.state.get(self)
+        if instance is None:
+            instance = tenant.state[self] = self._factory()
+        return instance
+    
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._target(), name)
+    
+    def __len__(self) -> int:
+        return len(self._target())
+
+
+class EngineRegistry:
+    """
+    LRU-bounded set of open tenant engines.
+    
+    A tenant's engine is created on its first request and kept while it is
+    among the max_engines most recently used; the least recently used is
+    then disposed, closing its pooled connections and files. Connections
+    still checked out by in-flight requests stay usable and are closed when
+    returned. Concurrent first requests for a tenant share one open.
+    
+    Only provisioned tenants are opened: with an `allowed` list, the tenant
+    must be in it, and a SQLite tenant's file must exist (other backends
+    need the list). Tenant databases are created and migrated by
+    `python -m app.cli migrate --tenant`, never on a request, so requests
+    cannot create files and a database behind the code answers 503.
+    """
+    
+    def __init__(self, url_template: str, max_engines: int, allowed: Collection[str] = ()) -> None:
+        self.url_template = url_template
+        self.max_engines = max_engines
+        self.allowed = frozenset(allowed)
+        self.opened = 0
+        self.evicted = 0
+        self._tenants: OrderedDict[str, Tenant] = OrderedDict()
+        self._opening: dict[str, asyncio.Task[Tenant]] = {}
+    
+    def _provisioned(self, tenant_id: str, url: URL) -> bool:
+        if self.allowed and tenant_id not in self.allowed:
+            return False
+        path = sqlite_file(url)
+        if path is not None:
+            return path.is_file()
+        return bool(self.allowed)
+    
+    async def get(self, tenant_id: str) -> Tenant:
+        """Return the tenant's open database, opening it if needed."""
+        tenant = self._tenants.get(tenant_id)
+        if tenant is not None:
+            self._tenants.move_to_end(tenant_id)
+            return tenant
+        
+        task = self._opening.get(tenant_id)
+        if task is None:
+            task = self._opening[tenant_id] = asyncio.create_task(self._open(tenant_id))
+            task.add_done_callback(lambda _: self._opening.pop(tenant_id, None))
+        # Shielded: a cancelled request does not abort an open others wait for
+        return await asyncio.shield(task)
+    
+    async def _open(self, tenant_id: str) -> Tenant:
+        # Imported here: migrations depend on the models, which depend on Base
+        from app.core.database import engine_options
+        from app.core.migrations import ensure_schema
+        
+        url = tenant_database_url(self.url_template, tenant_id)
+        if not self._provisioned(tenant_id, url):
+            raise UnknownTenantError(f"Unknown tenant {tenant_id!r}")
+        engine = create_async_engine(url, **engine_options(url))
+        install_query_guards(engine)
+        if settings.tracing_enabled:
+            install_sql_tracing(engine)
+        try:
+            await ensure_schema(engine, auto_migrate=False)
+        except BaseException:
+            await engine.dispose()
+            raise
+        
+        tenant = Tenant(tenant_id, engine, async_sessionmaker(engine, expire_on_commit=False))
+        self._tenants[tenant_id] = tenant
+        self.opened += 1
+        while len(self._tenants) > self.max_engines:
+            _, evicted = self._tenants.popitem(last=False)
+            self.evicted += 1
+            await evicted.engine.dispose()
+        return tenant
+    
+    async def close(self) -> None:
+        """Dispose every open engine."""
+        while self._tenants:
+            _, tenant = self._tenants.popitem(last=False)
+            await tenant.engine.dispose()
+    
+    def __len__(self) -> int:
+        return len(self._tenants)
+
+
+# Tenant databases, used when settings.tenant_database_url is set
+tenant_registry = EngineRegistry(settings.tenant_database_url, settings.tenant_max_engines, settings.tenant_ids)
+
+
+async def resolve_tenant(connection: HTTPConnection) -> Tenant | None:
+    """
+    Route dependency selecting the request's tenant database.
+    
+    Reads the tenant id from the settings.tenant_header header, opens its
+    database through the registry and makes it the current tenant. Returns
+    None (the default database) when multi-tenancy is off. Unknown tenants
+    get 404, tenants whose schema is not current 503.
+    """
+    if not settings.tenant_database_url:
+        return None
+    
+    websocket = connection.scope["type"] == "websocket"
+    tenant_id = connection.headers.get(settings.tenant_header, "")
+    if not TENANT_ID.match(tenant_id):
+        detail = f"Missing or invalid {settings.tenant_header} header"
+        if websocket:
+            raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason=detail)
+        raise HTTPException(status_code=400, detail=detail)
+    
+    # Imported here: migrations depend on the models, which depend on Base
+    from app.core.migrations import SchemaOutdatedError
+    
+    try:
+        tenant = await tenant_registry.get(tenant_id)
+    except UnknownTenantError as e:
+        if websocket:
+            raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason=str(e))
+        raise HTTPException(status_code=404, detail=str(e))
+    except SchemaOutdatedError as e:
+        if websocket:
+            raise WebSocketException(code=status.WS_1011_INTERNAL_ERROR, reason=str(e))
+        raise HTTPException(status_code=503, detail=str(e))
+    current_tenant.set(tenant)
+    return tenant
@@ -0,0 +1,135 @@
+"""Per-request query deadlines and cancellation on client disconnect."""
+import asyncio
+import contextvars
+import time
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass, field
+
+from fastapi import HTTPException, Request
+from sqlalchemy import event
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+
+# SQLite calls the progress handler every this many VM instructions
+PROGRESS_INTERVAL = 1000
+
+# Nginx's "client closed request"; never seen by the client
+CLIENT_CLOSED_REQUEST = 499
+
+
+@dataclass
+class QueryGuard:
+    """Deadline and cancellation flag for the database work of one request."""
+    
+    deadline: float | None  # time.monotonic() value
+    cancelled: bool = False
+    # Task to cancel on disconnect, for drivers that stop queries that way
+    task: asyncio.Task | None = field(default=None, repr=False)
+    
+    @property
+    def expired(self) -> bool:
+        return self.deadline is not None and time.monotonic() >= self.deadline
+    
+    def interrupted(self) -> bool:
+        """True once the query should stop (called from the SQLite thread)."""
+        return self.cancelled or self.expired
+    
+    def cancel(self) -> None:
+        """Stop the request's database work: the client is gone."""
+        self.cancelled = True
+        if self.task is not None:
+            self.task.cancel()
+
+
+_current_guard: contextvars.ContextVar[QueryGuard | None] = contextvars.ContextVar("query_guard", default=None)
+
+
+def _sqlite_progress_handler(record) -> Callable[[], int]:
+    def handler() -> int:
+        guard = record.info.get("query_guard")
+        return int(guard is not None and guard.interrupted())
+    return handler
+
+
+def install_query_guards(engine: AsyncEngine) -> None:
+    """
+    Enforce the current request's QueryGuard on an engine's connections.
+    
+    SQLite: a progress handler, installed once per connection, interrupts
+    the running statement as soon as the guard checked out with the
+    connection expires or is cancelled; the aiosqlite thread is freed at
+    once. PostgreSQL: when the request has a deadline, statement_timeout
+    is set to the remaining time at checkout and reset at checkin (other
+    checkouts run no extra statement), and a disconnect cancels the
+    request task, which makes the driver cancel the query server-side.
+    """
+    sync_engine = engine.sync_engine
+    sqlite = sync_engine.dialect.name == "sqlite"
+    
+    @event.listens_for(sync_engine, "connect")
+    def _connect(dbapi_connection, record) -> None:
+        if sqlite:
+            handler = _sqlite_progress_handler(record)
+            dbapi_connection.run_async(lambda conn: conn.set_progress_handler(handler, PROGRESS_INTERVAL))
+    
+    @event.listens_for(sync_engine, "checkout")
+    def _checkout(dbapi_connection, record, proxy) -> None:
+        guard = _current_guard.get()
+        if sqlite:
+            record.info["query_guard"] = guard
+            return
+        if guard is None:
+            return
+        guard.task = asyncio.current_task()
+        if guard.deadline is not None:
+            timeout_ms = max(1, int((guard.deadline - time.monotonic()) * 1000))
+            _execute(dbapi_connection, f"SET statement_timeout = {timeout_ms}")
+            record.info["statement_timeout"] = True
+    
+    @event.listens_for(sync_engine, "checkin")
+    def _checkin(dbapi_connection, record) -> None:
+        # Back to the server default before the connection serves anyone else
+        if record.info.pop("statement_timeout", False) and dbapi_connection is not None:
+            _execute(dbapi_connection, "RESET statement_timeout")
+
+
+def _execute(dbapi_connection, statement: str) -> None:
+    cursor = dbapi_connection.cursor()
+    cursor.execute(statement)
+    cursor.close()
+
+
+async def _cancel_on_disconnect(request: Request, guard: QueryGuard) -> None:
+    while (await request.receive())["type"] != "http.disconnect":
+        pass
+    guard.cancel()
+
+
+def query_timeout(route: str) -> Callable[[Request], AsyncIterator[QueryGuard]]:
+    """
+    Build a route dependency bounding the request's database work.
+    
+    The timeout is settings.query_timeouts[route], else settings.query_timeout
+    (0 disables it). Queries that run past it fail with 504; if the client
+    disconnects first they are stopped right away (499, for the logs).
+    """
+    async def dependency(request: Request) -> AsyncIterator[QueryGuard]:
+        timeout = settings.query_timeouts.get(route, settings.query_timeout)
+        guard = QueryGuard(deadline=time.monotonic() + timeout if timeout > 0 else None)
+        token = _current_guard.set(guard)
+        watcher = asyncio.create_task(_cancel_on_disconnect(request, guard))
+        try:
+            yield guard
+        except DBAPIError as e:
+            if guard.cancelled:
+                raise HTTPException(status_code=CLIENT_CLOSED_REQUEST, detail="Client disconnected") from e
+            if guard.expired:
+                raise HTTPException(status_code=504, detail=f"Query exceeded the {timeout}s timeout") from e
+            raise
+        finally:
+            watcher.cancel()
+            _current_guard.reset(token)
+    
+    return dependency
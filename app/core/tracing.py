@@ -0,0 +1,253 @@
+"""Sampled request tracing: spans across the api, services, dal and SQL layers."""
+import asyncio
+import contextvars
+import functools
+import json
+import random
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Protocol
+
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Longest SQL text kept on a db.execute span
+MAX_STATEMENT_LENGTH = 500
+
+
+@dataclass(slots=True)
+class Span:
+    """One timed operation of a trace."""
+    
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    start: float  # Unix time
+    duration: float = 0.0  # seconds
+    attributes: dict[str, Any] = field(default_factory=dict)
+    error: str | None = None
+
+
+@dataclass(slots=True)
+class Trace:
+    """Finished spans of one sampled request, exported together at its end."""
+    
+    trace_id: str
+    spans: list[Span] = field(default_factory=list)
+
+
+_current_trace: contextvars.ContextVar[Trace | None] = contextvars.ContextVar("trace", default=None)
+_current_span: contextvars.ContextVar[Span | None] = contextvars.ContextVar("span", default=None)
+
+
+def _new_id(bits: int) -> str:
+    return f"{random.getrandbits(bits):0{bits // 4}x}"
+
+
+def _record(trace: Trace, name: str, started: float, error: str | None = None, **attributes) -> None:
+    """Add a finished leaf span started at perf_counter() value started."""
+    duration = time.perf_counter() - started
+    parent = _current_span.get()
+    trace.spans.append(Span(
+        name=name,
+        trace_id=trace.trace_id,
+        span_id=_new_id(64),
+        parent_id=parent.span_id if parent is not None else None,
+        start=time.time() - duration,
+        duration=duration,
+        attributes=attributes,
+        error=error,
+    ))
+
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[Span | None]:
+    """
+    Time the enclosed block as a child of the current span.
+    
+    Yields None, and records nothing, outside a sampled request.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+    parent = _current_span.get()
+    current = Span(
+        name=name,
+        trace_id=trace.trace_id,
+        span_id=_new_id(64),
+        parent_id=parent.span_id if parent is not None else None,
+        start=time.time(),
+        attributes=attributes,
+    )
+    token = _current_span.set(current)
+    started = time.perf_counter()
+    try:
+        yield current
+    except BaseException as e:
+        current.error = type(e).__name__
+        raise
+    finally:
+        current.duration = time.perf_counter() - started
+        _current_span.reset(token)
+        trace.spans.append(current)
+
+
+def traced(fn: Callable) -> Callable:
+    """
+    Record each call of an async function as a span.
+    
+    The span is named after the module without its app. prefix, e.g.
+    dal.student.list_students_with_avg. Unsampled calls cost one context
+    variable lookup.
+    """
+    name = f"{fn.__module__.removeprefix('app.')}.{fn.__name__}"
+    
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        if _current_trace.get() is None:
+            return await fn(*args, **kwargs)
+        with span(name):
+            return await fn(*args, **kwargs)
+    
+    return wrapper
+
+
+class TracedRoute(APIRoute):
+    """
+    APIRoute recording its handler as an api.<route name> span.
+    
+    The handler covers dependencies (admission wait included), request
+    validation, the endpoint and response serialization.
+    """
+    
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        name = f"api.{self.name}"
+        
+        async def traced_handler(request):
+            if _current_trace.get() is None:
+                return await handler(request)
+            with span(name, route=self.path):
+                return await handler(request)
+        
+        return traced_handler
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _current_trace.get() is not None:
+        conn.info.setdefault("trace_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    trace = _current_trace.get()
+    if trace is not None and conn.info.get("trace_started"):
+        started = conn.info["trace_started"].pop()
+        _record(trace, "db.execute", started, statement=statement[:MAX_STATEMENT_LENGTH], executemany=executemany)
+
+
+def _handle_error(exception_context) -> None:
+    trace = _current_trace.get()
+    conn = exception_context.connection
+    if trace is not None and conn is not None and conn.info.get("trace_started"):
+        started = conn.info["trace_started"].pop()
+        statement = exception_context.statement or ""
+        _record(
+            trace,
+            "db.execute",
+            started,
+            error=type(exception_context.original_exception).__name__,
+            statement=statement[:MAX_STATEMENT_LENGTH],
+        )
+
+
+def install_sql_tracing(engine: AsyncEngine) -> None:
+    """Record every statement run on engine during a sampled request as db.execute."""
+    sync_engine = engine.sync_engine
+    for name, listener in (
+        ("before_cursor_execute", _before_cursor_execute),
+        ("after_cursor_execute", _after_cursor_execute),
+        ("handle_error", _handle_error),
+    ):
+        if not event.contains(sync_engine, name, listener):
+            event.listen(sync_engine, name, listener)
+
+
+class SpanExporter(Protocol):
+    """Destination of finished traces."""
+    
+    def export(self, spans: list[Span]) -> None: ...
+
+
+class InMemoryExporter:
+    """Keeps exported spans in a list (for tests)."""
+    
+    def __init__(self) -> None:
+        self.spans: list[Span] = []
+    
+    def export(self, spans: list[Span]) -> None:
+        self.spans.extend(spans)
+    
+    def clear(self) -> None:
+        self.spans.clear()
+
+
+class JsonLinesExporter:
+    """Appends one JSON object per span to a file."""
+    
+    def __init__(self, path: str) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+    
+    def export(self, spans: list[Span]) -> None:
+        lines = "".join(json.dumps(asdict(s), default=str) + "\n" for s in spans)
+        with self._lock, self.path.open("a") as f:
+            f.write(lines)
+
+
+class TracingMiddleware:
+    """
+    Trace a random sample of HTTP requests.
+    
+    A sampled request gets an http span around the whole ASGI call; spans
+    from TracedRoute, @traced functions and SQL statements nest under it.
+    The finished trace is handed to the exporter off the event loop.
+    Unsampled requests cost one random() call.
+    """
+    
+    def __init__(self, app: ASGIApp, exporter: SpanExporter, sample_rate: float) -> None:
+        self.app = app
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or random.random() >= self.sample_rate:
+            await self.app(scope, receive, send)
+            return
+        
+        trace = Trace(trace_id=_new_id(128))
+        token = _current_trace.set(trace)
+        status = None
+        
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+        
+        try:
+            with span(f"http {scope['method']} {scope['path']}", query=scope["query_string"].decode("latin-1")) as root:
+                try:
+                    await self.app(scope, receive, send_with_status)
+                finally:
+                    root.attributes["status"] = status
+        finally:
+            _current_trace.reset(token)
+            await asyncio.to_thread(self.exporter.export, trace.spans)
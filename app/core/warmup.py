@@ -0,0 +1,175 @@
+"""Startup warm-up: page cache priming and list shapes to preload."""
+import asyncio
+import contextlib
+import contextvars
+import json
+import logging
+import os
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable, Iterable, Iterator
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qsl, urlencode
+
+from sqlalchemy import Table, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+# GET /students query parameters that select a cached list page
+SHAPE_PARAMS = {
+    "min_avg_grade": float,
+    "sort_by": str,
+    "order": str,
+    "limit": int,
+    "offset": int,
+}
+
+
+def parse_shape(query: str) -> dict[str, Any]:
+    """
+    Parse a GET /students query string into list_students_with_avg arguments.
+    
+    Raises ValueError for parameters that do not select a list page.
+    """
+    shape = {}
+    for name, value in parse_qsl(query, strict_parsing=True):
+        if name not in SHAPE_PARAMS:
+            raise ValueError(f"Unsupported list parameter {name!r} in {query!r}")
+        shape[name] = SHAPE_PARAMS[name](value)
+    return shape
+
+
+# False while the warm-up runs its shapes (in its own task only)
+_recording: contextvars.ContextVar[bool] = contextvars.ContextVar("shape_stats_recording", default=True)
+
+
+class ShapeStats:
+    """
+    Request counts of GET /students first pages, to warm up at the next start.
+    
+    Only pages at offset 0 are counted, and at most max_shapes distinct
+    shapes, so memory stays bounded however clients page. Lists run inside
+    not_recorded() (the warm-up's own) are not counted.
+    """
+    
+    def __init__(self, max_shapes: int = 1000) -> None:
+        self.max_shapes = max_shapes
+        self.counts: Counter[str] = Counter()
+    
+    def record(self, **shape: Any) -> None:
+        """Count one request for a list shape (list_students_with_avg arguments)."""
+        if shape.get("offset") or not _recording.get():
+            return
+        query = urlencode({name: value for name, value in shape.items() if value is not None and name != "offset"})
+        if query in self.counts or len(self.counts) < self.max_shapes:
+            self.counts[query] += 1
+    
+    @staticmethod
+    @contextlib.contextmanager
+    def not_recorded() -> Iterator[None]:
+        """Do not count the lists run by the current task inside this block."""
+        token = _recording.set(False)
+        try:
+            yield
+        finally:
+            _recording.reset(token)
+    
+    def most_common(self, n: int) -> list[str]:
+        """The n most requested shapes as query strings."""
+        return [query for query, _ in self.counts.most_common(n)]
+    
+    def load(self, path: Path) -> None:
+        """Add the counts saved by save(); a missing or unreadable file is ignored."""
+        try:
+            saved = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return
+        if isinstance(saved, dict):
+            self.counts.update({query: count for query, count in saved.items() if isinstance(count, int)})
+    
+    def save(self, path: Path, n: int) -> None:
+        """Write the n most requested shapes atomically (last worker to stop wins)."""
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(dict(self.counts.most_common(n))))
+        os.replace(tmp, path)
+
+
+# First-page list shapes requested from this worker
+shape_stats = ShapeStats()
+
+
+async def prime_page_cache(engine: AsyncEngine, tables: Iterable[Table]) -> int:
+    """
+    Read every page of the tables and their indexes once, SQLite only.
+    
+    count(*) through a b-tree (NOT INDEXED for the table, INDEXED BY for
+    each index) visits all of its pages, which loads the file into the OS
+    page cache shared by every worker. Returns the number of b-trees read;
+    indexes missing from the database are skipped.
+    """
+    if engine.dialect.name != "sqlite":
+        return 0
+    read = 0
+    async with engine.connect() as conn:
+        for table in tables:
+            scans = [f"{table.name} NOT INDEXED"] + [f"{table.name} INDEXED BY {index.name}" for index in table.indexes]
+            for scan in scans:
+                try:
+                    await conn.execute(text(f"SELECT count(*) FROM {scan}"))
+                except DBAPIError:
+                    continue
+                read += 1
+    return read
+
+
+class WarmUp:
+    """
+    Background warm-up of this worker, run once at startup.
+    
+    While it runs the worker reports not ready. It ends when the work
+    finishes, fails or exceeds its timeout; the caches then fill on demand.
+    """
+    
+    def __init__(self) -> None:
+        self.running = False
+        self.seconds: float | None = None
+        self._task: asyncio.Task | None = None
+    
+    def start(self, work: Callable[[], Awaitable[None]], timeout: float) -> None:
+        """Run work on the running loop for at most timeout seconds."""
+        self.running = True
+        self._task = asyncio.create_task(self._run(work, timeout))
+    
+    async def _run(self, work: Callable[[], Awaitable[None]], timeout: float) -> None:
+        started = time.perf_counter()
+        try:
+            async with asyncio.timeout(timeout):
+                await work()
+        except TimeoutError:
+            logger.warning("Warm-up stopped after %.1fs timeout", timeout)
+        except Exception:
+            logger.exception("Warm-up failed")
+        finally:
+            self.seconds = time.perf_counter() - started
+            self.running = False
+        logger.info("Warm-up finished in %.3fs", self.seconds)
+    
+    async def wait(self) -> None:
+        """Wait until the warm-up has ended."""
+        if self._task is not None:
+            await self._task
+    
+    async def stop(self) -> None:
+        """Cancel the warm-up if it is still running."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        self.running = False
+
+
+warmup = WarmUp()
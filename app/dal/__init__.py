@@ -1,10 +1,20 @@
 """Data access layer."""
-from app.dal.grade import add_grade
-from app.dal.student import create_student, list_students_with_avg
+from app.dal.change import list_changes
+from app.dal.counter import get_counter, increment_counter
+from app.dal.grade import add_grade, grade_totals, list_student_grades
+from app.dal.student import count_students, create_student, get_student, list_student_fields, list_students_with_avg
 
 __all__ = [
     "create_student",
     "add_grade",
+    "list_student_grades",
     "list_students_with_avg",
+    "count_students",
+    "list_student_fields",
+    "get_student",
+    "grade_totals",
+    "get_counter",
+    "increment_counter",
+    "list_changes",
 ]
 
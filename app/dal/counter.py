@@ -0,0 +1,47 @@
+"""Counter data access layer."""
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from app.core.tracing import traced
+from app.models.counter import Counter
+
+
+@traced
+async def increment_counter(
+    session: AsyncSession | AsyncConnection,
+    name: str,
+    amount: int = 1,
+    shard_id: str | None = None,
+) -> int:
+    """
+    Increment a counter inside the caller's transaction and return its new value.
+    
+    With sharding every shard has its own counters: pass the shard of the
+    write being accounted for, so it commits together with that write.
+    Without shard_id a sharded session bumps the counter on every shard and
+    returns the sum.
+    
+    Note: does not commit. Call before the commit of the write it accounts for,
+    so the counter and the data change become visible together.
+    """
+    stmt = (
+        update(Counter)
+        .where(Counter.name == name)
+        .values(value=Counter.value + amount)
+        .returning(Counter.value)
+    )
+    if shard_id is None:
+        result = await session.execute(stmt)
+    else:
+        result = await session.execute(stmt, bind_arguments={"shard_id": shard_id})
+    return sum(result.scalars())
+
+
+@traced
+async def get_counter(
+    session: AsyncSession,
+    name: str,
+) -> int:
+    """Return the current value of a counter, summed over shards (0 if it does not exist)."""
+    result = await session.execute(select(Counter.value).where(Counter.name == name))
+    return sum(result.scalars())
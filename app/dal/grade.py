@@ -1,12 +1,61 @@
 """Grade data access layer."""
 import uuid
+from datetime import datetime
+from typing import Literal
 
+from sqlalchemy import Float, Subquery, cast, func, select, tuple_, union_all
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import archived_flag
+from app.core.ids import new_id
+from app.core.sharding import student_shard
+from app.core.tracing import traced
+from app.dal.counter import increment_counter
+from app.models.counter import ARCHIVED_GRADES, DATA_VERSION, SUMMARIES_ENABLED, Counter
 from app.models.grade import Grade
+from app.models.grade_summary import GradeSummary
 from app.schemas.grade import GradeCreate
 
+# Averages for queries that outer join grades (and, once grades have been
+# archived, grade_summaries) to students and group by student. NULL when the
+# student has no grades at all.
+AVG_GRADE = func.avg(Grade.score)
+# Live grades plus the archived summary; the query must also group by
+# GradeSummary.student_id, which makes the summary columns usable as is.
+COMBINED_AVG_GRADE = cast(
+    func.coalesce(func.sum(Grade.score), 0) + func.coalesce(GradeSummary.score_sum, 0),
+    Float,
+) / func.nullif(func.count(Grade.score) + func.coalesce(GradeSummary.score_count, 0), 0)
 
+
+async def has_archived_grades(session: AsyncSession) -> bool:
+    """
+    True once grades are (about to be) archived into grade_summaries, on any shard.
+    
+    Answered from the worker's archived_flag; the counters are only read
+    while it is false, at most every settings.archive_check_interval.
+    """
+    archived = archived_flag.known()
+    if archived is None:
+        result = await session.execute(
+            select(func.sum(Counter.value)).where(Counter.name.in_([ARCHIVED_GRADES, SUMMARIES_ENABLED]))
+        )
+        archived = sum(value or 0 for value in result.scalars()) > 0
+        archived_flag.set(archived)
+    return archived
+
+
+def score_totals() -> Subquery:
+    """(student_id, score_sum, score_count) rows of live grades and summaries; sum them per student."""
+    live = (
+        select(Grade.student_id, func.sum(Grade.score).label("score_sum"), func.count().label("score_count"))
+        .group_by(Grade.student_id)
+    )
+    archived = select(GradeSummary.student_id, GradeSummary.score_sum, GradeSummary.score_count)
+    return union_all(live, archived).subquery("score_totals")
+
+
+@traced
 async def add_grade(
     session: AsyncSession,
     grade_data: GradeCreate,
@@ -17,13 +66,79 @@ async def add_grade(
     Note: IntegrityError (e.g., constraint violations) should be handled
     at the service/API layer with proper rollback.
     """
+    shard_id = student_shard(session, grade_data.student_id)
     grade = Grade(
-        id=uuid.uuid4(),
+        id=new_id(),
         student_id=grade_data.student_id,
         score=grade_data.score,
+        change_seq=await increment_counter(session, DATA_VERSION, shard_id=shard_id),
     )
     session.add(grade)
     await session.commit()
     await session.refresh(grade)
     return grade
 
+
+@traced
+async def grade_totals(session: AsyncSession) -> list[tuple[uuid.UUID, int, int]]:
+    """Return (student_id, score sum, grade count) for every student with grades, archived included."""
+    if await has_archived_grades(session):
+        totals = score_totals()
+        stmt = (
+            select(totals.c.student_id, func.sum(totals.c.score_sum), func.sum(totals.c.score_count))
+            .group_by(totals.c.student_id)
+        )
+    else:
+        stmt = select(Grade.student_id, func.sum(Grade.score), func.count()).group_by(Grade.student_id)
+    result = await session.execute(stmt)
+    return [tuple(row) for row in result]
+
+
+@traced
+async def list_student_grades(
+    session: AsyncSession,
+    student_id: uuid.UUID,
+    after: tuple[datetime, uuid.UUID] | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    order: Literal["asc", "desc"] = "desc",
+    limit: int = 100,
+) -> tuple[list[Grade], bool]:
+    """
+    One page of a student's grades in (created_at, id) order.
+    
+    Args:
+        after: (created_at, id) of the last grade of the previous page
+        since / until: Only grades created at or after since, and before until
+        order: desc for newest first
+        limit: Maximum grades per page
+    
+    Returns:
+        (grades, has_more)
+    
+    Note:
+        Keyset pagination on ix_grades_student_id_created_at: the page is an
+        index range starting right after `after`, so it costs O(limit)
+        however deep it is and however many grades the student has.
+    """
+    key = tuple_(Grade.created_at, Grade.id)
+    stmt = select(Grade).where(Grade.student_id == student_id)
+    if since is not None:
+        stmt = stmt.where(Grade.created_at >= since)
+    if until is not None:
+        stmt = stmt.where(Grade.created_at < until)
+    if order == "desc":
+        if after is not None:
+            stmt = stmt.where(key < after)
+        stmt = stmt.order_by(Grade.created_at.desc(), Grade.id.desc())
+    else:
+        if after is not None:
+            stmt = stmt.where(key > after)
+        stmt = stmt.order_by(Grade.created_at, Grade.id)
+    
+    result = await session.execute(
+        stmt.limit(limit + 1),
+        bind_arguments={"shard_id": student_shard(session, student_id)},
+    )
+    grades = list(result.scalars())
+    return grades[:limit], len(grades) > limit
@@ -0,0 +1,38 @@
+"""Report data access layer (synchronous, for report processes)."""
+from collections.abc import Iterator
+
+from sqlalchemy import Connection, Row, func, select
+
+from app.dal.grade import score_totals
+from app.models.student import Student
+
+
+def roster_rows(conn: Connection) -> Iterator[Row]:
+    """
+    Stream (id, name, created_at, score_sum, score_count) of every student.
+    
+    Totals include archived grades; students without grades have 0 and 0.
+    Rows come in (name, id) order, fetched in batches.
+    """
+    totals = score_totals()
+    per_student = (
+        select(
+            totals.c.student_id,
+            func.sum(totals.c.score_sum).label("score_sum"),
+            func.sum(totals.c.score_count).label("score_count"),
+        )
+        .group_by(totals.c.student_id)
+        .subquery("per_student")
+    )
+    stmt = (
+        select(
+            Student.id,
+            Student.name,
+            Student.created_at,
+            func.coalesce(per_student.c.score_sum, 0).label("score_sum"),
+            func.coalesce(per_student.c.score_count, 0).label("score_count"),
+        )
+        .outerjoin(per_student, Student.id == per_student.c.student_id)
+        .order_by(Student.name, Student.id)
+    )
+    return conn.execution_options(yield_per=10_000).execute(stmt)
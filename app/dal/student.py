@@ -1,15 +1,28 @@
 """Student data access layer."""
+import functools
+import heapq
 import uuid
-from typing import Literal
+from collections.abc import Callable, Sequence
+from datetime import datetime
+from itertools import islice
+from typing import Any, Literal
 
-from sqlalchemy import func, select
+from sqlalchemy import Float, Row, Select, bindparam, cast, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.ids import new_id
+from app.core.sharding import session_shards, student_shard
+from app.core.tracing import traced
+from app.dal.counter import get_counter, increment_counter
+from app.dal.grade import AVG_GRADE, COMBINED_AVG_GRADE, has_archived_grades, score_totals
+from app.models.counter import DATA_VERSION, STUDENT_COUNT
 from app.models.grade import Grade
+from app.models.grade_summary import GradeSummary
 from app.models.student import Student
 from app.schemas.student import StudentCreate
 
 
+@traced
 async def create_student(
     session: AsyncSession,
     student_data: StudentCreate,
@@ -20,16 +33,204 @@ async def create_student(
     Note: IntegrityError should be handled at the service/API layer
     with proper rollback.
     """
+    student_id = new_id()
+    shard_id = student_shard(session, student_id)
     student = Student(
-        id=uuid.uuid4(),
+        id=student_id,
         name=student_data.name,
+        change_seq=await increment_counter(session, DATA_VERSION, shard_id=shard_id),
     )
     session.add(student)
+    await increment_counter(session, STUDENT_COUNT, shard_id=shard_id)
     await session.commit()
     await session.refresh(student)
     return student
 
 
+# Student columns selectable through sparse fieldsets (avg_grade is computed)
+STUDENT_COLUMNS = {
+    "id": Student.id,
+    "name": Student.name,
+    "created_at": Student.created_at,
+}
+
+
+@traced
+async def student_rows(session: AsyncSession) -> list[tuple[uuid.UUID, str, datetime]]:
+    """Return (id, name, created_at) of every student, from every shard."""
+    result = await session.execute(select(Student.id, Student.name, Student.created_at))
+    return [tuple(row) for row in result]
+
+
+@traced
+async def get_student(
+    session: AsyncSession,
+    student_id: uuid.UUID,
+) -> Student | None:
+    """Return a student by id, or None if it does not exist."""
+    result = await session.execute(select(Student).where(Student.id == student_id))
+    return result.scalar_one_or_none()
+
+
+# Label of the extra sort column added to sharded list queries
+SORT_KEY = "sort_key"
+
+
+def _avg_grade(archived: bool):
+    return COMBINED_AVG_GRADE if archived else AVG_GRADE
+
+
+def _sort_column(sort_by: Literal["name", "avg_grade", "created_at"], archived: bool):
+    return {
+        "name": Student.name,
+        "avg_grade": _avg_grade(archived),
+        "created_at": Student.created_at,
+    }[sort_by]
+
+
+def _join_grades(stmt: Select, archived: bool) -> Select:
+    """Outer join grades, and the archived summaries if any, grouped per student."""
+    if not archived:
+        return stmt.outerjoin(Grade, Student.id == Grade.student_id).group_by(Student.id)
+    # Summary first: SQLite keeps LEFT JOIN order, so it is looked up once per
+    # student instead of once per grade. Grouping by its key too lets
+    # COMBINED_AVG_GRADE read its columns without aggregating them.
+    return (
+        stmt.outerjoin(GradeSummary, Student.id == GradeSummary.student_id)
+        .outerjoin(Grade, Student.id == Grade.student_id)
+        .group_by(Student.id, GradeSummary.student_id)
+    )
+
+
+def _apply_list_options(
+    stmt: Select,
+    filtered: bool,
+    sort_by: Literal["name", "avg_grade", "created_at"],
+    order: Literal["asc", "desc"],
+    sort_key: bool,
+    archived: bool,
+) -> Select:
+    """
+    Apply the list filter, sorting and pagination to a students query.
+    
+    Values are left as bound parameters (min_avg_grade, limit, offset), so
+    the statement depends only on its shape and can be built once.
+    """
+    # Apply min_avg_grade filter if requested
+    # HAVING clause excludes students without grades (NULL avg_grade)
+    if filtered:
+        stmt = stmt.having(_avg_grade(archived) >= bindparam("min_avg_grade"))
+    
+    # Apply sorting (validated via Literal type in function signature)
+    sort_column = _sort_column(sort_by, archived)
+    if sort_key:
+        # Sharded lists merge per-shard results on this column
+        stmt = stmt.add_columns(sort_column.label(SORT_KEY))
+    if order == "desc":
+        stmt = stmt.order_by(sort_column.desc())
+    else:
+        stmt = stmt.order_by(sort_column.asc())
+    
+    # Apply pagination (limit/offset validated in API layer)
+    stmt = stmt.limit(bindparam("limit")).offset(bindparam("offset"))
+    
+    return stmt
+
+
+# Statement variants, one per query shape, built on first use and reused.
+# list_students_with_avg has 3 sort keys x 2 orders x with/without filter
+# (x with/without archived grades x sharded or not); executing a prebuilt
+# statement skips constructing the select() and lets SQLAlchemy reuse the
+# compiled SQL from its cache without re-deriving the cache key from a
+# fresh construct.
+@functools.cache
+def _students_with_avg_statement(
+    sort_by: Literal["name", "avg_grade", "created_at"],
+    order: Literal["asc", "desc"],
+    filtered: bool,
+    archived: bool,
+    sort_key: bool,
+) -> Select:
+    # Aggregation query with LEFT JOIN (and the archived summaries if any)
+    stmt = _join_grades(
+        select(
+            Student,
+            _avg_grade(archived).label("avg_grade"),
+        ),
+        archived,
+    )
+    return _apply_list_options(stmt, filtered, sort_by, order, sort_key, archived)
+
+
+# Sparse fieldsets multiply the shapes by the field combinations: bounded LRU
+@functools.lru_cache(maxsize=256)
+def _student_fields_statement(
+    fields: tuple[str, ...],
+    sort_by: Literal["name", "avg_grade", "created_at"],
+    order: Literal["asc", "desc"],
+    filtered: bool,
+    archived: bool,
+    sort_key: bool,
+) -> Select:
+    # Only the requested columns; the grades join and GROUP BY are skipped
+    # unless avg_grade is requested, filtered on or sorted by
+    join_grades = "avg_grade" in fields or filtered or sort_by == "avg_grade"
+    columns = [
+        _avg_grade(archived).label(field) if field == "avg_grade" else STUDENT_COLUMNS[field].label(field)
+        for field in fields
+    ]
+    
+    stmt = select(*columns).select_from(Student)
+    if join_grades:
+        stmt = _join_grades(stmt, archived)
+    return _apply_list_options(stmt, filtered, sort_by, order, sort_key, archived)
+
+
+def _null_first_key(row: Row) -> tuple[bool, Any]:
+    # Matches SQLite: NULL sorts before every value ascending, after descending
+    value = row._mapping[SORT_KEY]
+    return (value is not None, value)
+
+
+async def _execute_list(
+    session: AsyncSession,
+    variant: Callable[[bool], Select],
+    min_avg_grade: float | None,
+    order: Literal["asc", "desc"],
+    limit: int,
+    offset: int,
+) -> list[Row]:
+    """
+    Run a list statement variant, scatter-gather across shards when sharded.
+    
+    variant(sort_key) returns the prebuilt statement, with the sort value as
+    an extra column when sort_key is set. Each shard returns its own first
+    offset + limit rows in order, together with the sort value. Those runs
+    are k-way merged and the requested page is sliced from the merged
+    stream, so at most offset + limit rows per shard are transferred and
+    nothing is sorted twice.
+    """
+    params: dict[str, Any] = {"limit": limit, "offset": offset}
+    if min_avg_grade is not None:
+        params["min_avg_grade"] = min_avg_grade
+    
+    shard_ids = session_shards(session)
+    if len(shard_ids) == 1:
+        result = await session.execute(variant(False), params)
+        return list(result.all())
+    
+    stmt = variant(True)
+    params.update(limit=offset + limit, offset=0)
+    runs = []
+    for shard_id in shard_ids:
+        result = await session.execute(stmt, params, bind_arguments={"shard_id": shard_id})
+        runs.append(result.all())
+    
+    merged = heapq.merge(*runs, key=_null_first_key, reverse=order == "desc")
+    return list(islice(merged, offset, offset + limit))
+
+
+@traced
 async def list_students_with_avg(
     session: AsyncSession,
     min_avg_grade: float | None = None,
@@ -55,40 +256,16 @@ async def list_students_with_avg(
     Note:
         Uses LEFT JOIN to include students without grades.
         HAVING clause filters out NULL averages when min_avg_grade is provided.
+        Once grades have been archived, averages also include the students'
+        grade_summaries rows.
+        With sharding the query runs on every shard and the results are merged.
     """
-    # Build aggregation query with LEFT JOIN
-    stmt = (
-        select(
-            Student,
-            func.avg(Grade.score).label("avg_grade"),
-        )
-        .outerjoin(Grade, Student.id == Grade.student_id)
-        .group_by(Student.id)
+    # Execute the prebuilt statement for this shape (filter, sort and paginate)
+    archived = await has_archived_grades(session)
+    variant = functools.partial(
+        _students_with_avg_statement, sort_by, order, min_avg_grade is not None, archived
     )
-    
-    # Apply min_avg_grade filter if provided
-    # HAVING clause excludes students without grades (NULL avg_grade)
-    if min_avg_grade is not None:
-        stmt = stmt.having(func.avg(Grade.score) >= min_avg_grade)
-    
-    # Apply sorting (validated via Literal type in function signature)
-    sort_column = {
-        "name": Student.name,
-        "avg_grade": func.avg(Grade.score),
-        "created_at": Student.created_at,
-    }[sort_by]
-    
-    if order == "desc":
-        stmt = stmt.order_by(sort_column.desc())
-    else:
-        stmt = stmt.order_by(sort_column.asc())
-    
-    # Apply pagination (limit/offset validated in API layer)
-    stmt = stmt.limit(limit).offset(offset)
-    
-    # Execute query
-    result = await session.execute(stmt)
-    rows = result.all()
+    rows = await _execute_list(session, variant, min_avg_grade, order, limit, offset)
     
     # Convert to list of tuples (Student, avg_grade)
     # Access by index: row[0] = Student, row[1] = avg_grade
@@ -97,3 +274,77 @@ async def list_students_with_avg(
         for row in rows
     ]
 
+
+@traced
+async def list_student_fields(
+    session: AsyncSession,
+    fields: Sequence[str],
+    min_avg_grade: float | None = None,
+    sort_by: Literal["name", "avg_grade", "created_at"] = "name",
+    order: Literal["asc", "desc"] = "asc",
+    limit: int = 100,
+    offset: int = 0,
+) -> list[dict[str, Any]]:
+    """
+    List only the requested student fields (sparse fieldset).
+    
+    Args:
+        fields: Subset of id, name, created_at, avg_grade, in output order
+        Other arguments as in list_students_with_avg.
+    
+    Returns:
+        List of dicts holding exactly the requested keys.
+    
+    Note:
+        Only the requested columns are selected. The grades join and GROUP BY
+        are skipped entirely unless avg_grade is requested, filtered on or
+        sorted by.
+    """
+    needs_avg = "avg_grade" in fields or min_avg_grade is not None or sort_by == "avg_grade"
+    archived = needs_avg and await has_archived_grades(session)
+    variant = functools.partial(
+        _student_fields_statement, tuple(fields), sort_by, order, min_avg_grade is not None, archived
+    )
+    result = await _execute_list(session, variant, min_avg_grade, order, limit, offset)
+    rows = [{field: row._mapping[field] for field in fields} for row in result]
+    
+    if "avg_grade" in fields:
+        for row in rows:
+            if row["avg_grade"] is not None:
+                row["avg_grade"] = float(row["avg_grade"])
+    return rows
+
+
+@traced
+async def count_students(
+    session: AsyncSession,
+    min_avg_grade: float | None = None,
+) -> int:
+    """
+    Count students matching the list filter.
+    
+    Without a filter this reads the maintained student counter (O(1)).
+    With min_avg_grade it aggregates grade totals only (live grades and
+    archived summaries), since students without grades never pass the
+    filter and no student columns are needed. Both are summed over shards.
+    """
+    if min_avg_grade is None:
+        return await get_counter(session, STUDENT_COUNT)
+    
+    if await has_archived_grades(session):
+        totals = score_totals()
+        matching = (
+            select(totals.c.student_id)
+            .group_by(totals.c.student_id)
+            .having(cast(func.sum(totals.c.score_sum), Float) / func.sum(totals.c.score_count) >= min_avg_grade)
+            .subquery()
+        )
+    else:
+        matching = (
+            select(Grade.student_id)
+            .group_by(Grade.student_id)
+            .having(func.avg(Grade.score) >= min_avg_grade)
+            .subquery()
+        )
+    result = await session.execute(select(func.count()).select_from(matching))
+    return sum(result.scalars())
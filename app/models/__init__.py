@@ -1,6 +1,9 @@
 """ORM models."""
+from app.models.counter import Counter
 from app.models.grade import Grade
+from app.models.grade_summary import GradeSummary
+from app.models.schema_version import SchemaVersion
 from app.models.student import Student
 
-__all__ = ["Student", "Grade"]
+__all__ = ["Student", "Grade", "GradeSummary", "Counter", "SchemaVersion"]
 
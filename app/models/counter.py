@@ -0,0 +1,49 @@
+"""Counter ORM model."""
+from sqlalchemy import Integer, String, event
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+# Bumped in the same transaction as every write, so any worker can detect
+# writes made by other workers with a single primary-key lookup; its value
+# is also the change_seq of the written row. Cost: the row stays locked
+# until the writer commits, so on PostgreSQL writes to one database (one
+# shard) commit one at a time, however many connections they use. SQLite
+# has a single writer anyway. The change feed needs it on every write, so
+# it cannot be skipped; add shards to scale writes.
+DATA_VERSION = "data_version"
+
+# Number of rows in the students table, maintained by every insert so that
+# totals never need a COUNT over the table. Locked like data_version, and
+# only by student inserts, which already hold that.
+STUDENT_COUNT = "students"
+
+# Number of grades folded into grade_summaries by archival. While it is 0,
+# averages are computed from the grades table alone, without the summaries.
+ARCHIVED_GRADES = "archived_grades"
+
+# Set to 1 by the archive command before it first moves grades (created by
+# it on older databases): workers then include grade_summaries in averages.
+# It is never reset, so a worker that has seen it stops reading it.
+SUMMARIES_ENABLED = "summaries_enabled"
+
+# Counters that must exist before the first write
+SEEDED_COUNTERS = (DATA_VERSION, STUDENT_COUNT, ARCHIVED_GRADES)
+
+
+class Counter(Base):
+    """Named integer counter shared by all workers through the database."""
+    
+    __tablename__ = "counters"
+    
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    value: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+@event.listens_for(Counter.__table__, "after_create")
+def _seed_counters(target, connection, **kw) -> None:
+    """Insert the seeded counters whenever the table is created."""
+    connection.execute(
+        target.insert(),
+        [{"name": name, "value": 0} for name in SEEDED_COUNTERS],
+    )
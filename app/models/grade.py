@@ -1,12 +1,13 @@
 """Grade ORM model."""
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Integer, DateTime, ForeignKey, CheckConstraint, func
+from sqlalchemy import Integer, DateTime, ForeignKey, CheckConstraint, Index, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
+from app.core.ids import IdType, new_id
 
 if TYPE_CHECKING:
     from app.models.student import Student
@@ -18,23 +19,36 @@ class Grade(Base):
     __tablename__ = "grades"
     
     id: Mapped[uuid.UUID] = mapped_column(
+        IdType,
         primary_key=True,
-        default=uuid.uuid4,
-        index=True,
+        default=new_id,
     )
     student_id: Mapped[uuid.UUID] = mapped_column(
+        IdType,
         ForeignKey("students.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     score: Mapped[int] = mapped_column(
         Integer,
         nullable=False,
     )
+    # Indexed for archival, which moves grades older than a cutoff. Set on
+    # the client so SQLite stores every value with microseconds, in the
+    # same format as bound parameters (keyset pagination compares them).
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
         server_default=func.now(),
         nullable=False,
+        index=True,
+    )
+    # Position in the change feed: taken from the data_version counter in the
+    # same transaction, so it increases in commit order within a shard
+    change_seq: Mapped[int | None] = mapped_column(
+        Integer,
+        nullable=True,
+        unique=True,
+        index=True,
     )
     
     # Relationships
@@ -45,5 +59,8 @@ class Grade(Base):
     
     __table_args__ = (
         CheckConstraint("score >= 0 AND score <= 100", name="check_score_range"),
+        # A student's grades in (created_at, id) order, for keyset pagination
+        # of their history; also serves every lookup by student_id
+        Index("ix_grades_student_id_created_at", "student_id", "created_at", "id"),
     )
 
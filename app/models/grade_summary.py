@@ -0,0 +1,33 @@
+"""Grade summary ORM model."""
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+from app.core.ids import IdType
+
+
+class GradeSummary(Base):
+    """
+    Aggregate of a student's archived grades.
+    
+    Grades older than an archival cutoff are folded into this row and
+    deleted from grades. Averages combine it with the remaining live grades:
+    (score_sum + live sum) / (score_count + live count).
+    """
+    
+    __tablename__ = "grade_summaries"
+    
+    student_id: Mapped[uuid.UUID] = mapped_column(
+        IdType,
+        ForeignKey("students.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    score_sum: Mapped[int] = mapped_column(Integer, nullable=False)
+    score_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    score_min: Mapped[int] = mapped_column(Integer, nullable=False)
+    score_max: Mapped[int] = mapped_column(Integer, nullable=False)
+    # created_at of the newest grade folded in
+    archived_until: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
@@ -0,0 +1,20 @@
+"""Schema version ORM model."""
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class SchemaVersion(Base):
+    """One row per applied migration (see app.core.migrations)."""
+    
+    __tablename__ = "schema_version"
+    
+    version: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    applied_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
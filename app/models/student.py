@@ -3,10 +3,11 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import String, DateTime, func
+from sqlalchemy import String, DateTime, Integer, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
+from app.core.ids import IdType, new_id
 
 if TYPE_CHECKING:
     from app.models.grade import Grade
@@ -18,9 +19,9 @@ class Student(Base):
     __tablename__ = "students"
     
     id: Mapped[uuid.UUID] = mapped_column(
+        IdType,
         primary_key=True,
-        default=uuid.uuid4,
-        index=True,
+        default=new_id,
     )
     name: Mapped[str] = mapped_column(String(100), nullable=False)
     created_at: Mapped[datetime] = mapped_column(
@@ -28,6 +29,14 @@ class Student(Base):
         server_default=func.now(),
         nullable=False,
     )
+    # Position in the change feed: taken from the data_version counter in the
+    # same transaction, so it increases in commit order within a shard
+    change_seq: Mapped[int | None] = mapped_column(
+        Integer,
+        nullable=True,
+        unique=True,
+        index=True,
+    )
     
     # Relationships
     grades: Mapped[list["Grade"]] = relationship(
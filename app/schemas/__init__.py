@@ -1,12 +1,30 @@
 """Pydantic schemas."""
-from app.schemas.grade import GradeCreate, GradeCreateBody, GradeResponse
-from app.schemas.student import StudentCreate, StudentResponse
+from app.schemas.change import ChangePage, GradeChange, StudentChange
+from app.schemas.grade import GradeCreate, GradeCreateBody, GradePage, GradeResponse
+from app.schemas.health import AdmissionCheck, DatabaseCheck, Liveness, LoopStallReport, LoopStats, PoolStats, Readiness
+from app.schemas.report import ReportCreate, ReportJob
+from app.schemas.student import StudentCreate, StudentFields, StudentPercentile, StudentResponse
 
 __all__ = [
     "StudentCreate",
     "StudentResponse",
+    "StudentFields",
+    "StudentPercentile",
     "GradeCreate",
     "GradeCreateBody",
     "GradeResponse",
+    "GradePage",
+    "StudentChange",
+    "GradeChange",
+    "ChangePage",
+    "Liveness",
+    "PoolStats",
+    "DatabaseCheck",
+    "AdmissionCheck",
+    "Readiness",
+    "LoopStallReport",
+    "LoopStats",
+    "ReportCreate",
+    "ReportJob",
 ]
 
@@ -0,0 +1,39 @@
+"""Change feed Pydantic schemas."""
+import uuid
+from datetime import datetime
+from typing import Annotated, Literal
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class StudentChange(BaseModel):
+    """A student created at change feed position seq."""
+    
+    model_config = ConfigDict(from_attributes=True)
+    
+    type: Literal["student"] = "student"
+    seq: int = Field(..., validation_alias="change_seq")
+    id: uuid.UUID
+    name: str
+    created_at: datetime
+
+
+class GradeChange(BaseModel):
+    """A grade created at change feed position seq."""
+    
+    model_config = ConfigDict(from_attributes=True)
+    
+    type: Literal["grade"] = "grade"
+    seq: int = Field(..., validation_alias="change_seq")
+    id: uuid.UUID
+    student_id: uuid.UUID
+    score: int
+    created_at: datetime
+
+
+class ChangePage(BaseModel):
+    """One page of the change feed."""
+    
+    changes: list[Annotated[StudentChange | GradeChange, Field(discriminator="type")]]
+    next_cursor: str = Field(..., description="Pass as ?cursor= to continue after this page")
+    has_more: bool = Field(..., description="More changes are available right now")
@@ -28,3 +28,14 @@ class GradeResponse(BaseModel):
     score: int
     created_at: datetime
 
+
+class GradePage(BaseModel):
+    """One page of a student's grade history."""
+    
+    grades: list[GradeResponse]
+    next_cursor: str | None = Field(
+        None,
+        description="Pass as ?cursor= for the next page; null on the last page",
+    )
+    has_more: bool
+
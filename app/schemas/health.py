@@ -0,0 +1,75 @@
+"""Health check Pydantic schemas."""
+from datetime import datetime
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+
+class Liveness(BaseModel):
+    """The process is up and its event loop is serving requests."""
+    
+    status: Literal["alive"] = "alive"
+
+
+class PoolStats(BaseModel):
+    """Connection pool usage; None for pools without a limit (in-memory SQLite)."""
+    
+    size: int | None
+    checked_out: int | None
+    overflow: int | None
+    capacity: int | None
+
+
+class DatabaseCheck(BaseModel):
+    """Ping result and pool usage of one database (shard)."""
+    
+    shard: str
+    latency_ms: float | None  # None when the ping failed
+    error: str | None = None
+    pool: PoolStats
+
+
+class AdmissionCheck(BaseModel):
+    """Usage of one admission limiter."""
+    
+    name: str
+    active: int
+    max_concurrent: int
+    waiting: int
+    max_queue: int
+    rejected: int
+
+
+class Readiness(BaseModel):
+    """Readiness report; reasons lists every failed check."""
+    
+    ready: bool
+    reasons: list[str]
+    loop_lag_ms: float
+    databases: list[DatabaseCheck]
+    admission: list[AdmissionCheck]
+    startup_seconds: dict[str, float] = Field(
+        default_factory=dict,
+        description="How long this worker took to import, check the schema and start",
+    )
+
+
+class LoopStallReport(BaseModel):
+    """One event-loop stall."""
+    
+    at: datetime
+    lag_ms: float
+    stack: list[str] | None = Field(None, description="Stack of the blocking code, with LOOP_DEBUG")
+
+
+class LoopStats(BaseModel):
+    """Event-loop lag of this worker."""
+    
+    interval_ms: float
+    lag_ms: float = Field(..., description="Lag of the last sample")
+    max_lag_ms: float = Field(..., description="Largest lag since the worker started")
+    samples: int
+    stall_threshold_ms: float
+    stall_count: int = Field(..., description="Samples later than the threshold since the worker started")
+    debug: bool
+    stalls: list[LoopStallReport] = Field(..., description="Most recent stalls, oldest first")
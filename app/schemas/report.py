@@ -0,0 +1,31 @@
+"""Report job Pydantic schemas."""
+import uuid
+from datetime import datetime
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+ReportKind = Literal["roster", "percentiles"]
+
+
+class ReportCreate(BaseModel):
+    """Schema for submitting a report job."""
+    
+    kind: ReportKind = Field(
+        ...,
+        description="roster: every student with grade count and average; "
+        "percentiles: graded students with their percentile rank",
+    )
+
+
+class ReportJob(BaseModel):
+    """Status of a report job."""
+    
+    id: uuid.UUID
+    kind: ReportKind
+    status: Literal["running", "done", "failed"]
+    created_at: datetime
+    finished_at: datetime | None = None
+    rows: int | None = Field(None, description="Rows in the CSV, once done")
+    size: int | None = Field(None, description="CSV size in bytes, once done")
+    error: str | None = Field(None, description="Why the job failed")
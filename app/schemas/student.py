@@ -2,7 +2,8 @@
 import uuid
 from datetime import datetime
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+from typing_extensions import TypedDict  # pydantic requires it before Python 3.12
 
 
 class StudentCreate(BaseModel):
@@ -22,3 +23,26 @@ class StudentResponse(BaseModel):
     avg_grade: float | None = Field(None, description="Average grade (computed elsewhere)")
 
 
+class StudentPercentile(BaseModel):
+    """Schema for a student's percentile rank among graded students."""
+    
+    student_id: uuid.UUID
+    avg_grade: float | None = Field(None, description="Average grade, None without grades")
+    percentile_rank: float | None = Field(
+        None,
+        description="Percent of graded students with a lower average (ties count half)",
+    )
+    graded_students: int = Field(..., description="Number of students with grades")
+
+
+class StudentFields(TypedDict, total=False):
+    """Sparse student row: only the fields requested via ?fields= are present."""
+    
+    id: uuid.UUID
+    name: str
+    created_at: datetime
+    avg_grade: float | None
+
+
+# Serializes sparse rows straight to JSON bytes, emitting only present keys
+student_fields_list = TypeAdapter(list[StudentFields])
@@ -1,10 +1,24 @@
 """Service layer."""
-from app.services.grade import add_grade
-from app.services.student import create_student, list_students_with_avg
+from app.services.change import list_changes
+from app.services.grade import add_grade, list_student_grades
+from app.services.health import loop_stats, readiness
+from app.services.report import get_report, submit_report
+from app.services.student import count_students, create_student, list_student_fields, list_students_with_avg, student_percentile
+from app.services.warmup import warm_up
 
 __all__ = [
     "create_student",
     "add_grade",
+    "list_student_grades",
     "list_students_with_avg",
+    "count_students",
+    "list_student_fields",
+    "student_percentile",
+    "list_changes",
+    "readiness",
+    "loop_stats",
+    "submit_report",
+    "get_report",
+    "warm_up",
 ]
 
@@ -0,0 +1,66 @@
+"""Change feed service layer."""
+import base64
+import binascii
+import json
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.tracing import traced
+from app.dal.change import list_changes as dal_list_changes
+from app.models.student import Student
+from app.schemas.change import ChangePage, GradeChange, StudentChange
+
+
+def encode_cursor(positions: dict[str, int]) -> str:
+    """Opaque cursor for per-shard change feed positions."""
+    data = json.dumps(positions, separators=(",", ":"), sort_keys=True).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str | None) -> dict[str, int]:
+    """
+    Parse a cursor from encode_cursor (None: start of the feed).
+    
+    Raises ValueError for malformed cursors (converted to 400 in API layer).
+    """
+    if not cursor:
+        return {}
+    try:
+        positions = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError):
+        raise ValueError("Malformed cursor") from None
+    if not isinstance(positions, dict) or not all(
+        isinstance(shard_id, str) and type(seq) is int and seq >= 0 for shard_id, seq in positions.items()
+    ):
+        raise ValueError("Malformed cursor")
+    return positions
+
+
+@traced
+async def list_changes(
+    session: AsyncSession,
+    cursor: str | None = None,
+    limit: int = 100,
+) -> ChangePage:
+    """
+    Students and grades created after a cursor, oldest first.
+    
+    Business logic:
+    - Without a cursor the feed starts from the beginning
+    - The returned cursor covers every change on the page, so syncing is
+      "repeat with next_cursor until has_more is false", then resume later
+      with the last cursor
+    - Within a shard a student always precedes their grades
+    """
+    positions = decode_cursor(cursor)
+    changes, has_more = await dal_list_changes(session, after=positions, limit=limit)
+    
+    items = []
+    for shard_id, row in changes:
+        positions[shard_id] = row.change_seq
+        if isinstance(row, Student):
+            items.append(StudentChange.model_validate(row))
+        else:
+            items.append(GradeChange.model_validate(row))
+    
+    return ChangePage(changes=items, next_cursor=encode_cursor(positions), has_more=has_more)
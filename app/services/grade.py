@@ -1,12 +1,29 @@
 """Grade service layer."""
-from sqlalchemy.ext.asyncio import AsyncSession
+import base64
+import binascii
+import json
+import uuid
+from datetime import datetime, timezone
+from typing import Literal
+
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.broadcast import grade_feed
+from app.core.columnar import columnar_store
+from app.core.ranking import average_index
+from app.core.tenancy import current_tenant_id
+from app.core.tracing import traced
+from app.dal.counter import get_counter
 from app.dal.grade import add_grade as dal_add_grade
+from app.dal.grade import list_student_grades as dal_list_student_grades
+from app.dal.student import get_student
+from app.models.counter import DATA_VERSION
 from app.models.student import Student
-from app.schemas.grade import GradeCreate, GradeResponse
+from app.schemas.grade import GradeCreate, GradePage, GradeResponse
 
 
+@traced
 async def add_grade(
     session: AsyncSession,
     grade_data: GradeCreate,
@@ -16,6 +33,7 @@ async def add_grade(
     
     Validates student exists before adding grade.
     Raises ValueError if student not found (converted to 404 in API layer).
+    The committed grade is published to live feed subscribers.
     """
     # Validate student exists
     stmt = select(Student).where(Student.id == grade_data.student_id)
@@ -27,5 +45,84 @@ async def add_grade(
     
     # Create grade via DAL (score validation handled by Pydantic schema)
     grade = await dal_add_grade(session, grade_data)
-    return GradeResponse.model_validate(grade)
+    if average_index.version is not None or columnar_store.version is not None:
+        version = await get_counter(session, DATA_VERSION)
+        # Move the student's average within the rank index and columnar
+        # store instead of rebuilding them
+        average_index.apply_write(version, student_id=grade.student_id, score=grade.score)
+        columnar_store.apply_write(version, student_id=grade.student_id, score=grade.score)
+    
+    response = GradeResponse.model_validate(grade)
+    # Serialized once here, however many live subscribers there are
+    if grade_feed.subscribers:
+        grade_feed.publish("grade", response.model_dump_json(), tenant=current_tenant_id())
+    return response
+
+
+def encode_history_cursor(created_at: datetime, grade_id: uuid.UUID) -> str:
+    """Opaque cursor for the grade history position after (created_at, id)."""
+    data = json.dumps([created_at.isoformat(), grade_id.hex], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def decode_history_cursor(cursor: str | None) -> tuple[datetime, uuid.UUID] | None:
+    """
+    Parse a cursor from encode_history_cursor (None: first page).
+    
+    Raises ValueError for malformed cursors (converted to 400 in API layer).
+    """
+    if not cursor:
+        return None
+    try:
+        created_at, grade_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return datetime.fromisoformat(created_at), uuid.UUID(hex=grade_id)
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError, TypeError, ValueError):
+        raise ValueError("Malformed cursor") from None
 
+
+def _as_stored(value: datetime | None) -> datetime | None:
+    # created_at is stored in UTC; SQLite drops offsets instead of converting
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+@traced
+async def list_student_grades(
+    session: AsyncSession,
+    student_id: uuid.UUID,
+    after: tuple[datetime, uuid.UUID] | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    order: Literal["asc", "desc"] = "desc",
+    limit: int = 100,
+) -> GradePage:
+    """
+    One page of a student's grade history.
+    
+    Business logic:
+    - after is the decoded cursor of the previous page (None: first page)
+    - since/until with a timezone are converted to UTC; naive values are UTC
+    - The student is only looked up when the page is empty, to tell an
+      empty history from an unknown student
+    
+    Raises ValueError if student not found (converted to 404 in API layer).
+    """
+    grades, has_more = await dal_list_student_grades(
+        session,
+        student_id,
+        after=after,
+        since=_as_stored(since),
+        until=_as_stored(until),
+        order=order,
+        limit=limit,
+    )
+    if not grades and await get_student(session, student_id) is None:
+        raise ValueError(f"Student with id {student_id} not found")
+    
+    next_cursor = encode_history_cursor(grades[-1].created_at, grades[-1].id) if has_more else None
+    return GradePage(
+        grades=[GradeResponse.model_validate(grade) for grade in grades],
+        next_cursor=next_cursor,
+        has_more=has_more,
+    )
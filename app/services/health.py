@@ -0,0 +1,99 @@
+"""Health check service layer."""
+import asyncio
+
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.admission import AdmissionLimiter
+from app.core.config import settings
+from app.core.health import LoopLagMonitor, loop_lag_monitor, ping, pool_stats
+from app.core.warmup import warmup
+from app.schemas.health import AdmissionCheck, DatabaseCheck, LoopStallReport, LoopStats, PoolStats, Readiness
+
+
+async def _check_database(shard_id: str, engine: AsyncEngine) -> DatabaseCheck:
+    pool = PoolStats(**pool_stats(engine))
+    try:
+        latency = await ping(engine, settings.readiness_max_db_latency)
+    except TimeoutError:
+        return DatabaseCheck(
+            shard=shard_id,
+            latency_ms=None,
+            error=f"Ping exceeded {settings.readiness_max_db_latency}s",
+            pool=pool,
+        )
+    except DBAPIError as e:
+        return DatabaseCheck(shard=shard_id, latency_ms=None, error=str(e.orig), pool=pool)
+    return DatabaseCheck(shard=shard_id, latency_ms=latency * 1000, pool=pool)
+
+
+async def readiness(
+    engines: dict[str, AsyncEngine],
+    limiters: list[AdmissionLimiter],
+    startup_timings: dict[str, float] | None = None,
+) -> Readiness:
+    """
+    Check whether this worker should receive traffic.
+    
+    Not ready when any database fails its ping or answers slower than
+    settings.readiness_max_db_latency, a connection pool is exhausted, an
+    admission queue is full, the event loop lags more than
+    settings.readiness_max_loop_lag, or the startup warm-up is still
+    running. Databases are pinged concurrently. startup_timings (how long
+    the worker took to start) are reported as is.
+    """
+    databases = await asyncio.gather(
+        *(_check_database(shard_id, engine) for shard_id, engine in engines.items())
+    )
+    admission = [
+        AdmissionCheck(
+            name=limiter.name,
+            active=limiter.active,
+            max_concurrent=limiter.max_concurrent,
+            waiting=limiter.waiting,
+            max_queue=limiter.max_queue,
+            rejected=limiter.rejected,
+        )
+        for limiter in limiters
+    ]
+    
+    reasons = []
+    if warmup.running:
+        reasons.append("Warming up")
+    for database in databases:
+        if database.error is not None:
+            reasons.append(f"Database {database.shard}: {database.error}")
+        if database.pool.capacity is not None and database.pool.checked_out >= database.pool.capacity:
+            reasons.append(f"Database {database.shard}: connection pool exhausted")
+    for check in admission:
+        if check.waiting >= check.max_queue:
+            reasons.append(f"Admission queue {check.name} is full")
+    lag = loop_lag_monitor.lag
+    if lag > settings.readiness_max_loop_lag:
+        reasons.append(f"Event loop lag {lag * 1000:.0f}ms")
+    
+    return Readiness(
+        ready=not reasons,
+        reasons=reasons,
+        loop_lag_ms=lag * 1000,
+        databases=databases,
+        admission=admission,
+        startup_seconds=startup_timings or {},
+    )
+
+
+def loop_stats(monitor: LoopLagMonitor) -> LoopStats:
+    """Lag statistics and recent stalls of the event-loop monitor."""
+    return LoopStats(
+        interval_ms=monitor.interval * 1000,
+        lag_ms=monitor.lag * 1000,
+        max_lag_ms=monitor.max_lag * 1000,
+        samples=monitor.samples,
+        stall_threshold_ms=monitor.stall_threshold * 1000,
+        stall_count=monitor.stall_count,
+        debug=monitor.debug,
+        stalls=[
+            LoopStallReport(at=stall.at, lag_ms=stall.lag * 1000, stack=stall.stack)
+            for stall in monitor.stalls
+        ],
+    )
@@ -0,0 +1,117 @@
+"""Report service layer."""
+import csv
+import heapq
+import uuid
+from collections.abc import Iterator
+from contextlib import ExitStack
+from pathlib import Path
+
+from sqlalchemy import Row
+
+from app.core.database import shard_engines
+from app.core.ranking import AverageIndex
+from app.core.reports import read_only_connection, report_jobs
+from app.core.tenancy import Tenant
+from app.core.tracing import traced
+from app.dal.report import roster_rows
+from app.schemas.report import ReportJob, ReportKind
+
+
+def _all_roster_rows(stack: ExitStack, database_urls: list[str]) -> Iterator[Row]:
+    """Roster rows of every shard, merged into one (name, id) order."""
+    shards = [roster_rows(stack.enter_context(read_only_connection(url))) for url in database_urls]
+    return heapq.merge(*shards, key=lambda row: (row.name, row.id))
+
+
+def build_roster(path: Path, database_urls: list[str]) -> int:
+    """
+    Write the full roster CSV; runs in a report process.
+    
+    One row per student in name order: id, name, created_at, grade_count
+    and avg_grade (empty without grades), archived grades included.
+    """
+    rows = 0
+    with ExitStack() as stack, path.open("w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "name", "created_at", "grade_count", "avg_grade"])
+        for student_id, name, created_at, score_sum, score_count in _all_roster_rows(stack, database_urls):
+            writer.writerow([
+                student_id,
+                name,
+                created_at.isoformat(),
+                score_count,
+                score_sum / score_count if score_count else "",
+            ])
+            rows += 1
+    return rows
+
+
+def build_percentiles(path: Path, database_urls: list[str]) -> int:
+    """
+    Write the percentile report CSV; runs in a report process.
+    
+    One row per graded student, best average first: id, name, grade_count,
+    avg_grade and percentile_rank, as GET /students/{id}/percentile
+    computes it over all graded students.
+    """
+    with ExitStack() as stack:
+        graded = [row for row in _all_roster_rows(stack, database_urls) if row.score_count]
+    index = AverageIndex()
+    index.rebuild(((row.id, row.score_sum, row.score_count) for row in graded), version=0)
+    graded.sort(key=lambda row: -row.score_sum / row.score_count)
+    
+    with path.open("w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "name", "grade_count", "avg_grade", "percentile_rank"])
+        for row in graded:
+            avg_grade, percentile_rank = index.rank(row.id)
+            writer.writerow([row.id, row.name, row.score_count, avg_grade, percentile_rank])
+    return len(graded)
+
+
+REPORT_BUILDERS = {
+    "roster": build_roster,
+    "percentiles": build_percentiles,
+}
+
+
+def _database_urls(tenant: Tenant | None) -> list[str]:
+    engines = [tenant.engine] if tenant is not None else shard_engines.values()
+    return [engine.url.render_as_string(hide_password=False) for engine in engines]
+
+
+@traced
+async def submit_report(kind: ReportKind, tenant: Tenant | None) -> ReportJob:
+    """
+    Start a report job over the tenant's database (the shards without one).
+    
+    The report is built in a report process, so the event loop never runs
+    it. Raises ReportQueueFull when this worker has too many unfinished
+    jobs (converted to 503 in API layer).
+    """
+    record = report_jobs.submit(
+        kind,
+        REPORT_BUILDERS[kind],
+        _database_urls(tenant),
+        scope=tenant.id if tenant is not None else None,
+    )
+    return ReportJob.model_validate(record)
+
+
+@traced
+async def get_report(job_id: uuid.UUID, tenant: Tenant | None) -> ReportJob:
+    """
+    Status of a report job of the tenant.
+    
+    Raises ValueError if the job is unknown or expired (converted to 404 in
+    API layer).
+    """
+    record = report_jobs.status(job_id, scope=tenant.id if tenant is not None else None)
+    if record is None:
+        raise ValueError(f"Report job {job_id} not found")
+    return ReportJob.model_validate(record)
+
+
+def report_path(job_id: uuid.UUID, tenant: Tenant | None) -> Path:
+    """Where a finished report job's CSV is stored."""
+    return report_jobs.result_path(job_id, scope=tenant.id if tenant is not None else None)
@@ -1,21 +1,53 @@
 """Student service layer."""
+import uuid
+from collections.abc import Sequence
 from typing import Literal
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.dal.student import create_student as dal_create_student, list_students_with_avg as dal_list_students_with_avg
-from app.schemas.student import StudentCreate, StudentResponse
+from app.core.cache import count_cache, list_cache
+from app.core.columnar import ColumnarStore, columnar_store
+from app.core.config import settings
+from app.core.ranking import average_index
+from app.core.tracing import traced
+from app.core.warmup import shape_stats
+from app.dal.counter import get_counter
+from app.dal.grade import grade_totals
+from app.dal.student import count_students as dal_count_students, create_student as dal_create_student, get_student, list_student_fields as dal_list_student_fields, list_students_with_avg as dal_list_students_with_avg, student_rows
+from app.models.counter import DATA_VERSION
+from app.schemas.student import StudentCreate, StudentFields, StudentPercentile, StudentResponse
 
 
+@traced
 async def create_student(
     session: AsyncSession,
     student_data: StudentCreate,
 ) -> StudentResponse:
     """Create a new student."""
     student = await dal_create_student(session, student_data)
+    if average_index.version is not None or columnar_store.version is not None:
+        version = await get_counter(session, DATA_VERSION)
+        # New students have no grades: keep the rank index current
+        average_index.apply_write(version)
+        columnar_store.apply_write(version, student=(student.id, student.name, student.created_at))
     return StudentResponse.model_validate(student)
 
 
+@traced
+async def load_columnar_store(session: AsyncSession) -> ColumnarStore:
+    """
+    Return the columnar store, reloading it first if the data has moved.
+    
+    Loading reads every student and one grouped query over grades, so it
+    runs at startup and then only after writes by other workers.
+    """
+    version = await get_counter(session, DATA_VERSION)
+    if version != columnar_store.version:
+        columnar_store.rebuild(await student_rows(session), await grade_totals(session), version)
+    return columnar_store
+
+
+@traced
 async def list_students_with_avg(
     session: AsyncSession,
     min_avg_grade: float | None = None,
@@ -30,7 +62,24 @@ async def list_students_with_avg(
     Business logic:
     - If min_avg_grade is provided, exclude students without grades (NULL avg_grade)
     - This is handled at SQL level via HAVING clause
+    - When the list cache is enabled, results are served from it until any
+      worker writes (checked via the shared data version)
+    - With columnar serving, pages come from the in-process column arrays
+    - First pages are counted per shape for the next warm-up
     """
+    shape_stats.record(min_avg_grade=min_avg_grade, sort_by=sort_by, order=order, limit=limit, offset=offset)
+    if settings.columnar_enabled:
+        store = await load_columnar_store(session)
+        rows = store.page(min_avg_grade, sort_by, order, limit, offset)
+        return [StudentResponse(**store.row(row)) for row in rows]
+    
+    cache_key = (min_avg_grade, sort_by, order, limit, offset)
+    if settings.list_cache_enabled:
+        list_cache.validate(await get_counter(session, DATA_VERSION))
+        cached = list_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+    
     # DAL handles SQL aggregation and filtering
     results = await dal_list_students_with_avg(
         session=session,
@@ -42,7 +91,7 @@ async def list_students_with_avg(
     )
     
     # Convert to response schemas
-    return [
+    responses = [
         StudentResponse(
             id=student.id,
             name=student.name,
@@ -51,4 +100,107 @@ async def list_students_with_avg(
         )
         for student, avg_grade in results
     ]
+    
+    if settings.list_cache_enabled:
+        list_cache.put(cache_key, responses)
+    return list(responses)
+
 
+@traced
+async def list_student_fields(
+    session: AsyncSession,
+    fields: Sequence[str],
+    min_avg_grade: float | None = None,
+    sort_by: Literal["name", "avg_grade", "created_at"] = "name",
+    order: Literal["asc", "desc"] = "asc",
+    limit: int = 100,
+    offset: int = 0,
+) -> list[StudentFields]:
+    """
+    List students with only the requested fields (sparse fieldset).
+    
+    Same filtering, sorting, pagination and caching as list_students_with_avg.
+    """
+    if settings.columnar_enabled:
+        store = await load_columnar_store(session)
+        rows = [store.row(row) for row in store.page(min_avg_grade, sort_by, order, limit, offset)]
+        return [{field: row[field] for field in fields} for row in rows]
+    
+    cache_key = (tuple(fields), min_avg_grade, sort_by, order, limit, offset)
+    if settings.list_cache_enabled:
+        list_cache.validate(await get_counter(session, DATA_VERSION))
+        cached = list_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+    
+    rows = await dal_list_student_fields(
+        session=session,
+        fields=fields,
+        min_avg_grade=min_avg_grade,
+        sort_by=sort_by,
+        order=order,
+        limit=limit,
+        offset=offset,
+    )
+    
+    if settings.list_cache_enabled:
+        list_cache.put(cache_key, rows)
+    return list(rows)
+
+
+@traced
+async def count_students(
+    session: AsyncSession,
+    min_avg_grade: float | None = None,
+) -> int:
+    """
+    Count students matching the list filter, without re-running the list query.
+    
+    Unfiltered totals come from the maintained student counter. Filtered
+    totals are cached per threshold until any worker writes, or answered by
+    a binary search in the columnar store when columnar serving is enabled.
+    """
+    if settings.columnar_enabled and min_avg_grade is not None:
+        store = await load_columnar_store(session)
+        return store.count(min_avg_grade)
+    if min_avg_grade is None:
+        return await dal_count_students(session)
+    
+    count_cache.validate(await get_counter(session, DATA_VERSION))
+    total = count_cache.get(min_avg_grade)
+    if total is None:
+        total = await dal_count_students(session, min_avg_grade=min_avg_grade)
+        count_cache.put(min_avg_grade, total)
+    return total
+
+
+@traced
+async def student_percentile(
+    session: AsyncSession,
+    student_id: uuid.UUID,
+) -> StudentPercentile:
+    """
+    Percentile rank of a student's average among all graded students.
+    
+    Answered from the in-process average index with two binary searches.
+    The index is rebuilt with one grouped query over grades only when
+    another worker (or a bulk load) has written since it was last current.
+    Raises ValueError if student not found (converted to 404 in API layer).
+    """
+    version = await get_counter(session, DATA_VERSION)
+    if version != average_index.version:
+        average_index.rebuild(await grade_totals(session), version)
+    
+    ranked = average_index.rank(student_id)
+    if ranked is None:
+        if await get_student(session, student_id) is None:
+            raise ValueError(f"Student with id {student_id} not found")
+        return StudentPercentile(student_id=student_id, graded_students=len(average_index))
+    
+    avg_grade, percentile_rank = ranked
+    return StudentPercentile(
+        student_id=student_id,
+        avg_grade=avg_grade,
+        percentile_rank=percentile_rank,
+        graded_students=len(average_index),
+    )
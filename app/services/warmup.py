@@ -0,0 +1,51 @@
+"""Startup warm-up service layer."""
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.core.config import settings
+from app.core.ranking import average_index
+from app.core.tracing import traced
+from app.core.warmup import prime_page_cache, shape_stats
+from app.dal.counter import get_counter
+from app.dal.grade import grade_totals
+from app.models import Grade, GradeSummary, Student
+from app.models.counter import DATA_VERSION
+from app.services.student import count_students, list_students_with_avg, load_columnar_store
+
+
+@traced
+async def warm_up(
+    session: AsyncSession,
+    engines: Mapping[str, AsyncEngine],
+    shapes: Iterable[dict[str, Any]],
+) -> None:
+    """
+    Prepare this worker for its first requests.
+    
+    Business logic:
+    - Every shard's students, grades and grade_summaries b-trees are read
+      once, so the first queries do not wait on disk
+    - The columnar store (when enabled) and the percentile index are built
+    - Each list shape runs like a request (with its filtered count), which
+      fills the list and count caches when enabled and compiles the
+      statements either way; these runs are not counted in shape_stats
+    """
+    for engine in engines.values():
+        await prime_page_cache(engine, [Student.__table__, Grade.__table__, GradeSummary.__table__])
+    
+    if settings.columnar_enabled:
+        await load_columnar_store(session)
+    # Version first, as student_percentile does: a write committed between
+    # the reads leaves the index labelled older than its totals, so it is
+    # rebuilt instead of built upon
+    version = await get_counter(session, DATA_VERSION)
+    average_index.rebuild(await grade_totals(session), version)
+    
+    # Not counted as requests, or each start would promote its own shapes
+    with shape_stats.not_recorded():
+        for shape in shapes:
+            await list_students_with_avg(session, **shape)
+            if shape.get("min_avg_grade") is not None:
+                await count_students(session, min_avg_grade=shape["min_avg_grade"])
@@ -0,0 +1,111 @@
+"""
+Benchmark columnar serving of GET /students against the SQL path.
+
+Loads N students with --grades-per-student grades each into a temporary
+SQLite file, then times list_students_with_avg (and a filtered count) per
+list shape through the service layer with COLUMNAR_ENABLED off and on, and
+reports the store's load time and memory per student.
+    
+    python -m benchmarks.bench_columnar --students 100000
+"""
+import argparse
+import asyncio
+import itertools
+import random
+import tempfile
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.columnar import columnar_store
+from app.core.config import settings
+from app.core.database import Base
+from app.dal.counter import increment_counter
+from app.models.counter import DATA_VERSION
+from app.models.grade import Grade
+from app.models.student import Student
+from app.services.student import count_students, list_students_with_avg, load_columnar_store
+
+SHAPES = list(itertools.product([None, 70.0], ["name", "avg_grade", "created_at"], ["asc", "desc"]))
+
+
+async def load(session: AsyncSession, students: int, grades_per_student: int) -> None:
+    rng = random.Random(0)
+    start = datetime(2024, 1, 1)
+    for first in range(0, students, 10_000):
+        ids = [uuid.UUID(int=rng.getrandbits(128), version=4) for _ in range(min(10_000, students - first))]
+        await session.execute(insert(Student), [
+            {"id": sid, "name": f"Student {rng.randrange(10 ** 9)}", "created_at": start + timedelta(seconds=first + i)}
+            for i, sid in enumerate(ids)
+        ])
+        await session.execute(insert(Grade), [
+            {"id": uuid.uuid4(), "student_id": sid, "score": rng.randint(0, 100), "created_at": start}
+            for sid in ids
+            for _ in range(grades_per_student)
+        ])
+    await increment_counter(session, DATA_VERSION)
+    await session.commit()
+
+
+async def per_request_ms(session: AsyncSession, iterations: int, offset: int) -> dict[str, float]:
+    timings = {}
+    for min_avg_grade, sort_by, order in SHAPES:
+        started = time.perf_counter()
+        for _ in range(iterations):
+            await list_students_with_avg(session, min_avg_grade, sort_by, order, limit=20, offset=offset)
+        timings[f"{sort_by} {order}{' >=70' if min_avg_grade else ''}"] = (time.perf_counter() - started) / iterations * 1e3
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await count_students(session, 70.0)
+    timings["count >=70"] = (time.perf_counter() - started) / iterations * 1e3
+    return timings
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--students", type=int, default=100_000)
+    parser.add_argument("--grades-per-student", type=int, default=5)
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--offset", type=int, default=0)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{Path(directory) / 'bench.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        
+        async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+            await load(session, args.students, args.grades_per_student)
+            
+            settings.list_cache_enabled = False
+            settings.columnar_enabled = False
+            sql = await per_request_ms(session, args.iterations, args.offset)
+            
+            started = time.perf_counter()
+            store = await load_columnar_store(session)
+            load_seconds = time.perf_counter() - started
+            # Again under tracemalloc, which slows loading down
+            columnar_store.clear()
+            tracemalloc.start()
+            await load_columnar_store(session)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            settings.columnar_enabled = True
+            columnar = await per_request_ms(session, args.iterations * 100, args.offset)
+        await engine.dispose()
+    
+    print(f"{len(store)} students, loaded in {load_seconds:.2f}s")
+    print(f"store {store.nbytes / len(store):.1f} bytes/student, load peak {peak / len(store):.0f} bytes/student")
+    print(f"{'shape':<24}{'sql ms':>10}{'columnar ms':>13}{'speedup':>9}")
+    for shape, before in sql.items():
+        print(f"{shape:<24}{before:>10.2f}{columnar[shape]:>13.3f}{before / columnar[shape]:>8.0f}x")
+    columnar_store.clear()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
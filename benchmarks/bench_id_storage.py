@@ -0,0 +1,107 @@
+"""
+Benchmark id generation and storage: insert throughput and index size.
+
+Compares uuid4 vs uuid7 ids stored as SQLAlchemy's default hex text or as
+16-byte blobs (BINARY_IDS). Each configuration loads N students and
+--grades grades into a fresh SQLite file with the application's tables and
+indexes (Base.metadata, id columns switched to the configuration's type),
+then reports rows/s and the on-disk size of every table and index (dbstat).
+    
+    python -m benchmarks.bench_id_storage --grades 10000000
+"""
+import argparse
+import os
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+from sqlalchemy import MetaData, Table, Uuid, create_engine, insert, text
+
+from app.core.database import Base
+from app.core.ids import BinaryUuid, uuid7
+from app.models import Grade, Student  # noqa: F401 - Import to register models
+
+CONFIGS = [
+    ("uuid4", "text", uuid.uuid4, Uuid),
+    ("uuid4", "binary", uuid.uuid4, BinaryUuid),
+    ("uuid7", "text", uuid7, Uuid),
+    ("uuid7", "binary", uuid7, BinaryUuid),
+]
+
+
+def build_tables(id_type) -> tuple[MetaData, Table, Table]:
+    """Copy the application's tables with the given id column type."""
+    metadata = MetaData()
+    for table in Base.metadata.sorted_tables:
+        table.to_metadata(metadata)
+    for table in metadata.tables.values():
+        for column in table.columns:
+            if isinstance(column.type, (Uuid, BinaryUuid)):
+                column.type = id_type()
+    return metadata, metadata.tables["students"], metadata.tables["grades"]
+
+
+def run(path: Path, generate, id_type, n_students: int, n_grades: int, batch_size: int) -> dict:
+    """Load one configuration and return throughput and sizes."""
+    metadata, students, grades = build_tables(id_type)
+    engine = create_engine(f"sqlite:///{path}")
+    metadata.create_all(engine)
+    
+    student_ids = [generate() for _ in range(n_students)]
+    with engine.begin() as conn:
+        conn.execute(
+            insert(students),
+            [{"id": sid, "name": "s", "change_seq": i} for i, sid in enumerate(student_ids)],
+        )
+    
+    started = time.perf_counter()
+    done = 0
+    while done < n_grades:
+        size = min(batch_size, n_grades - done)
+        batch = [
+            {
+                "id": generate(),
+                "student_id": student_ids[(done + i) % n_students],
+                "score": 75,
+                "change_seq": n_students + done + i,
+            }
+            for i in range(size)
+        ]
+        with engine.begin() as conn:
+            conn.execute(insert(grades), batch)
+        done += size
+    elapsed = time.perf_counter() - started
+    
+    with engine.connect() as conn:
+        sizes = dict(conn.execute(text("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name")).all())
+    engine.dispose()
+    return {"rows_per_s": n_grades / elapsed, "file": path.stat().st_size, "sizes": sizes}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--grades", type=int, default=10_000_000)
+    parser.add_argument("--students", type=int, default=100_000)
+    parser.add_argument("--batch-size", type=int, default=50_000)
+    args = parser.parse_args()
+    
+    mb = 1024 * 1024
+    print(f"{args.grades:,} grades over {args.students:,} students")
+    print(f"{'ids':<8}{'storage':<9}{'rows/s':>10}{'file MB':>10}{'grades pk MB':>14}{'student_id ix MB':>18}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, storage, generate, id_type in CONFIGS:
+            path = Path(tmp) / f"{name}-{storage}.db"
+            result = run(path, generate, id_type, args.students, args.grades, args.batch_size)
+            sizes = result["sizes"]
+            print(
+                f"{name:<8}{storage:<9}{result['rows_per_s']:>10,.0f}"
+                f"{result['file'] / mb:>10.1f}"
+                f"{sizes.get('sqlite_autoindex_grades_1', 0) / mb:>14.1f}"
+                f"{sizes.get('ix_grades_student_id_created_at', 0) / mb:>18.1f}"
+            )
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark report generation on the event loop against the report pool.
+
+Loads N students with --grades-per-student grades each into a temporary
+SQLite file, then builds each report kind twice: inline on the event loop,
+and as a report job in the process pool. A ticker coroutine measures how
+long the loop is blocked meanwhile, which is what every other request of
+the worker would wait.
+    
+    python -m benchmarks.bench_reports --students 100000
+"""
+import argparse
+import asyncio
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.database import Base
+from app.core.reports import ReportJobs
+from app.services.report import REPORT_BUILDERS
+from benchmarks.bench_columnar import load
+
+
+async def max_loop_lag(work, interval: float = 0.005) -> tuple[float, float]:
+    """Run work() and return (its seconds, longest loop stall in seconds)."""
+    worst = 0.0
+    done = asyncio.Event()
+    
+    async def ticker() -> None:
+        nonlocal worst
+        while not done.is_set():
+            before = time.perf_counter()
+            await asyncio.sleep(interval)
+            worst = max(worst, time.perf_counter() - before - interval)
+    
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    await work()
+    elapsed = time.perf_counter() - started
+    done.set()
+    await task
+    return elapsed, worst
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--students", type=int, default=100_000)
+    parser.add_argument("--grades-per-student", type=int, default=5)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite+aiosqlite:///{Path(directory) / 'bench.db'}"
+        engine = create_async_engine(url)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+            await load(session, args.students, args.grades_per_student)
+        await engine.dispose()
+        
+        jobs = ReportJobs(str(Path(directory) / "reports"), max_workers=1, max_pending=16, retention=3600)
+        # Start the pool process outside the timings
+        warm = jobs.submit("roster", REPORT_BUILDERS["roster"], [url])
+        while jobs.status(uuid.UUID(warm["id"]))["status"] == "running":
+            await asyncio.sleep(0.05)
+        
+        print(f"{args.students} students, {args.grades_per_student} grades each")
+        print(f"{'report':<14}{'mode':<8}{'seconds':>9}{'max loop stall ms':>20}")
+        for kind, build in REPORT_BUILDERS.items():
+            async def inline() -> None:
+                build(Path(directory) / f"{kind}-inline.csv", [url])
+            
+            async def pooled() -> None:
+                job_id = uuid.UUID(jobs.submit(kind, build, [url])["id"])
+                while jobs.status(job_id)["status"] == "running":
+                    await asyncio.sleep(0.01)
+            
+            for mode, work in [("inline", inline), ("pool", pooled)]:
+                elapsed, stall = await max_loop_lag(work)
+                print(f"{kind:<14}{mode:<8}{elapsed:>9.2f}{stall * 1e3:>20.1f}")
+        jobs.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,133 @@
+"""
+Benchmark per-request CPU of list_students_with_avg statement handling.
+
+Compares building the select() for every call (the previous approach)
+with the prebuilt statement variants in app.dal.student, on an in-memory
+database small enough that statement overhead dominates:
+
+- build: constructing the statement only
+- compile: build + cache key + compiled cache lookup (what execute pays
+  before touching the database)
+- execute: the full list_students_with_avg round trip
+    
+    python -m benchmarks.bench_statement_cache --iterations 20000
+"""
+import argparse
+import asyncio
+import itertools
+import time
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.database import Base
+from app.dal import student as dal
+from app.models.grade import Grade
+from app.models.student import Student
+
+SHAPES = list(itertools.product(["name", "avg_grade", "created_at"], ["asc", "desc"], [None, 70.0]))
+
+
+def build_per_call(sort_by, order, min_avg_grade, limit, offset):
+    """The statement as list_students_with_avg built it on every call before."""
+    stmt = (
+        select(Student, func.avg(Grade.score).label("avg_grade"))
+        .outerjoin(Grade, Student.id == Grade.student_id)
+        .group_by(Student.id)
+    )
+    if min_avg_grade is not None:
+        stmt = stmt.having(func.avg(Grade.score) >= min_avg_grade)
+    sort_column = {
+        "name": Student.name,
+        "avg_grade": func.avg(Grade.score),
+        "created_at": Student.created_at,
+    }[sort_by]
+    stmt = stmt.order_by(sort_column.desc() if order == "desc" else sort_column.asc())
+    return stmt.limit(limit).offset(offset)
+
+
+def build_cached(sort_by, order, min_avg_grade, limit, offset):
+    """The prebuilt variant; values are bound at execute time."""
+    # Unsharded, without archived grades, like the per-call statement
+    return dal._students_with_avg_statement(
+        sort_by,
+        order,
+        filtered=min_avg_grade is not None,
+        archived=False,
+        sort_key=False,
+    )
+
+
+def per_call_us(fn, iterations: int) -> float:
+    started = time.perf_counter()
+    for i in range(iterations):
+        fn(*SHAPES[i % len(SHAPES)], 20, i % 5)
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def compiled(build, dialect):
+    """build + cache key + lookup in a compiled cache, as Connection.execute does."""
+    cache = {}
+    
+    def fn(*args):
+        stmt = build(*args)
+        key = stmt._generate_cache_key().key
+        if key not in cache:
+            cache[key] = stmt.compile(dialect=dialect)
+        return cache[key]
+    
+    return fn
+
+
+async def list_per_call(session: AsyncSession, min_avg_grade, sort_by, order, limit, offset):
+    """list_students_with_avg executing a freshly built statement."""
+    result = await session.execute(build_per_call(sort_by, order, min_avg_grade, limit, offset))
+    return result.all()
+
+
+async def execute_us(session: AsyncSession, run, iterations: int) -> float:
+    started = time.perf_counter()
+    for i in range(iterations):
+        sort_by, order, min_avg_grade = SHAPES[i % len(SHAPES)]
+        await run(session, min_avg_grade, sort_by, order, 20, i % 5)
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--iterations", type=int, default=20_000)
+    args = parser.parse_args()
+    
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    dialect = engine.sync_engine.dialect
+    
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        session.add_all(Student(name=f"Student {i}") for i in range(20))
+        await session.commit()
+        
+        print(f"{'step':<10}{'per call us':>14}{'prebuilt us':>14}{'saved':>9}")
+        rows = [
+            ("build", per_call_us(build_per_call, args.iterations), per_call_us(build_cached, args.iterations)),
+            (
+                "compile",
+                per_call_us(compiled(build_per_call, dialect), args.iterations),
+                per_call_us(compiled(build_cached, dialect), args.iterations),
+            ),
+        ]
+        # Warm both paths' compiled caches first
+        await execute_us(session, list_per_call, len(SHAPES))
+        await execute_us(session, dal.list_students_with_avg, len(SHAPES))
+        rows.append((
+            "execute",
+            await execute_us(session, list_per_call, args.iterations // 10),
+            await execute_us(session, dal.list_students_with_avg, args.iterations // 10),
+        ))
+        for step, before, after in rows:
+            print(f"{step:<10}{before:>14.1f}{after:>14.1f}{1 - after / before:>9.0%}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
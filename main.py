@@ -1,21 +1,68 @@
 """Main application entry point."""
-from contextlib import asynccontextmanager
-from fastapi import FastAPI
+import time
 
-from app.api import grades_router, students_router
-from app.core.config import settings
-from app.core.database import init_db
-from app.models import Grade, Student  # noqa: F401 - Import to register models
+# Taken before the heavy imports below so startup timings include them
+_import_started = time.perf_counter()
+
+import logging  # noqa: E402
+from contextlib import asynccontextmanager  # noqa: E402
+from pathlib import Path  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+
+from app.api import changes_router, feed_router, grades_router, health_router, reports_router, students_router  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.database import AsyncSessionLocal, init_db, shard_engines  # noqa: E402
+from app.core.health import loop_lag_monitor  # noqa: E402
+from app.core.reports import report_jobs  # noqa: E402
+from app.core.tenancy import tenant_registry  # noqa: E402
+from app.core.tracing import JsonLinesExporter, TracingMiddleware  # noqa: E402
+from app.core.warmup import parse_shape, shape_stats, warmup  # noqa: E402
+from app.models import Grade, Student  # noqa: E402, F401 - Import to register models
+from app.services.warmup import warm_up  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+
+def _warmup_shapes() -> list[dict]:
+    """Configured list shapes, then the most requested ones saved at the last shutdown."""
+    queries = list(settings.warmup_shapes)
+    if settings.warmup_stats_file:
+        shape_stats.load(Path(settings.warmup_stats_file))
+        queries += shape_stats.most_common(settings.warmup_learned_shapes)
+    return [parse_shape(query) for query in dict.fromkeys(queries)]
+
+
+async def _warm_up() -> None:
+    async with AsyncSessionLocal() as session:
+        await warm_up(session, shard_engines, _warmup_shapes())
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events."""
-    # Startup: initialize database
+    # Startup: check the schema version (migrates only if auto_migrate is set)
+    init_started = time.perf_counter()
     await init_db()
+    ready = time.perf_counter()
+    
+    app.state.startup_timings = {
+        "imports_seconds": _imports_finished - _import_started,
+        "init_db_seconds": ready - init_started,
+        "total_seconds": ready - _import_started,
+    }
+    logger.info("Startup completed in %.3fs %s", ready - _import_started, app.state.startup_timings)
+    loop_lag_monitor.start()
+    if settings.warmup_timeout > 0 and not settings.tenant_database_url:
+        # In the background: liveness answers meanwhile, readiness waits for it
+        warmup.start(_warm_up, settings.warmup_timeout)
     yield
-    # Shutdown: cleanup if needed
-    pass
+    # Shutdown
+    await warmup.stop()
+    await loop_lag_monitor.stop()
+    report_jobs.shutdown()
+    await tenant_registry.close()
+    if settings.warmup_stats_file:
+        shape_stats.save(Path(settings.warmup_stats_file), settings.warmup_learned_shapes)
 
 
 app = FastAPI(
@@ -24,9 +71,38 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# The compression codecs and the profiler are only imported when enabled
+if settings.compression_enabled:
+    from app.core.compression import CompressionMiddleware
+    
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.compression_minimum_size,
+        gzip_level=settings.compression_gzip_level,
+        brotli_quality=settings.compression_brotli_quality,
+        zstd_level=settings.compression_zstd_level,
+    )
+
+if settings.tracing_enabled:
+    app.add_middleware(
+        TracingMiddleware,
+        exporter=JsonLinesExporter(settings.tracing_file),
+        sample_rate=settings.tracing_sample_rate,
+    )
+
+# Outermost, so profiles include compression (and tracing)
+if settings.profiling_enabled:
+    from app.core.profiling import ProfilingMiddleware
+    
+    app.add_middleware(ProfilingMiddleware, directory=settings.profiling_dir)
+
 # Register routers
 app.include_router(students_router)
 app.include_router(grades_router)
+app.include_router(feed_router)
+app.include_router(changes_router)
+app.include_router(reports_router)
+app.include_router(health_router)
 
 
 @app.get("/")
@@ -34,3 +110,5 @@ async def root():
     """Root endpoint."""
     return {"message": "Students Grades API"}
 
+
+_imports_finished = time.perf_counter()
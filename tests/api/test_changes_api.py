@@ -0,0 +1,68 @@
+"""API tests for the change feed."""
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.core.database import get_db
+from main import app
+
+
+@pytest.fixture
+async def client(db_session):
+    """Create test client with database dependency override."""
+    async def override_get_db():
+        yield db_session
+    
+    app.dependency_overrides[get_db] = override_get_db
+    
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        yield ac
+    
+    app.dependency_overrides.clear()
+
+
+async def _sync(client: AsyncClient, cursor: str | None, limit: int) -> tuple[list[dict], str]:
+    """Follow next_cursor until has_more is false."""
+    changes = []
+    while True:
+        params = {"limit": limit} if cursor is None else {"limit": limit, "cursor": cursor}
+        response = await client.get("/changes", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        changes += page["changes"]
+        cursor = page["next_cursor"]
+        if not page["has_more"]:
+            return changes, cursor
+
+
+@pytest.mark.asyncio
+async def test_change_feed_pages_and_resumes(client: AsyncClient):
+    """Test GET /changes - keyset pages in commit order, then only new changes."""
+    alice = (await client.post("/students", json={"name": "Alice"})).json()
+    bob = (await client.post("/students", json={"name": "Bob"})).json()
+    grade = (await client.post(f"/students/{alice['id']}/grades", json={"score": 90})).json()
+    
+    changes, cursor = await _sync(client, None, limit=2)
+    assert [(c["type"], c["id"]) for c in changes] == [
+        ("student", alice["id"]),
+        ("student", bob["id"]),
+        ("grade", grade["id"]),
+    ]
+    assert changes[2]["student_id"] == alice["id"]
+    assert changes[2]["score"] == 90
+    assert [c["seq"] for c in changes] == sorted(c["seq"] for c in changes)
+    
+    # Nothing new: empty page, same position
+    changes, same_cursor = await _sync(client, cursor, limit=2)
+    assert changes == []
+    assert same_cursor == cursor
+    
+    carol = (await client.post("/students", json={"name": "Carol"})).json()
+    changes, _ = await _sync(client, cursor, limit=2)
+    assert [c["id"] for c in changes] == [carol["id"]]
+
+
+@pytest.mark.asyncio
+async def test_change_feed_rejects_malformed_cursor(client: AsyncClient):
+    """Test GET /changes - 400 for a cursor it did not issue."""
+    response = await client.get("/changes", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
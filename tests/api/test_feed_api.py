@@ -0,0 +1,100 @@
+"""API tests for the live grade feed."""
+import asyncio
+import json
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.testclient import TestClient
+
+from app.core.broadcast import grade_feed
+from app.core.database import get_db
+from app.dal.student import create_student
+from app.schemas.student import StudentCreate
+from main import app
+
+
+@pytest.fixture
+async def client(db_session):
+    """Create test client with database dependency override."""
+    async def override_get_db():
+        yield db_session
+    
+    app.dependency_overrides[get_db] = override_get_db
+    
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        yield ac
+    
+    app.dependency_overrides.clear()
+
+
+async def _publish_when_subscribed(data: str) -> None:
+    while not grade_feed.subscribers:
+        await asyncio.sleep(0.001)
+    grade_feed.publish("grade", data)
+
+
+@pytest.mark.asyncio
+async def test_add_grade_publishes_to_feed(client: AsyncClient, db_session):
+    """Test that a committed grade reaches subscribers as its response JSON."""
+    student = await create_student(db_session, StudentCreate(name="Alice"))
+    
+    with grade_feed.subscribe() as subscription:
+        response = await client.post(f"/students/{student.id}/grades", json={"score": 85})
+        event = await asyncio.wait_for(subscription.get(), 1)
+    
+    assert event.name == "grade"
+    assert json.loads(event.data) == response.json()
+
+
+@pytest.mark.asyncio
+async def test_sse_endpoint_streams_events():
+    """Test GET /feed/grades - event-stream headers and one framed event."""
+    messages = []
+    disconnected = asyncio.Event()
+    request_sent = False
+    
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+    
+    async def send(message):
+        messages.append(message)
+        if message.get("body"):
+            disconnected.set()
+    
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/feed/grades",
+        "raw_path": b"/feed/grades",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"test")],
+        "client": ("test", 1),
+        "server": ("test", 80),
+    }
+    await asyncio.gather(
+        asyncio.wait_for(app(scope, receive, send), 5),
+        _publish_when_subscribed('{"score": 90}'),
+    )
+    
+    start = messages[0]
+    assert start["status"] == 200
+    assert (b"content-type", b"text/event-stream; charset=utf-8") in start["headers"]
+    body = b"".join(m.get("body", b"") for m in messages[1:])
+    assert body == b'event: grade\ndata: {"score": 90}\n\n'
+    assert grade_feed.subscribers == 0
+
+
+def test_websocket_endpoint_pushes_events():
+    """Test WebSocket /feed/grades/ws - one JSON message per event."""
+    with TestClient(app).websocket_connect("/feed/grades/ws") as websocket:
+        websocket.portal.call(_publish_when_subscribed, '{"score": 90}')
+        assert websocket.receive_json() == {"event": "grade", "data": {"score": 90}}
@@ -1,9 +1,11 @@
 """API tests for grade endpoints."""
 import uuid
+from datetime import datetime
 
 import pytest
 from httpx import ASGITransport, AsyncClient
 
+from app.core.admission import write_limiter
 from app.core.database import get_db
 from app.dal.student import create_student
 from app.schemas.student import StudentCreate
@@ -163,3 +165,117 @@ async def test_create_grade_invalid_uuid_format(client: AsyncClient):
     data = response.json()
     assert "detail" in data
 
+
+@pytest.mark.asyncio
+async def test_create_grade_overloaded_returns_503(client: AsyncClient, db_session, monkeypatch):
+    """Test POST /students/{id}/grades - fast 503 with Retry-After when writes are saturated."""
+    student = await create_student(db_session, StudentCreate(name="Alice"))
+    monkeypatch.setattr(write_limiter, "max_concurrent", 1)
+    monkeypatch.setattr(write_limiter, "max_queue", 0)
+    
+    await write_limiter.acquire()  # Occupy the only write slot
+    try:
+        response = await client.post(
+            f"/students/{student.id}/grades",
+            json={"score": 85},
+        )
+    finally:
+        write_limiter.release()
+    
+    assert response.status_code == 503
+    assert "Retry-After" in response.headers
+    
+    # Admitted again once the slot is free
+    response = await client.post(
+        f"/students/{student.id}/grades",
+        json={"score": 85},
+    )
+    assert response.status_code == 201
+
+
+async def _add_grades(db_session, student_id, created_ats):
+    from app.models.grade import Grade
+    
+    grades = [
+        Grade(id=uuid.uuid4(), student_id=student_id, score=50 + i, created_at=created_at)
+        for i, created_at in enumerate(created_ats)
+    ]
+    db_session.add_all(grades)
+    await db_session.commit()
+    return grades
+
+
+@pytest.mark.asyncio
+async def test_list_grades_pages_through_history(client: AsyncClient, db_session):
+    """Test GET /students/{id}/grades - cursor pages cover every grade once, ties on created_at included."""
+    student = await create_student(db_session, StudentCreate(name="Alice"))
+    other = await create_student(db_session, StudentCreate(name="Bob"))
+    tied = datetime(2024, 1, 2)
+    grades = await _add_grades(
+        db_session,
+        student.id,
+        [datetime(2024, 1, 1), tied, tied, tied, datetime(2024, 1, 3)],
+    )
+    await _add_grades(db_session, other.id, [tied])
+    expected = [str(g.id) for g in sorted(grades, key=lambda g: (g.created_at, g.id), reverse=True)]
+    
+    seen, cursor, pages = [], None, 0
+    while True:
+        params = {"limit": 2} | ({"cursor": cursor} if cursor else {})
+        response = await client.get(f"/students/{student.id}/grades", params=params)
+        assert response.status_code == 200
+        data = response.json()
+        seen += [grade["id"] for grade in data["grades"]]
+        pages += 1
+        if not data["has_more"]:
+            assert data["next_cursor"] is None
+            break
+        cursor = data["next_cursor"]
+    
+    assert seen == expected
+    assert pages == 3
+    
+    response = await client.get(f"/students/{student.id}/grades", params={"order": "asc", "limit": 10})
+    assert [grade["id"] for grade in response.json()["grades"]] == expected[::-1]
+
+
+@pytest.mark.asyncio
+async def test_list_grades_date_range(client: AsyncClient, db_session):
+    """Test GET /students/{id}/grades - since is inclusive, until exclusive, offsets converted to UTC."""
+    student = await create_student(db_session, StudentCreate(name="Alice"))
+    await _add_grades(
+        db_session,
+        student.id,
+        [datetime(2024, 1, 1), datetime(2024, 1, 2), datetime(2024, 1, 3)],
+    )
+    
+    response = await client.get(
+        f"/students/{student.id}/grades",
+        params={"since": "2024-01-02T02:00:00+02:00", "until": "2024-01-03T00:00:00"},
+    )
+    
+    assert response.status_code == 200
+    assert [grade["created_at"][:10] for grade in response.json()["grades"]] == ["2024-01-02"]
+
+
+@pytest.mark.asyncio
+async def test_list_grades_empty_and_not_found(client: AsyncClient, db_session):
+    """Test GET /students/{id}/grades - empty page for a student without grades, 404 for an unknown one."""
+    student = await create_student(db_session, StudentCreate(name="Alice"))
+    
+    response = await client.get(f"/students/{student.id}/grades")
+    assert response.status_code == 200
+    assert response.json() == {"grades": [], "next_cursor": None, "has_more": False}
+    
+    response = await client.get(f"/students/{uuid.uuid4()}/grades")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_list_grades_malformed_cursor(client: AsyncClient, db_session):
+    """Test GET /students/{id}/grades - 400 for a cursor that does not decode."""
+    student = await create_student(db_session, StudentCreate(name="Alice"))
+    
+    response = await client.get(f"/students/{student.id}/grades", params={"cursor": "not-a-cursor"})
+    
+    assert response.status_code == 400
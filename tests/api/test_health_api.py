@@ -0,0 +1,141 @@
+"""API tests for the health endpoints."""
+import asyncio
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.admission import read_limiter
+from app.core.config import settings
+from app.core.health import LoopLagMonitor, loop_lag_monitor
+from app.core.warmup import warmup
+from main import app
+
+
+@pytest.fixture
+async def client(test_engine, monkeypatch):
+    """Client whose readiness probe checks the test database."""
+    monkeypatch.setattr("app.api.health.shard_engines", {"0": test_engine})
+    
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        yield ac
+
+
+@pytest.mark.asyncio
+async def test_liveness(client: AsyncClient):
+    """Test GET /health/live."""
+    response = await client.get("/health/live")
+    
+    assert response.status_code == 200
+    assert response.json() == {"status": "alive"}
+
+
+@pytest.mark.asyncio
+async def test_readiness_ok(client: AsyncClient):
+    """Test GET /health/ready on a healthy worker."""
+    response = await client.get("/health/ready")
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["ready"] is True
+    assert data["reasons"] == []
+    assert data["databases"][0]["shard"] == "0"
+    assert data["databases"][0]["latency_ms"] >= 0
+    assert {check["name"] for check in data["admission"]} == {"read", "write"}
+
+
+@pytest.mark.asyncio
+async def test_readiness_reports_startup_timings(client: AsyncClient, monkeypatch):
+    """Test that the lifespan's startup timings are part of the readiness report."""
+    timings = {"imports_seconds": 0.5, "init_db_seconds": 0.1, "total_seconds": 0.6}
+    monkeypatch.setattr(app.state, "startup_timings", timings, raising=False)
+    
+    response = await client.get("/health/ready")
+    
+    assert response.json()["startup_seconds"] == timings
+
+
+@pytest.mark.asyncio
+async def test_readiness_fails_on_loop_lag(client: AsyncClient, monkeypatch):
+    """Test that a lagging event loop makes the worker not ready."""
+    monkeypatch.setattr(loop_lag_monitor, "lag", settings.readiness_max_loop_lag + 1)
+    
+    response = await client.get("/health/ready")
+    
+    assert response.status_code == 503
+    assert response.json()["ready"] is False
+    assert response.json()["reasons"][0].startswith("Event loop lag")
+
+
+@pytest.mark.asyncio
+async def test_loop_metrics(client: AsyncClient, monkeypatch):
+    """Test GET /health/loop - lag metrics and recent stalls with their stacks."""
+    monitor = LoopLagMonitor(interval=0.5, stall_threshold=0.1, history=5)
+    monitor._record(0.02)
+    monitor._record(0.3)
+    monitor.stalls[-1].stack = ['  File "app/services/student.py", line 1, in list_students_with_avg\n']
+    monkeypatch.setattr("app.api.health.loop_lag_monitor", monitor)
+    
+    response = await client.get("/health/loop")
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["lag_ms"] == pytest.approx(300)
+    assert data["max_lag_ms"] == pytest.approx(300)
+    assert (data["samples"], data["stall_count"], data["stall_threshold_ms"]) == (2, 1, 100)
+    assert len(data["stalls"]) == 1
+    assert data["stalls"][0]["lag_ms"] == pytest.approx(300)
+    assert "list_students_with_avg" in data["stalls"][0]["stack"][0]
+
+
+@pytest.mark.asyncio
+async def test_readiness_waits_for_warm_up(client: AsyncClient):
+    """Test that the worker is not ready while warming up, and ready once it ends."""
+    release = asyncio.Event()
+    warmup.start(release.wait, timeout=5)
+    try:
+        response = await client.get("/health/ready")
+        assert response.status_code == 503
+        assert response.json()["reasons"] == ["Warming up"]
+        
+        release.set()
+        await warmup.wait()
+        assert (await client.get("/health/ready")).status_code == 200
+    finally:
+        await warmup.stop()
+
+
+@pytest.mark.asyncio
+async def test_readiness_fails_on_full_admission_queue(client: AsyncClient, monkeypatch):
+    """Test that a full admission queue makes the worker not ready."""
+    monkeypatch.setattr(read_limiter, "max_queue", 0)
+    
+    response = await client.get("/health/ready")
+    
+    assert response.status_code == 503
+    assert response.json()["reasons"] == ["Admission queue read is full"]
+
+
+@pytest.mark.asyncio
+async def test_readiness_fails_on_exhausted_pool(tmp_path, monkeypatch):
+    """Test that an exhausted connection pool makes the worker not ready."""
+    monkeypatch.setattr(settings, "database_max_overflow", 0)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}", pool_size=1, max_overflow=0)
+    monkeypatch.setattr("app.api.health.shard_engines", {"0": engine})
+    monkeypatch.setattr(settings, "readiness_max_db_latency", 0.05)
+    
+    try:
+        async with engine.connect() as conn:
+            await conn.exec_driver_sql("SELECT 1")
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+                response = await client.get("/health/ready")
+    finally:
+        await engine.dispose()
+    
+    assert response.status_code == 503
+    data = response.json()
+    assert data["databases"][0]["pool"] == {"size": 1, "checked_out": 1, "overflow": 0, "capacity": 1}
+    assert data["reasons"] == [
+        "Database 0: Ping exceeded 0.05s",
+        "Database 0: connection pool exhausted",
+    ]
@@ -0,0 +1,95 @@
+"""API tests for report job endpoints."""
+import asyncio
+import csv
+import io
+import uuid
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.database import Base
+from app.core.reports import report_jobs
+from app.dal.grade import add_grade
+from app.dal.student import create_student
+from app.schemas.grade import GradeCreate
+from app.schemas.student import StudentCreate
+from app.services import report as report_service
+from main import app
+
+
+@pytest.fixture
+async def client(tmp_path, monkeypatch):
+    """Test client whose reports read a file database with two students."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'app.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        alice = await create_student(session, StudentCreate(name="Alice"))
+        await create_student(session, StudentCreate(name="Bob"))
+        await add_grade(session, GradeCreate(student_id=alice.id, score=75))
+    
+    monkeypatch.setattr(report_service, "shard_engines", {"0": engine})
+    monkeypatch.setattr(report_jobs, "directory", tmp_path / "reports")
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        yield ac
+    report_jobs.shutdown()
+    await engine.dispose()
+
+
+async def _wait_done(client: AsyncClient, job_id: str) -> dict:
+    for _ in range(600):
+        job = (await client.get(f"/reports/{job_id}")).json()
+        if job["status"] != "running":
+            return job
+        await asyncio.sleep(0.05)
+    raise AssertionError(f"Report job {job_id} still running")
+
+
+@pytest.mark.asyncio
+async def test_report_submit_status_download(client: AsyncClient):
+    """Test POST /reports - the job is built in the pool and its CSV downloaded."""
+    response = await client.post("/reports", json={"kind": "roster"})
+    
+    assert response.status_code == 202
+    job = response.json()
+    assert job["kind"] == "roster"
+    assert job["status"] == "running"
+    
+    job = await _wait_done(client, job["id"])
+    assert job["status"] == "done"
+    assert job["rows"] == 2
+    
+    response = await client.get(f"/reports/{job['id']}/download")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert f'filename="roster-{job["id"]}.csv"' in response.headers["content-disposition"]
+    assert int(response.headers["content-length"]) == job["size"]
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [(row["name"], row["avg_grade"]) for row in rows] == [("Alice", "75.0"), ("Bob", "")]
+
+
+@pytest.mark.asyncio
+async def test_report_download_before_done(client: AsyncClient, monkeypatch):
+    """Test GET /reports/{id}/download - 409 while the job is running."""
+    monkeypatch.setattr(report_jobs, "max_pending", 1)
+    job = (await client.post("/reports", json={"kind": "percentiles"})).json()
+    
+    response = await client.get(f"/reports/{job['id']}/download")
+    assert response.status_code == 409
+    
+    # One unfinished job is the limit
+    response = await client.post("/reports", json={"kind": "roster"})
+    assert response.status_code == 503
+    assert "Retry-After" in response.headers
+    
+    assert (await _wait_done(client, job["id"]))["rows"] == 1
+
+
+@pytest.mark.asyncio
+async def test_report_not_found(client: AsyncClient):
+    """Test GET /reports/{id} - unknown jobs are 404, unknown kinds 422."""
+    job_id = uuid.uuid4()
+    assert (await client.get(f"/reports/{job_id}")).status_code == 404
+    assert (await client.get(f"/reports/{job_id}/download")).status_code == 404
+    assert (await client.post("/reports", json={"kind": "everything"})).status_code == 422
@@ -282,3 +282,111 @@ async def test_list_students_validation_error_invalid_order(client: AsyncClient)
     
     assert response.status_code == 422
 
+
+@pytest.mark.asyncio
+async def test_list_students_total_count_header(client: AsyncClient, db_session):
+    """Test GET /students - X-Total-Count is opt-in and ignores pagination."""
+    students = [
+        await create_student(db_session, StudentCreate(name=f"Student{i}"))
+        for i in range(3)
+    ]
+    await add_grade(db_session, GradeCreate(student_id=students[0].id, score=90))
+    await add_grade(db_session, GradeCreate(student_id=students[1].id, score=60))
+    
+    response = await client.get("/students?limit=1")
+    assert "X-Total-Count" not in response.headers
+    
+    response = await client.get("/students?limit=1&include_total=true")
+    assert response.status_code == 200
+    assert len(response.json()) == 1
+    assert response.headers["X-Total-Count"] == "3"
+    
+    response = await client.get("/students?min_avg_grade=50&include_total=true")
+    assert response.headers["X-Total-Count"] == "2"
+    
+    # A new grade invalidates the cached filtered count
+    await add_grade(db_session, GradeCreate(student_id=students[2].id, score=70))
+    response = await client.get("/students?min_avg_grade=50&include_total=true")
+    assert response.headers["X-Total-Count"] == "3"
+
+
+@pytest.mark.asyncio
+async def test_list_students_sparse_fields(client: AsyncClient, db_session):
+    """Test GET /students - fields= returns only the requested keys."""
+    alice = await create_student(db_session, StudentCreate(name="Alice"))
+    bob = await create_student(db_session, StudentCreate(name="Bob"))
+    await add_grade(db_session, GradeCreate(student_id=alice.id, score=80))
+    
+    response = await client.get("/students?fields=id,avg_grade")
+    
+    assert response.status_code == 200
+    assert response.json() == [
+        {"id": str(alice.id), "avg_grade": 80.0},
+        {"id": str(bob.id), "avg_grade": None},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_list_students_sparse_fields_without_avg_grade(client: AsyncClient, db_session):
+    """Test GET /students - fields without avg_grade still honour filter and sorting."""
+    alice = await create_student(db_session, StudentCreate(name="Alice"))
+    bob = await create_student(db_session, StudentCreate(name="Bob"))
+    await add_grade(db_session, GradeCreate(student_id=alice.id, score=60))
+    await add_grade(db_session, GradeCreate(student_id=bob.id, score=90))
+    
+    response = await client.get("/students?fields=name&sort_by=avg_grade&order=desc")
+    assert response.json() == [{"name": "Bob"}, {"name": "Alice"}]
+    
+    response = await client.get("/students?fields=name,created_at&min_avg_grade=70&include_total=true")
+    data = response.json()
+    assert [row["name"] for row in data] == ["Bob"]
+    assert set(data[0]) == {"name", "created_at"}
+    assert response.headers["X-Total-Count"] == "1"
+
+
+@pytest.mark.asyncio
+async def test_list_students_validation_error_invalid_fields(client: AsyncClient):
+    """Test GET /students - validation error (unknown field)."""
+    response = await client.get("/students?fields=id,password")
+    
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_student_percentile(client: AsyncClient, db_session):
+    """Test GET /students/{id}/percentile ranks against graded students only."""
+    ids = {}
+    for name in ("Alice", "Bob", "Charlie", "Diana"):
+        response = await client.post("/students", json={"name": name})
+        ids[name] = response.json()["id"]
+    for name, score in (("Alice", 90), ("Bob", 70), ("Charlie", 70)):
+        await client.post(f"/students/{ids[name]}/grades", json={"score": score})
+    
+    response = await client.get(f"/students/{ids['Alice']}/percentile")
+    assert response.status_code == 200
+    assert response.json() == {
+        "student_id": ids["Alice"],
+        "avg_grade": 90.0,
+        "percentile_rank": pytest.approx(100 * 2.5 / 3),
+        "graded_students": 3,
+    }
+    
+    # Ties count half; the index is updated in place by the next grade
+    data = (await client.get(f"/students/{ids['Bob']}/percentile")).json()
+    assert data["percentile_rank"] == pytest.approx(100 / 3)
+    await client.post(f"/students/{ids['Bob']}/grades", json={"score": 100})
+    data = (await client.get(f"/students/{ids['Bob']}/percentile")).json()
+    assert data["avg_grade"] == 85.0
+    assert data["percentile_rank"] == pytest.approx(100 * 1.5 / 3)
+    
+    # Students without grades are not ranked
+    data = (await client.get(f"/students/{ids['Diana']}/percentile")).json()
+    assert data["avg_grade"] is None
+    assert data["percentile_rank"] is None
+
+
+@pytest.mark.asyncio
+async def test_student_percentile_not_found(client: AsyncClient):
+    """Test GET /students/{id}/percentile - 404 when student not found."""
+    response = await client.get(f"/students/{uuid.uuid4()}/percentile")
+    assert response.status_code == 404
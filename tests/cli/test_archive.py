@@ -0,0 +1,130 @@
+"""Tests for grade archival."""
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.cli.__main__ import build_parser
+from app.cli.archive import archive_grades
+from app.cli.seed import SeedSpec, seed_database
+from app.core.config import settings
+from app.dal.counter import get_counter
+from app.dal.grade import add_grade, grade_totals
+from app.dal.student import count_students, list_student_fields, list_students_with_avg
+from app.models.counter import ARCHIVED_GRADES, SUMMARIES_ENABLED
+from app.models.grade import Grade
+from app.models.grade_summary import GradeSummary
+from app.schemas.grade import GradeCreate
+
+
+async def averages(sessions) -> dict:
+    """Everything derived from averages, keyed by what computed it."""
+    async with sessions() as session:
+        by_avg = await list_students_with_avg(session, sort_by="avg_grade", order="desc", limit=1000)
+        fields = await list_student_fields(session, ["id", "avg_grade"], min_avg_grade=70, limit=1000)
+        return {
+            "list": sorted((student.id, avg) for student, avg in by_avg),
+            "fields": fields,
+            "count": await count_students(session, min_avg_grade=70),
+            "totals": sorted(await grade_totals(session)),
+        }
+
+
+@pytest.fixture
+async def seeded(tmp_path: Path, monkeypatch):
+    """Engine and session factory on a seeded database with 30 days of grades."""
+    monkeypatch.setattr(settings, "archive_check_interval", 0.05)
+    path = tmp_path / "grades.db"
+    await seed_database(path, SeedSpec(students=80, grades_per_student=6, days=30, seed=3))
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    yield engine, async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_archive_preserves_averages(seeded, tmp_path: Path):
+    """Test that archiving moves old grades into summaries without changing any average."""
+    engine, sessions = seeded
+    cutoff = datetime.now(timezone.utc) - timedelta(days=15)
+    async with engine.connect() as conn:
+        old = (await conn.execute(select(func.count()).where(Grade.created_at < cutoff))).scalar_one()
+        total = (await conn.execute(select(func.count()).select_from(Grade))).scalar_one()
+    before = await averages(sessions)
+    
+    archive_engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'archive.db'}")
+    progress = []
+    try:
+        result = await archive_grades(
+            engine, cutoff, archive_engine=archive_engine, batch_size=50, pause=0, progress=progress.append
+        )
+        async with archive_engine.connect() as conn:
+            copied = (await conn.execute(select(func.count()).select_from(Grade))).scalar_one()
+    finally:
+        await archive_engine.dispose()
+    
+    assert 0 < old < total
+    assert result.grades == copied == old
+    assert result.batches == len(progress) == -(-old // 50)
+    assert await averages(sessions) == before
+    async with engine.connect() as conn:
+        remaining = (await conn.execute(select(func.count()).select_from(Grade))).scalar_one()
+        summarized = (await conn.execute(select(func.sum(GradeSummary.score_count)))).scalar_one()
+        archived_counter = await get_counter(conn, ARCHIVED_GRADES)
+    assert remaining == total - old
+    assert summarized == archived_counter == old
+    
+    # Nothing left to archive
+    assert (await archive_grades(engine, cutoff, pause=0)).grades == 0
+
+
+@pytest.mark.asyncio
+async def test_summary_combines_with_new_grades(seeded):
+    """Test that a student with archived grades averages them with later grades."""
+    engine, sessions = seeded
+    await archive_grades(engine, datetime.now(timezone.utc), batch_size=100, pause=0)
+    
+    async with sessions() as session:
+        summary = (await session.execute(select(GradeSummary).limit(1))).scalar_one()
+        assert summary.score_min <= summary.score_sum / summary.score_count <= summary.score_max
+        await add_grade(session, GradeCreate(student_id=summary.student_id, score=100))
+        
+        rows = await list_student_fields(session, ["id", "avg_grade"], limit=1000)
+    
+    avg = {row["id"]: row["avg_grade"] for row in rows}[summary.student_id]
+    assert avg == (summary.score_sum + 100) / (summary.score_count + 1)
+
+
+@pytest.mark.asyncio
+async def test_archived_flag_is_not_read_per_request(seeded, monkeypatch):
+    """Test that lists only read the archival counters once per check interval, and never once set."""
+    engine, sessions = seeded
+    monkeypatch.setattr(settings, "archive_check_interval", 60)
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    
+    async with sessions() as session:
+        for _ in range(3):
+            await list_students_with_avg(session, limit=5)
+    assert sum("counters" in statement for statement in statements) == 1
+    
+    # Switched over by the first archival, before any grade moves
+    await archive_grades(engine, datetime.now(timezone.utc), switch_wait=0, pause=0)
+    async with engine.connect() as conn:
+        assert await get_counter(conn, SUMMARIES_ENABLED) == 1
+    monkeypatch.setattr(settings, "archive_check_interval", 0)
+    statements.clear()
+    async with sessions() as session:
+        for _ in range(3):
+            await list_students_with_avg(session, limit=5)
+    assert sum("counters" in statement for statement in statements) == 1
+    assert "grade_summaries" in statements[-1]
+
+
+def test_before_is_converted_to_utc():
+    """Test that --before offsets are converted to the naive UTC stored in created_at."""
+    parser = build_parser()
+    
+    assert parser.parse_args(["archive", "--before", "2024-09-01T02:00+02:00"]).before == datetime(2024, 9, 1)
+    assert parser.parse_args(["archive", "--before", "2024-09-01"]).before == datetime(2024, 9, 1)
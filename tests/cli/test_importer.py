@@ -0,0 +1,163 @@
+"""Tests for the streaming bulk importer."""
+import json
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from sqlalchemy import func, inspect, select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.cli.importer import (
+    RecordError,
+    batched,
+    checkpoint_path,
+    import_file,
+    write_checkpoint,
+)
+from app.core.database import Base
+from app.dal.counter import get_counter
+from app.models.counter import DATA_VERSION, STUDENT_COUNT
+from app.models.grade import Grade
+from app.models.student import Student
+
+
+@pytest.fixture
+async def engine(tmp_path: Path):
+    """Create a file-backed database with all tables."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'import.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+def write_students_csv(path: Path, ids: list[uuid.UUID]) -> Path:
+    """Write a students CSV with one row per id."""
+    lines = ["id,name"] + [f"{student_id},Student{i}" for i, student_id in enumerate(ids)]
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+async def count_rows(engine, model) -> int:
+    """Count rows in a table."""
+    async with engine.connect() as conn:
+        return (await conn.execute(select(func.count()).select_from(model))).scalar_one()
+
+
+def test_batched_bounds_batch_size():
+    """Test that batched yields lists of at most the requested size."""
+    batches = list(batched(({"n": i} for i in range(7)), 3))
+    assert [len(batch) for batch in batches] == [3, 3, 1]
+
+
+@pytest.mark.asyncio
+async def test_import_students_and_grades(engine, tmp_path: Path):
+    """Test importing a students CSV followed by a grades JSONL file."""
+    ids = [uuid.uuid4() for _ in range(5)]
+    students_file = write_students_csv(tmp_path / "students.csv", ids)
+    grades_file = tmp_path / "grades.jsonl"
+    grades_file.write_text(
+        "\n".join(
+            json.dumps({"student_id": str(student_id), "score": score})
+            for student_id in ids
+            for score in (80, 90)
+        )
+    )
+    
+    progress = []
+    assert await import_file(engine, students_file, "students", batch_size=2, progress=progress.append) == 5
+    assert await import_file(engine, grades_file, "grades", batch_size=4) == 10
+    
+    assert [p.rows for p in progress] == [2, 4, 5]
+    assert await count_rows(engine, Student) == 5
+    assert await count_rows(engine, Grade) == 10
+    assert not checkpoint_path(students_file).exists()
+    
+    async with engine.connect() as conn:
+        avg = (await conn.execute(select(func.avg(Grade.score)))).scalar_one()
+        assert avg == 85.0
+        # One data version (change feed position) per imported row
+        assert await get_counter(conn, DATA_VERSION) == 15
+        seqs = (await conn.execute(select(Grade.change_seq).order_by(Grade.change_seq))).scalars().all()
+        assert seqs == list(range(6, 16))
+        assert await get_counter(conn, STUDENT_COUNT) == 5
+
+
+@pytest.mark.asyncio
+async def test_import_resumes_from_checkpoint(engine, tmp_path: Path):
+    """Test that an interrupted import skips already committed records."""
+    ids = [uuid.uuid4() for _ in range(5)]
+    students_file = write_students_csv(tmp_path / "students.csv", ids)
+    
+    # Simulate a previous run that committed the first 3 records
+    write_checkpoint(students_file, 3)
+    
+    assert await import_file(engine, students_file, "students") == 2
+    async with engine.connect() as conn:
+        imported = set((await conn.execute(select(Student.id))).scalars())
+    assert imported == set(ids[3:])
+
+
+@pytest.mark.asyncio
+async def test_import_converts_timestamp_offsets_to_utc(engine, tmp_path: Path):
+    """Test that created_at values with an offset are stored as the same instant in UTC."""
+    students_file = tmp_path / "students.jsonl"
+    students_file.write_text(
+        json.dumps({"name": "Alice", "created_at": "2024-09-01T02:30:00+02:00"}) + "\n"
+        + json.dumps({"name": "Bob", "created_at": "2024-09-01T01:00:00"}) + "\n"
+    )
+    
+    await import_file(engine, students_file, "students")
+    
+    async with engine.connect() as conn:
+        rows = (await conn.execute(select(Student.name, Student.created_at).order_by(Student.created_at))).all()
+    assert [(name, created_at.replace(tzinfo=None)) for name, created_at in rows] == [
+        ("Alice", datetime(2024, 9, 1, 0, 30)),
+        ("Bob", datetime(2024, 9, 1, 1, 0)),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_import_invalid_record_keeps_checkpoint(engine, tmp_path: Path):
+    """Test that a bad record stops the load after the last committed batch."""
+    students_file = tmp_path / "students.csv"
+    students_file.write_text("name\nAlice\nBob\n\n" + "x" * 101 + "\n")
+    
+    with pytest.raises(RecordError, match="record 3"):
+        await import_file(engine, students_file, "students", batch_size=2)
+    
+    assert await count_rows(engine, Student) == 2
+    assert json.loads(checkpoint_path(students_file).read_text()) == {"rows": 2}
+
+
+@pytest.mark.asyncio
+async def test_import_rebuild_indexes(engine, tmp_path: Path):
+    """Test that indexes are dropped during the load and recreated afterwards."""
+    students_file = write_students_csv(tmp_path / "students.csv", [uuid.uuid4()])
+    
+    await import_file(engine, students_file, "students", rebuild_indexes=True)
+    
+    async with engine.connect() as conn:
+        indexes = await conn.run_sync(lambda c: inspect(c).get_indexes("students"))
+    assert {index["name"] for index in indexes} == {index.name for index in Student.__table__.indexes}
+
+
+@pytest.mark.asyncio
+async def test_import_rebuild_indexes_after_failed_load(engine, tmp_path: Path):
+    """Test that indexes, the unique change_seq one included, are recreated when a record fails."""
+    student_id = uuid.uuid4()
+    await import_file(engine, write_students_csv(tmp_path / "students.csv", [student_id]), "students")
+    grades_file = tmp_path / "grades.csv"
+    grades_file.write_text(f"student_id,score\n{student_id},90\n{student_id},900\n")
+    
+    with pytest.raises(RecordError, match="record 2"):
+        await import_file(engine, grades_file, "grades", batch_size=1, rebuild_indexes=True)
+    
+    async with engine.connect() as conn:
+        indexes = await conn.run_sync(lambda c: inspect(c).get_indexes("grades"))
+    assert {index["name"] for index in indexes} == {index.name for index in Grade.__table__.indexes}
+    assert {"name": "ix_grades_change_seq", "unique": 1} in [
+        {"name": index["name"], "unique": index["unique"]} for index in indexes
+    ]
+    assert await count_rows(engine, Grade) == 1
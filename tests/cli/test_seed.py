@@ -0,0 +1,70 @@
+"""Tests for the synthetic dataset generator."""
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.cli.seed import SeedSpec, generate, seed_database
+from app.core.migrations import LATEST_VERSION, get_schema_version
+from app.dal.counter import get_counter
+from app.models.counter import DATA_VERSION, STUDENT_COUNT
+from app.models.grade import Grade
+from app.models.student import Student
+
+NOW = datetime(2024, 6, 1, tzinfo=timezone.utc)
+
+
+def test_generate_is_reproducible():
+    """Test that the same seed yields the same rows."""
+    spec = SeedSpec(students=50, seed=7)
+    assert list(generate(spec, NOW)) == list(generate(spec, NOW))
+    assert list(generate(spec, NOW)) != list(generate(SeedSpec(students=50, seed=8), NOW))
+
+
+def test_generate_follows_distributions():
+    """Test grade counts, score range and created_at ordering."""
+    spec = SeedSpec(students=2000, grades_per_student=6, score_mean=80, days=30)
+    rows = list(generate(spec, NOW))
+    grades = [grade for _, student_grades in rows for grade in student_grades]
+    
+    assert 5 <= len(grades) / len(rows) <= 7
+    assert all(0 <= grade["score"] <= 100 for grade in grades)
+    assert 76 <= sum(grade["score"] for grade in grades) / len(grades) <= 84
+    for student, student_grades in rows:
+        assert (NOW - student["created_at"]).days <= 30
+        assert all(student["created_at"] <= grade["created_at"] <= NOW for grade in student_grades)
+    
+    fixed = list(generate(SeedSpec(students=10, grades_per_student=3, grade_distribution="fixed"), NOW))
+    assert all(len(student_grades) == 3 for _, student_grades in fixed)
+
+
+@pytest.mark.asyncio
+async def test_seed_database_writes_usable_fixture(tmp_path: Path):
+    """Test that the generated file is migrated, counted and indexed like a live database."""
+    path = tmp_path / "fixture.db"
+    progress = []
+    result = await seed_database(path, SeedSpec(students=120, seed=1), batch_size=50, progress=progress.append)
+    
+    assert [p.students for p in progress] == [50, 100, 120]
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    try:
+        assert await get_schema_version(engine) == LATEST_VERSION
+        async with engine.connect() as conn:
+            students = (await conn.execute(select(func.count()).select_from(Student))).scalar_one()
+            grades = (await conn.execute(select(func.count()).select_from(Grade))).scalar_one()
+            max_seq = (await conn.execute(select(func.max(Grade.change_seq)))).scalar_one()
+            assert students == result.students == 120
+            assert grades == result.grades
+            assert await get_counter(conn, STUDENT_COUNT) == 120
+            assert await get_counter(conn, DATA_VERSION) == max_seq == students + grades
+            indexes = (await conn.exec_driver_sql("SELECT name FROM sqlite_master WHERE type = 'index'")).scalars().all()
+            assert {"ix_grades_student_id_created_at", "ix_grades_change_seq", "ix_students_change_seq"} <= set(indexes)
+            journal_mode = (await conn.exec_driver_sql("PRAGMA journal_mode")).scalar_one()
+            assert journal_mode == "delete"
+    finally:
+        await engine.dispose()
+    
+    with pytest.raises(FileExistsError):
+        await seed_database(path, SeedSpec(students=1))
@@ -44,9 +44,13 @@ async def test_engine():
 @pytest.fixture
 async def db_session(test_engine):
     """Create a database session for testing."""
+    from app.dal.counter import increment_counter
+    from app.models.counter import DATA_VERSION, STUDENT_COUNT, Counter
     from app.models.grade import Grade
     from app.models.student import Student
-    from sqlalchemy import delete
+    from sqlalchemy import delete, update
+    
+    reset_student_count = update(Counter).where(Counter.name == STUDENT_COUNT).values(value=0)
     
     async_session_maker = async_sessionmaker(
         test_engine,
@@ -56,8 +60,11 @@ async def db_session(test_engine):
     
     async with async_session_maker() as session:
         # Clean up all data before each test (grades first due to FK constraint)
+        # Bulk deletes bypass the DAL, so maintain the counters ourselves
         await session.execute(delete(Grade))
         await session.execute(delete(Student))
+        await session.execute(reset_student_count)
+        await increment_counter(session, DATA_VERSION)
         await session.commit()
         
         yield session
@@ -65,9 +72,27 @@ async def db_session(test_engine):
         # Clean up after test (grades first due to FK constraint)
         await session.execute(delete(Grade))
         await session.execute(delete(Student))
+        await session.execute(reset_student_count)
+        await increment_counter(session, DATA_VERSION)
         await session.commit()
 
 
+@pytest.fixture(autouse=True)
+def reset_average_index():
+    """Start every test without a process-wide rank index, columnar store or archived flag."""
+    from app.core.cache import archived_flag
+    from app.core.columnar import columnar_store
+    from app.core.ranking import average_index
+    
+    average_index.clear()
+    columnar_store.clear()
+    archived_flag.clear()
+    yield
+    average_index.clear()
+    columnar_store.clear()
+    archived_flag.clear()
+
+
 @pytest.fixture
 async def db(db_session):
     """Override get_db dependency for testing."""
@@ -0,0 +1,92 @@
+"""Tests for admission control."""
+import asyncio
+
+import pytest
+
+from app.core.admission import AdmissionLimiter, AdmissionRejected
+
+
+@pytest.mark.asyncio
+async def test_limiter_admits_up_to_max_concurrent():
+    """Test that free slots are taken without waiting."""
+    limiter = AdmissionLimiter("test", max_concurrent=2, max_queue=0, wait_timeout=1.0)
+    
+    await limiter.acquire()
+    await limiter.acquire()
+    assert limiter.active == 2
+    
+    limiter.release()
+    limiter.release()
+    assert limiter.active == 0
+
+
+@pytest.mark.asyncio
+async def test_limiter_rejects_when_queue_full():
+    """Test that requests beyond the queue bound are rejected immediately."""
+    limiter = AdmissionLimiter("test", max_concurrent=1, max_queue=0, wait_timeout=1.0)
+    await limiter.acquire()
+    
+    with pytest.raises(AdmissionRejected, match="Too many"):
+        await limiter.acquire()
+    assert limiter.rejected == 1
+
+
+@pytest.mark.asyncio
+async def test_limiter_rejects_after_wait_timeout():
+    """Test that queued requests give up at the deadline and leave the queue."""
+    limiter = AdmissionLimiter("test", max_concurrent=1, max_queue=1, wait_timeout=0.01)
+    await limiter.acquire()
+    
+    with pytest.raises(AdmissionRejected, match="Timed out"):
+        await limiter.acquire()
+    assert limiter.waiting == 0
+    
+    # The holder's release frees the slot instead of handing it to the dead waiter
+    limiter.release()
+    assert limiter.active == 0
+
+
+@pytest.mark.asyncio
+async def test_limiter_hands_slots_to_waiters_in_order():
+    """Test that released slots go to queued requests in FIFO order."""
+    limiter = AdmissionLimiter("test", max_concurrent=1, max_queue=2, wait_timeout=1.0)
+    await limiter.acquire()
+    admitted = []
+    
+    async def request(name):
+        await limiter.acquire()
+        admitted.append(name)
+    
+    first = asyncio.create_task(request("first"))
+    second = asyncio.create_task(request("second"))
+    await asyncio.sleep(0)
+    assert limiter.waiting == 2
+    
+    limiter.release()
+    await first
+    assert admitted == ["first"]
+    assert limiter.active == 1
+    
+    limiter.release()
+    await second
+    assert admitted == ["first", "second"]
+    
+    limiter.release()
+    assert limiter.active == 0
+
+
+@pytest.mark.asyncio
+async def test_limiter_cancelled_waiter_does_not_leak_slot():
+    """Test that cancelling a queued request keeps the slot count consistent."""
+    limiter = AdmissionLimiter("test", max_concurrent=1, max_queue=1, wait_timeout=1.0)
+    await limiter.acquire()
+    
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    
+    limiter.release()
+    assert limiter.active == 0
+    assert limiter.waiting == 0
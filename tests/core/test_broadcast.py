@@ -0,0 +1,69 @@
+"""Tests for the in-process broadcaster."""
+import asyncio
+
+import pytest
+
+from app.api.feed import KEEPALIVE, sse_events
+from app.core.broadcast import Broadcaster
+
+
+@pytest.mark.asyncio
+async def test_publish_shares_one_event_between_subscribers():
+    """Test that every subscriber receives the same serialized event object."""
+    broadcaster = Broadcaster(max_queue=4)
+    with broadcaster.subscribe() as first, broadcaster.subscribe() as second:
+        assert broadcaster.subscribers == 2
+        event = broadcaster.publish("grade", '{"score": 90}')
+        
+        assert await first.get() is event
+        assert await second.get() is event
+        assert event.sse == b'event: grade\ndata: {"score": 90}\n\n'
+        assert event.sse is event.sse
+    assert broadcaster.subscribers == 0
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_drops_oldest():
+    """Test that a full queue evicts the oldest events and counts them."""
+    broadcaster = Broadcaster(max_queue=3)
+    with broadcaster.subscribe() as subscription:
+        for i in range(5):
+            broadcaster.publish("grade", str(i))
+        
+        assert [(await subscription.get()).data for _ in range(3)] == ["2", "3", "4"]
+        assert subscription.take_dropped() == 2
+        assert subscription.take_dropped() == 0
+
+
+@pytest.mark.asyncio
+async def test_get_waits_for_publish_and_ends_on_close():
+    """Test that get() blocks until an event arrives and returns None after close."""
+    broadcaster = Broadcaster(max_queue=3)
+    with broadcaster.subscribe() as subscription:
+        waiter = asyncio.create_task(subscription.get())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        
+        broadcaster.publish("grade", "1")
+        assert (await waiter).data == "1"
+        
+        subscription.close()
+        assert await subscription.get() is None
+
+
+@pytest.mark.asyncio
+async def test_sse_stream_reports_drops_and_keeps_alive():
+    """Test SSE framing: dropped notice before the next event, keep-alive when idle."""
+    broadcaster = Broadcaster(max_queue=1)
+    with broadcaster.subscribe() as subscription:
+        stream = sse_events(subscription, heartbeat=0.01)
+        broadcaster.publish("grade", "1")
+        broadcaster.publish("grade", "2")
+        
+        assert await anext(stream) == b'event: dropped\ndata: {"count": 1}\n\n'
+        assert await anext(stream) == b"event: grade\ndata: 2\n\n"
+        assert await anext(stream) == KEEPALIVE
+        
+        subscription.close()
+        with pytest.raises(StopAsyncIteration):
+            await anext(stream)
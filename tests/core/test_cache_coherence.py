@@ -0,0 +1,152 @@
+"""Tests for cross-process list cache coherence."""
+import asyncio
+import multiprocessing
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.cache import VersionedCache, list_cache
+from app.core.config import settings
+from app.core.database import Base
+from app.dal.student import create_student
+from app.schemas.grade import GradeCreate
+from app.schemas.student import StudentCreate
+from app.services.grade import add_grade
+from app.services.student import list_students_with_avg
+
+WORKER_COUNT = 3
+
+
+def test_versioned_cache_drops_entries_when_version_changes():
+    """Test that validate() clears entries stored under an older version."""
+    cache = VersionedCache(max_entries=10)
+    cache.validate(1)
+    cache.put("key", ["value"])
+    
+    cache.validate(1)
+    assert cache.get("key") == ["value"]
+    
+    cache.validate(2)
+    assert cache.get("key") is None
+
+
+def test_versioned_cache_evicts_least_recently_used():
+    """Test that the cache is bounded by max_entries."""
+    cache = VersionedCache(max_entries=2)
+    cache.validate(1)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")  # "b" is now least recently used
+    cache.put("c", 3)
+    
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+@pytest.fixture
+def enable_list_cache(monkeypatch):
+    """Enable the list cache and start each test with it empty."""
+    monkeypatch.setattr(settings, "list_cache_enabled", True)
+    list_cache.clear()
+    yield
+    list_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_list_cache_serves_repeated_queries(db_session, enable_list_cache):
+    """Test that identical list queries are served from the cache."""
+    await create_student(db_session, StudentCreate(name="Alice"))
+    
+    first = await list_students_with_avg(db_session)
+    assert len(list_cache) == 1
+    
+    second = await list_students_with_avg(db_session)
+    assert second == first
+
+
+@pytest.mark.asyncio
+async def test_list_cache_invalidated_by_local_write(db_session, enable_list_cache):
+    """Test that a write through the DAL invalidates cached lists."""
+    student = await create_student(db_session, StudentCreate(name="Alice"))
+    
+    before = await list_students_with_avg(db_session)
+    assert before[0].avg_grade is None
+    
+    await add_grade(db_session, GradeCreate(student_id=student.id, score=80))
+    
+    after = await list_students_with_avg(db_session)
+    assert after[0].avg_grade == 80.0
+
+
+def _run_worker(database_url, student_ids, index, barrier, results):
+    """Entry point of a worker process."""
+    asyncio.run(_worker_main(database_url, student_ids, index, barrier, results))
+
+
+async def _worker_main(database_url, student_ids, index, barrier, results):
+    """Prime the local cache, write once, then list again after all workers wrote."""
+    settings.list_cache_enabled = True
+    engine = create_async_engine(database_url)
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    
+    # Prime this worker's cache while no grades exist
+    async with session_maker() as session:
+        before = await list_students_with_avg(session)
+        cached = await list_students_with_avg(session)
+    served_from_cache = len(list_cache) == 1 and cached == before
+    
+    barrier.wait()
+    async with session_maker() as session:
+        await add_grade(session, GradeCreate(student_id=student_ids[index], score=50 + index))
+    barrier.wait()
+    
+    # Every worker must now see the writes of all the others
+    async with session_maker() as session:
+        after = await list_students_with_avg(session)
+    await engine.dispose()
+    
+    results.put((
+        index,
+        served_from_cache,
+        {str(s.id): s.avg_grade for s in before},
+        {str(s.id): s.avg_grade for s in after},
+    ))
+
+
+@pytest.mark.asyncio
+async def test_cache_coherence_across_worker_processes(tmp_path):
+    """Test that writes in one process invalidate list caches in the others."""
+    database_url = f"sqlite+aiosqlite:///{tmp_path / 'shared.db'}"
+    engine = create_async_engine(database_url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_maker() as session:
+        students = [
+            await create_student(session, StudentCreate(name=f"Student{i}"))
+            for i in range(WORKER_COUNT)
+        ]
+    await engine.dispose()
+    student_ids = [student.id for student in students]
+    
+    ctx = multiprocessing.get_context("spawn")
+    barrier = ctx.Barrier(WORKER_COUNT)
+    results = ctx.Queue()
+    workers = [
+        ctx.Process(target=_run_worker, args=(database_url, student_ids, i, barrier, results))
+        for i in range(WORKER_COUNT)
+    ]
+    for worker in workers:
+        worker.start()
+    outcomes = [results.get(timeout=60) for _ in workers]
+    for worker in workers:
+        worker.join(timeout=10)
+        assert worker.exitcode == 0
+    
+    expected = {str(student_ids[i]): float(50 + i) for i in range(WORKER_COUNT)}
+    for index, served_from_cache, before, after in outcomes:
+        assert served_from_cache, f"worker {index} did not cache its first list"
+        assert all(avg is None for avg in before.values())
+        assert after == expected, f"worker {index} served a stale list"
@@ -0,0 +1,102 @@
+"""Tests for the in-process columnar student store."""
+import itertools
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.columnar import ColumnarStore, columnar_store
+from app.core.config import settings
+from app.dal.student import create_student as dal_create_student
+from app.schemas.grade import GradeCreate
+from app.schemas.student import StudentCreate
+from app.services.grade import add_grade
+from app.services.student import count_students, create_student, list_student_fields, list_students_with_avg
+
+
+def _store(students, totals, version=1):
+    store = ColumnarStore()
+    store.rebuild(students, totals, version)
+    return store
+
+
+def test_page_matches_brute_force():
+    """Test every list shape against sorting the rows in Python, NULL averages first ascending."""
+    start = datetime(2024, 1, 1)
+    students = [(uuid.uuid4(), f"Student {i:02d}", start + timedelta(hours=(7 * i) % 20)) for i in range(20)]
+    totals = [(sid, 50 + 3 * i, 1 + i % 3) for i, (sid, _, _) in enumerate(students) if i % 4]
+    store = _store(students, totals)
+    
+    rows = [store.row(i) for i in range(len(store))]
+    for min_avg_grade, sort_by, order in itertools.product(
+        [None, 30.0], ["name", "avg_grade", "created_at"], ["asc", "desc"]
+    ):
+        matching = [
+            r for r in rows
+            if min_avg_grade is None or r["avg_grade"] is not None and r["avg_grade"] >= min_avg_grade
+        ]
+        
+        def key(r):
+            value = r[sort_by]
+            return (value is not None, value if value is not None else 0)
+        
+        expected = sorted(matching, key=key, reverse=order == "desc")
+        for offset, limit in [(0, 5), (3, 4), (18, 10)]:
+            page = [store.row(i) for i in store.page(min_avg_grade, sort_by, order, limit, offset)]
+            assert [key(r) for r in page] == [key(r) for r in expected[offset:offset + limit]]
+        assert store.count(min_avg_grade) == len(matching)
+
+
+def test_apply_write_updates_columns_and_orders():
+    """Test that new students and grades are placed in every order, and gaps leave the store stale."""
+    alice, bob = uuid.uuid4(), uuid.uuid4()
+    store = _store([(alice, "Alice", datetime(2024, 1, 1))], [(alice, 80, 1)], version=5)
+    
+    store.apply_write(6, student=(bob, "Bob", datetime(2024, 1, 2)))
+    store.apply_write(7, student_id=bob, score=90)
+    assert store.version == 7
+    assert [store.row(i)["name"] for i in store.page(None, "avg_grade", "desc", 10, 0)] == ["Bob", "Alice"]
+    assert store.count(85.0) == 1
+    
+    # A write by someone else happened in between: not applied
+    store.apply_write(9, student_id=alice, score=100)
+    assert store.version == 7
+    assert store.row(store.page(None, "name", "asc", 1, 0)[0])["avg_grade"] == 80.0
+
+
+@pytest.mark.asyncio
+async def test_columnar_serving_matches_sql(db_session, monkeypatch):
+    """Test that lists, sparse fields and counts are identical with and without columnar serving."""
+    students = [await create_student(db_session, StudentCreate(name=f"Student {i}")) for i in range(8)]
+    for i, student in enumerate(students[:7]):
+        for score in range(40 + 5 * i, 100, 25):
+            await add_grade(db_session, GradeCreate(student_id=student.id, score=score))
+    
+    shapes = list(itertools.product([None, 60.0], ["name", "avg_grade"], ["asc", "desc"]))
+    
+    async def snapshot():
+        return (
+            [await list_students_with_avg(db_session, m, s, o, limit=5, offset=1) for m, s, o in shapes],
+            [await list_student_fields(db_session, ["name", "avg_grade"], m, s, o) for m, s, o in shapes],
+            [await count_students(db_session, m) for m in (None, 60.0, 75.0)],
+        )
+    
+    expected = await snapshot()
+    monkeypatch.setattr(settings, "columnar_enabled", True)
+    assert await snapshot() == expected
+    assert columnar_store.version is not None
+    
+    # Writes through this worker keep the store current without a reload
+    version = columnar_store.version
+    await add_grade(db_session, GradeCreate(student_id=students[7].id, score=100))
+    await create_student(db_session, StudentCreate(name="Student 9"))
+    assert columnar_store.version == version + 2
+    after = await snapshot()
+    monkeypatch.setattr(settings, "columnar_enabled", False)
+    assert await snapshot() == after
+    
+    # A write that bypasses the service makes it reload
+    await dal_create_student(db_session, StudentCreate(name="Student 10"))
+    monkeypatch.setattr(settings, "columnar_enabled", True)
+    assert await count_students(db_session, 0.0) == 8
+    assert len(columnar_store) == 10
@@ -0,0 +1,162 @@
+"""Tests for negotiated response compression."""
+import gzip
+import zlib
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import FileResponse, PlainTextResponse, StreamingResponse
+from httpx import ASGITransport, AsyncClient
+from starlette.datastructures import Headers
+
+from app.core.compression import CompressionMiddleware, GzipEncoder, negotiate
+
+LARGE_BODY = "student," * 1000
+
+
+def build_app(**options) -> FastAPI:
+    """Create a small app serving small, large and streamed bodies."""
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, **options)
+    
+    @app.get("/small")
+    async def small():
+        return PlainTextResponse("ok")
+    
+    @app.get("/large")
+    async def large():
+        return PlainTextResponse(LARGE_BODY)
+    
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for i in range(3):
+                yield f"chunk{i}\n" * 100
+        return StreamingResponse(chunks(), media_type="text/plain")
+    
+    @app.get("/file")
+    async def file():
+        return FileResponse(__file__, media_type="text/plain")
+    
+    return app
+
+
+async def get_raw(client: AsyncClient, path: str, encoding: str):
+    """GET a path and return the response with its undecoded body."""
+    async with client.stream("GET", path, headers={"Accept-Encoding": encoding}) as response:
+        raw = b"".join([chunk async for chunk in response.aiter_raw()])
+    return response, raw
+
+
+@pytest.fixture
+async def client():
+    """Client that does not decode responses, so raw encodings can be checked."""
+    async with AsyncClient(transport=ASGITransport(app=build_app(minimum_size=500)), base_url="http://test") as ac:
+        yield ac
+
+
+def test_negotiate_prefers_client_weights_then_server_order():
+    """Test Accept-Encoding negotiation."""
+    supported = ["zstd", "br", "gzip"]
+    assert negotiate("gzip, br", supported) == "br"
+    assert negotiate("gzip;q=1.0, br;q=0.5", supported) == "gzip"
+    assert negotiate("*", supported) == "zstd"
+    assert negotiate("gzip;q=0, identity", supported) is None
+    assert negotiate("", supported) is None
+
+
+def test_gzip_encoder_flushes_decodable_chunks():
+    """Test that each flushed chunk can be decoded as soon as it arrives."""
+    encoder = GzipEncoder(level=6)
+    decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    
+    first = encoder.compress(b"hello ") + encoder.flush()
+    assert decoder.decompress(first) == b"hello "
+    
+    last = encoder.compress(b"world") + encoder.finish()
+    assert decoder.decompress(last) == b"world"
+
+
+@pytest.mark.asyncio
+async def test_large_response_is_gzipped(client: AsyncClient):
+    """Test that bodies above the threshold are compressed."""
+    response, raw = await get_raw(client, "/large", "gzip")
+    
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert int(response.headers["content-length"]) == len(raw) < len(LARGE_BODY)
+    assert gzip.decompress(raw).decode() == LARGE_BODY
+
+
+@pytest.mark.asyncio
+async def test_small_response_is_not_compressed(client: AsyncClient):
+    """Test that bodies below the threshold are sent as is."""
+    response = await client.get("/small", headers={"Accept-Encoding": "gzip"})
+    
+    assert "content-encoding" not in response.headers
+    assert response.text == "ok"
+
+
+@pytest.mark.asyncio
+async def test_identity_when_client_does_not_accept(client: AsyncClient):
+    """Test that nothing is compressed without a matching Accept-Encoding."""
+    response = await client.get("/large", headers={"Accept-Encoding": "identity"})
+    
+    assert "content-encoding" not in response.headers
+    assert response.text == LARGE_BODY
+
+
+@pytest.mark.asyncio
+async def test_streaming_response_is_compressed_incrementally(client: AsyncClient):
+    """Test that streamed bodies are compressed per chunk without Content-Length."""
+    response, raw = await get_raw(client, "/stream", "gzip")
+    
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    
+    expected = "".join(f"chunk{i}\n" * 100 for i in range(3))
+    assert gzip.decompress(raw).decode() == expected
+
+
+@pytest.mark.asyncio
+async def test_file_response_is_not_compressed(client: AsyncClient):
+    """Test that files are sent as is, whatever their size."""
+    response, raw = await get_raw(client, "/file", "gzip")
+    
+    assert "content-encoding" not in response.headers
+    with open(__file__, "rb") as f:
+        assert raw == f.read()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("media_type, encoding", [("text/event-stream", None), ("text/plain", "gzip")])
+async def test_streaming_headers_are_sent_before_the_first_chunk(media_type, encoding):
+    """Test that streamed responses start at once; event streams are never compressed."""
+    sent = []
+    
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", media_type.encode())]})
+        assert [message["type"] for message in sent] == ["http.response.start"]
+        await send({"type": "http.response.body", "body": LARGE_BODY.encode()})
+    
+    async def send(message):
+        sent.append(message)
+    
+    await CompressionMiddleware(app, minimum_size=500)({"type": "http", "headers": [(b"accept-encoding", b"gzip")]}, None, send)
+    
+    assert Headers(raw=sent[0]["headers"]).get("content-encoding") == encoding
+    body = sent[1]["body"]
+    assert (gzip.decompress(body) if encoding else body) == LARGE_BODY.encode()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("encoding, module", [("br", "brotli"), ("zstd", "zstandard")])
+async def test_optional_encodings(client: AsyncClient, encoding, module):
+    """Test br and zstd when their packages are installed."""
+    codec = pytest.importorskip(module)
+    response, raw = await get_raw(client, "/large", encoding)
+    
+    assert response.headers["content-encoding"] == encoding
+    if encoding == "br":
+        assert codec.decompress(raw).decode() == LARGE_BODY
+    else:
+        assert codec.ZstdDecompressor().decompressobj().decompress(raw).decode() == LARGE_BODY
@@ -0,0 +1,74 @@
+"""Tests for the health probes."""
+import asyncio
+import threading
+import time
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.config import settings
+from app.core.health import LoopLagMonitor, ping, pool_stats
+
+
+@pytest.mark.asyncio
+async def test_loop_lag_monitor_measures_blocking():
+    """Test that blocking the loop shows up as lag."""
+    monitor = LoopLagMonitor(interval=0.05, stall_threshold=0.1)
+    monitor.start()
+    try:
+        await asyncio.sleep(0.01)
+        time.sleep(0.2)  # blocks the loop
+        await asyncio.sleep(0.01)
+        assert monitor.lag >= 0.1
+        assert monitor.max_lag >= 0.1
+        assert monitor.stall_count == 1
+        assert monitor.stalls[0].stack is None  # Stacks only in debug mode
+    finally:
+        await monitor.stop()
+
+
+def _blocking_call() -> None:
+    time.sleep(0.2)
+
+
+@pytest.mark.asyncio
+async def test_loop_lag_monitor_captures_blocking_stack():
+    """Test that in debug mode the watchdog captures the stack of the blocking call."""
+    monitor = LoopLagMonitor(interval=0.02, stall_threshold=0.05, history=2, debug=True)
+    monitor.start()
+    try:
+        await asyncio.sleep(0.05)
+        _blocking_call()
+        await asyncio.sleep(0.05)
+        assert monitor.stall_count == 1
+        stack = monitor.stalls[0].stack
+        assert stack is not None
+        assert "_blocking_call" in stack[-1]
+        assert "test_loop_lag_monitor_captures_blocking_stack" in "".join(stack)
+        
+        # Short samples after the stall are not stalls
+        await asyncio.sleep(0.1)
+        assert monitor.stall_count == 1
+        assert monitor.samples > 3
+    finally:
+        await monitor.stop()
+    assert not any(thread.name == "loop-watchdog" for thread in threading.enumerate())
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_and_ping(tmp_path, monkeypatch):
+    """Test pool usage reporting and ping timing out on an exhausted pool."""
+    monkeypatch.setattr(settings, "database_max_overflow", 1)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}", pool_size=1, max_overflow=1)
+    try:
+        assert await ping(engine, timeout=1) < 1
+        assert pool_stats(engine) == {"size": 1, "checked_out": 0, "overflow": 0, "capacity": 2}
+        
+        async with engine.connect() as first, engine.connect() as second:
+            await first.exec_driver_sql("SELECT 1")
+            await second.exec_driver_sql("SELECT 1")
+            assert pool_stats(engine) == {"size": 1, "checked_out": 2, "overflow": 1, "capacity": 2}
+            with pytest.raises(TimeoutError):
+                await ping(engine, timeout=0.05)
+    finally:
+        await engine.dispose()
@@ -0,0 +1,37 @@
+"""Tests for identifier generation and binary UUID storage."""
+import uuid
+
+from sqlalchemy import Column, MetaData, Table, create_engine, insert, select, text
+
+from app.core.ids import BinaryUuid, uuid7
+
+
+def test_uuid7_version_and_variant():
+    """Test that uuid7 sets the RFC 9562 version and variant bits."""
+    value = uuid7()
+    assert value.version == 7
+    assert value.variant == uuid.RFC_4122
+
+
+def test_uuid7_is_monotonic():
+    """Test that ids generated in a burst sort in generation order."""
+    ids = [uuid7() for _ in range(10_000)]
+    assert ids == sorted(ids)
+    assert len(set(ids)) == len(ids)
+
+
+def test_binary_uuid_round_trip_on_sqlite():
+    """Test that BinaryUuid stores 16 raw bytes and reads back a UUID."""
+    metadata = MetaData()
+    table = Table("t", metadata, Column("id", BinaryUuid, primary_key=True))
+    engine = create_engine("sqlite://")
+    metadata.create_all(engine)
+    value = uuid7()
+    
+    with engine.begin() as conn:
+        conn.execute(insert(table).values(id=value))
+        stored = conn.execute(text("SELECT typeof(id), length(id) FROM t")).one()
+        loaded = conn.execute(select(table.c.id).where(table.c.id == value)).scalar_one()
+    
+    assert tuple(stored) == ("blob", 16)
+    assert loaded == value
@@ -0,0 +1,160 @@
+"""Tests for schema versioning and migrations."""
+import asyncio
+import uuid
+from pathlib import Path
+
+import pytest
+from sqlalchemy import func, insert, select, text, update
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.database import Base
+from app.core.migrations import (
+    LATEST_VERSION,
+    SchemaOutdatedError,
+    ensure_schema,
+    get_schema_version,
+    migrate,
+)
+from app.models.counter import DATA_VERSION, STUDENT_COUNT, Counter
+from app.models.grade import Grade
+from app.models.schema_version import SchemaVersion
+from app.models.student import Student
+
+
+@pytest.fixture
+async def engine(tmp_path: Path):
+    """Create an engine on an empty database file."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'schema.db'}")
+    yield engine
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_empty_database_is_unversioned(engine):
+    """Test that a database without the schema_version table reports version 0."""
+    assert await get_schema_version(engine) == 0
+
+
+@pytest.mark.asyncio
+async def test_migrate_is_idempotent(engine):
+    """Test that migrate brings the schema to the latest version exactly once."""
+    assert await migrate(engine) == LATEST_VERSION
+    assert await migrate(engine) == LATEST_VERSION
+    
+    async with engine.connect() as conn:
+        rows = (await conn.execute(select(func.count()).select_from(SchemaVersion))).scalar_one()
+    assert rows == LATEST_VERSION
+
+
+@pytest.mark.asyncio
+async def test_concurrent_migrations_apply_each_step_once(tmp_path: Path):
+    """Test that workers migrating the same database at once take turns instead of failing."""
+    engines = [create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'shared.db'}") for _ in range(4)]
+    try:
+        assert await asyncio.gather(*(migrate(engine) for engine in engines)) == [LATEST_VERSION] * 4
+        async with engines[0].connect() as conn:
+            versions = (await conn.execute(select(SchemaVersion.version))).scalars().all()
+        assert sorted(versions) == list(range(1, LATEST_VERSION + 1))
+    finally:
+        for engine in engines:
+            await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_migrate_adopts_database_created_without_versioning(engine):
+    """Test that databases created by create_all before versioning can be migrated."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    
+    assert await migrate(engine) == LATEST_VERSION
+    assert await get_schema_version(engine) == LATEST_VERSION
+
+
+@pytest.mark.asyncio
+async def test_migrate_seeds_student_counter_from_existing_rows(engine):
+    """Test that the maintained student counter starts from the real row count."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(Student.__table__.insert(), [{"name": "Alice"}, {"name": "Bob"}])
+    
+    await migrate(engine)
+    
+    async with engine.connect() as conn:
+        count = (await conn.execute(select(Counter.value).where(Counter.name == STUDENT_COUNT))).scalar_one()
+    assert count == 2
+
+
+@pytest.mark.asyncio
+async def test_ensure_schema_without_auto_migrate_refuses_outdated_database(engine):
+    """Test that startup fails fast instead of migrating when auto_migrate is off."""
+    with pytest.raises(SchemaOutdatedError, match="python -m app.cli migrate"):
+        await ensure_schema(engine, auto_migrate=False)
+    
+    await migrate(engine)
+    assert await ensure_schema(engine, auto_migrate=False) == LATEST_VERSION
+
+
+@pytest.mark.asyncio
+async def test_ensure_schema_auto_migrates(engine):
+    """Test that startup migrates an empty database when auto_migrate is on."""
+    assert await ensure_schema(engine, auto_migrate=True) == LATEST_VERSION
+
+
+@pytest.mark.asyncio
+async def test_migrate_backfills_change_seq(engine):
+    """Test that rows from before the change feed get seqs after the data version, students first."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        for table in ("students", "grades"):
+            await conn.execute(text(f"DROP INDEX ix_{table}_change_seq"))
+            await conn.execute(text(f"ALTER TABLE {table} DROP COLUMN change_seq"))
+        await conn.execute(insert(SchemaVersion), [{"version": v} for v in (1, 2, 3)])
+        await conn.execute(update(Counter).where(Counter.name == DATA_VERSION).values(value=10))
+        alice, bob = uuid.uuid4(), uuid.uuid4()
+        await conn.execute(
+            text("INSERT INTO students (id, name, created_at) VALUES (:id, :name, :created_at)"),
+            [
+                {"id": bob.hex, "name": "Bob", "created_at": "2024-01-02 00:00:00"},
+                {"id": alice.hex, "name": "Alice", "created_at": "2024-01-01 00:00:00"},
+            ],
+        )
+        await conn.execute(
+            text("INSERT INTO grades (id, student_id, score, created_at) VALUES (:id, :student_id, 90, :created_at)"),
+            [{"id": uuid.uuid4().hex, "student_id": alice.hex, "created_at": "2023-12-31 00:00:00"}],
+        )
+    
+    assert await migrate(engine) == LATEST_VERSION
+    
+    async with engine.connect() as conn:
+        students = (await conn.execute(select(Student.name, Student.change_seq).order_by(Student.change_seq))).all()
+        grade_seq = (await conn.execute(select(Grade.change_seq))).scalar_one()
+        version = (await conn.execute(select(Counter.value).where(Counter.name == DATA_VERSION))).scalar_one()
+    assert [tuple(row) for row in students] == [("Alice", 11), ("Bob", 12)]
+    assert grade_seq == 13
+    assert version == 13
+
+
+@pytest.mark.asyncio
+async def test_migrate_replaces_grade_student_index_and_normalizes_created_at(engine):
+    """Test that v6 swaps ix_grades_student_id for the history index and pads CURRENT_TIMESTAMP values."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(text("DROP INDEX ix_grades_student_id_created_at"))
+        await conn.execute(text("CREATE INDEX ix_grades_student_id ON grades (student_id)"))
+        await conn.execute(insert(SchemaVersion), [{"version": v} for v in (1, 2, 3, 4, 5)])
+        await conn.execute(
+            text("INSERT INTO grades (id, student_id, score, created_at) VALUES (:id, :student_id, 90, :created_at)"),
+            [
+                {"id": uuid.uuid4().hex, "student_id": uuid.uuid4().hex, "created_at": "2024-01-01 00:00:00"},
+                {"id": uuid.uuid4().hex, "student_id": uuid.uuid4().hex, "created_at": "2024-01-02 00:00:00.250000"},
+            ],
+        )
+    
+    assert await migrate(engine) == LATEST_VERSION
+    
+    async with engine.connect() as conn:
+        indexes = (await conn.execute(text("SELECT name FROM sqlite_master WHERE tbl_name = 'grades'"))).scalars().all()
+        created = (await conn.execute(text("SELECT created_at FROM grades ORDER BY created_at"))).scalars().all()
+    assert "ix_grades_student_id_created_at" in indexes
+    assert "ix_grades_student_id" not in indexes
+    assert created == ["2024-01-01 00:00:00.000000", "2024-01-02 00:00:00.250000"]
@@ -0,0 +1,52 @@
+"""Tests for per-request profiling."""
+import pstats
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.core.profiling import PROFILE_FILE_HEADER, ProfilingMiddleware, profile_filename
+
+
+def build_app(directory) -> FastAPI:
+    """Create a small profiled app."""
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware, directory=str(directory))
+    
+    @app.get("/students")
+    async def students():
+        return [{"name": f"Student {i}"} for i in range(10)]
+    
+    return app
+
+
+def test_profile_filename_is_filesystem_safe():
+    """Test that the route and parameters end up in a safe file name."""
+    name = profile_filename("GET", "/students", b"sort_by=avg_grade&offset=100000")
+    
+    assert name.endswith("-GET-students-sort_by=avg_grade_offset=100000.prof")
+    assert "/" not in name and "&" not in name
+
+
+@pytest.mark.asyncio
+async def test_request_with_header_is_profiled(tmp_path):
+    """Test that X-Profile writes a pstats file named in the response."""
+    async with AsyncClient(transport=ASGITransport(app=build_app(tmp_path)), base_url="http://test") as client:
+        response = await client.get("/students", params={"limit": 10}, headers={"X-Profile": "1"})
+    
+    assert response.status_code == 200
+    filename = response.headers[PROFILE_FILE_HEADER]
+    assert "-GET-students-limit=10" in filename
+    stats = pstats.Stats(str(tmp_path / filename))
+    assert any(function == "students" for _, _, function in stats.stats)
+
+
+@pytest.mark.asyncio
+async def test_request_without_header_is_not_profiled(tmp_path):
+    """Test that requests without X-Profile pass through untouched."""
+    async with AsyncClient(transport=ASGITransport(app=build_app(tmp_path)), base_url="http://test") as client:
+        response = await client.get("/students")
+    
+    assert response.status_code == 200
+    assert PROFILE_FILE_HEADER not in response.headers
+    assert list(tmp_path.iterdir()) == []
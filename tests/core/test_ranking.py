@@ -0,0 +1,49 @@
+"""Tests for the in-process average index."""
+import uuid
+
+from app.core.ranking import AverageIndex
+
+
+def test_rank_counts_ties_half():
+    """Test percentile ranks against a brute-force count."""
+    totals = {uuid.uuid4(): (score, 1) for score in (50, 60, 60, 70, 90)}
+    index = AverageIndex()
+    index.rebuild(((sid, total, count) for sid, (total, count) in totals.items()), version=1)
+    
+    averages = [total / count for total, count in totals.values()]
+    for student_id, (total, count) in totals.items():
+        average = total / count
+        below = sum(a < average for a in averages)
+        equal = sum(a == average for a in averages)
+        assert index.rank(student_id) == (average, 100 * (below + equal / 2) / len(averages))
+    assert index.rank(uuid.uuid4()) is None
+
+
+def test_apply_write_moves_average_in_place():
+    """Test that the next write updates the index and later versions leave it stale."""
+    alice, bob = uuid.uuid4(), uuid.uuid4()
+    index = AverageIndex()
+    index.rebuild([(alice, 80, 1)], version=5)
+    
+    index.apply_write(6, student_id=bob, score=90)
+    index.apply_write(7, student_id=alice, score=100)
+    assert index.version == 7
+    assert index.rank(alice) == (90.0, 50.0)
+    assert index.rank(bob) == (90.0, 50.0)
+    
+    # A write by someone else happened in between: not applied
+    index.apply_write(9, student_id=alice, score=0)
+    assert index.version == 7
+    assert index.rank(alice) == (90.0, 50.0)
+
+
+def test_apply_write_without_grade_only_advances_version():
+    """Test that student creation keeps the index current without changing ranks."""
+    index = AverageIndex()
+    index.apply_write(1)
+    assert index.version is None
+    
+    index.rebuild([], version=1)
+    index.apply_write(2)
+    assert index.version == 2
+    assert len(index) == 0
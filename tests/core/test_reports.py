@@ -0,0 +1,133 @@
+"""Tests for report jobs and the report builders."""
+import asyncio
+import csv
+import uuid
+
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.database import Base
+from app.core.reports import ReportJobs, ReportQueueFull, read_only_connection, read_only_url
+from app.dal.grade import add_grade
+from app.dal.student import create_student
+from app.models.grade_summary import GradeSummary
+from app.models.student import Student
+from app.schemas.grade import GradeCreate
+from app.schemas.student import StudentCreate
+from app.services.report import build_percentiles, build_roster
+
+
+@pytest.fixture
+async def database_url(tmp_path):
+    """A file database with three students: two graded (one partly archived), one not."""
+    url = f"sqlite+aiosqlite:///{tmp_path / 'reports.db'}"
+    engine = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        alice = await create_student(session, StudentCreate(name="Alice"))
+        bob = await create_student(session, StudentCreate(name="Bob"))
+        await create_student(session, StudentCreate(name="Carol"))
+        for student, score in [(alice, 90), (alice, 70), (bob, 60)]:
+            await add_grade(session, GradeCreate(student_id=student.id, score=score))
+        # Bob's archived grades: 100 and 80
+        await session.execute(insert(GradeSummary).values(
+            student_id=bob.id, score_sum=180, score_count=2, score_min=80, score_max=100,
+            archived_until=bob.created_at,
+        ))
+        await session.commit()
+    await engine.dispose()
+    return url
+
+
+def _read_csv(path) -> list[dict[str, str]]:
+    with path.open(newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def test_read_only_url():
+    """Test that async URLs become synchronous read-only ones and in-memory SQLite is refused."""
+    url = make_url(read_only_url("sqlite+aiosqlite:////data/app.db"))
+    assert (url.drivername, url.database, dict(url.query)) == ("sqlite", "file:/data/app.db", {"mode": "ro", "uri": "true"})
+    assert read_only_url("postgresql+asyncpg://u:p@db/app") == "postgresql://u:p@db/app"
+    with pytest.raises(ValueError):
+        read_only_url("sqlite+aiosqlite:///:memory:")
+
+
+async def test_report_connection_is_read_only(database_url):
+    """Test that report processes cannot write to the database."""
+    with read_only_connection(database_url) as conn:
+        with pytest.raises(OperationalError):
+            conn.execute(insert(Student).values(id=uuid.uuid4(), name="Mallory"))
+
+
+async def test_build_roster(database_url, tmp_path):
+    """Test that the roster lists every student in name order, archived grades included."""
+    path = tmp_path / "roster.csv"
+    assert build_roster(path, [database_url]) == 3
+    rows = _read_csv(path)
+    assert [(row["name"], row["grade_count"], row["avg_grade"]) for row in rows] == [
+        ("Alice", "2", "80.0"),
+        ("Bob", "3", "80.0"),
+        ("Carol", "0", ""),
+    ]
+
+
+async def test_build_percentiles(database_url, tmp_path):
+    """Test that graded students get the percentile rank GET /students/{id}/percentile returns."""
+    path = tmp_path / "percentiles.csv"
+    assert build_percentiles(path, [database_url]) == 2
+    rows = _read_csv(path)
+    # Tied averages: each has half of the other below it
+    assert [(row["name"], row["avg_grade"], row["percentile_rank"]) for row in rows] == [
+        ("Alice", "80.0", "50.0"),
+        ("Bob", "80.0", "50.0"),
+    ]
+
+
+async def test_report_jobs_run_in_pool(database_url, tmp_path):
+    """Test that a job runs in a pool process and its status file tracks it to completion."""
+    jobs = ReportJobs(str(tmp_path / "reports"), max_workers=1, max_pending=1, retention=3600)
+    try:
+        record = jobs.submit("roster", build_roster, [database_url], scope="acme")
+        assert record["status"] == "running"
+        job_id = uuid.UUID(record["id"])
+        with pytest.raises(ReportQueueFull):
+            jobs.submit("roster", build_roster, [database_url])
+        
+        for _ in range(600):
+            if jobs.status(job_id, scope="acme")["status"] != "running":
+                break
+            await asyncio.sleep(0.05)
+        status = jobs.status(job_id, scope="acme")
+        assert status["status"] == "done", status
+        assert status["rows"] == 3
+        path = jobs.result_path(job_id, scope="acme")
+        assert status["size"] == path.stat().st_size
+        assert len(_read_csv(path)) == 3
+        # Jobs are scoped: not visible without the tenant
+        assert jobs.status(job_id) is None
+        assert jobs.pending == 0
+    finally:
+        jobs.shutdown()
+
+
+async def test_report_jobs_record_failures(tmp_path):
+    """Test that a job failing in the pool is reported with its error."""
+    jobs = ReportJobs(str(tmp_path / "reports"), max_workers=1, max_pending=1, retention=3600)
+    try:
+        record = jobs.submit("roster", build_roster, [f"sqlite+aiosqlite:///{tmp_path / 'missing.db'}"])
+        job_id = uuid.UUID(record["id"])
+        for _ in range(600):
+            if jobs.status(job_id)["status"] != "running":
+                break
+            await asyncio.sleep(0.05)
+        status = jobs.status(job_id)
+        assert status["status"] == "failed"
+        assert "OperationalError" in status["error"]
+        assert not jobs.result_path(job_id).exists()
+    finally:
+        jobs.shutdown()
@@ -0,0 +1,135 @@
+"""Tests for multi-tenancy."""
+import asyncio
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.core.broadcast import Broadcaster
+from app.core.cache import list_cache
+from app.core.config import settings
+from app.cli.__main__ import main as cli_main
+from app.core.tenancy import EngineRegistry, TenantLocal, UnknownTenantError, current_tenant
+from main import app
+
+
+@pytest.fixture
+def tenant_url(tmp_path, monkeypatch):
+    url = f"sqlite+aiosqlite:///{tmp_path}/tenants/{{tenant}}.db"
+    monkeypatch.setattr(settings, "tenant_database_url", url)
+    return url
+
+
+def provision(*tenant_ids: str) -> None:
+    """Create and migrate tenant databases the way operators do."""
+    assert cli_main(["migrate", *(f"--tenant={tenant_id}" for tenant_id in tenant_ids)]) == 0
+
+
+@pytest.mark.asyncio
+async def test_registry_evicts_least_recently_used(tenant_url, tmp_path):
+    """Test that engines open lazily, share concurrent opens and stay within max_engines."""
+    await asyncio.to_thread(provision, "a", "b", "c")
+    registry = EngineRegistry(tenant_url, max_engines=2)
+    try:
+        first, again = await asyncio.gather(registry.get("a"), registry.get("a"))
+        assert first is again
+        await registry.get("b")
+        assert await registry.get("a") is first  # a is now the most recent
+        await registry.get("c")
+        
+        assert len(registry) == 2
+        assert (registry.opened, registry.evicted) == (3, 1)
+        assert await registry.get("a") is first
+        # b was evicted and is reopened
+        assert await registry.get("b") is not None
+        assert registry.opened == 4
+        assert sorted(path.name for path in (tmp_path / "tenants").iterdir()) == ["a.db", "b.db", "c.db"]
+    finally:
+        await registry.close()
+    assert len(registry) == 0
+
+
+@pytest.mark.asyncio
+async def test_tenant_local_keeps_one_instance_per_tenant(tenant_url):
+    """Test that tenant-local state is separate per tenant and from the default."""
+    await asyncio.to_thread(provision, "a", "b")
+    registry = EngineRegistry(tenant_url, max_engines=2)
+    local = TenantLocal(list)
+    try:
+        local.append("default")
+        token = current_tenant.set(await registry.get("a"))
+        local.append("a")
+        assert len(local) == 1
+        current_tenant.set(await registry.get("b"))
+        assert len(local) == 0
+        current_tenant.reset(token)
+        assert local.pop() == "default"
+    finally:
+        await registry.close()
+
+
+def test_broadcaster_routes_events_per_tenant():
+    """Test that subscribers only receive their own tenant's events."""
+    feed = Broadcaster(max_queue=4)
+    with feed.subscribe("a") as a, feed.subscribe("b") as b, feed.subscribe() as default:
+        assert feed.subscribers == 3
+        feed.publish("grade", "{}", tenant="a")
+        assert [len(s._queue) for s in (a, b, default)] == [1, 0, 0]
+    assert feed.subscribers == 0
+
+
+@pytest.mark.asyncio
+async def test_requests_use_their_tenant_database(tenant_url, monkeypatch):
+    """Test that data and cached lists are isolated per tenant header, which is required."""
+    await asyncio.to_thread(provision, "north", "south")
+    monkeypatch.setattr(settings, "list_cache_enabled", True)
+    registry = EngineRegistry(tenant_url, max_engines=1)
+    monkeypatch.setattr("app.core.tenancy.tenant_registry", registry)
+    
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.post("/students", json={"name": "Alice"}, headers={"X-Tenant-ID": "north"})
+            assert response.status_code == 201
+            
+            north = await client.get("/students", headers={"X-Tenant-ID": "north"})
+            south = await client.get("/students", headers={"X-Tenant-ID": "south"})
+            assert [s["name"] for s in north.json()] == ["Alice"]
+            assert south.json() == []
+            # Reopened after eviction (max_engines=1): same data
+            north = await client.get("/students", headers={"X-Tenant-ID": "north"})
+            assert [s["name"] for s in north.json()] == ["Alice"]
+            assert registry.evicted == 2
+            
+            assert (await client.get("/students")).status_code == 400
+            assert (await client.get("/students", headers={"X-Tenant-ID": "../north"})).status_code == 400
+            assert (await client.get("/students", headers={"X-Tenant-ID": "east"})).status_code == 404
+    finally:
+        await registry.close()
+        current_tenant.set(None)
+    assert len(list_cache) == 0  # The default instance was never used
+
+
+@pytest.mark.asyncio
+async def test_registry_only_opens_provisioned_tenants(tenant_url, tmp_path):
+    """Test that unknown tenants are refused without creating files, and the allowlist applies."""
+    await asyncio.to_thread(provision, "a", "b")
+    registry = EngineRegistry(tenant_url, max_engines=4, allowed=["a", "c"])
+    try:
+        assert await registry.get("a") is not None
+        for tenant_id in ["b", "c", "d"]:  # Not allowed; allowed but not provisioned; neither
+            with pytest.raises(UnknownTenantError):
+                await registry.get(tenant_id)
+        assert sorted(path.name for path in (tmp_path / "tenants").iterdir()) == ["a.db", "b.db"]
+        assert registry.opened == 1
+    finally:
+        await registry.close()
+
+
+def test_migrate_provisions_tenants(tenant_url, tmp_path, capsys):
+    """Test python -m app.cli migrate --tenant: creates, migrates and checks tenant databases."""
+    assert cli_main(["migrate", "--tenant", "a", "--check"]) == 1
+    assert "not provisioned" in capsys.readouterr().out
+    assert not (tmp_path / "tenants").exists()
+    
+    provision("a")
+    assert cli_main(["migrate", "--tenant", "a", "--check"]) == 0
+    assert cli_main(["migrate", "--tenant", "../a"]) == 1
@@ -0,0 +1,143 @@
+"""Tests for per-request query timeouts and disconnect cancellation."""
+import time
+import uuid
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import insert, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.core.database import Base, get_db
+from app.core.timeouts import CLIENT_CLOSED_REQUEST, QueryGuard, _current_guard, install_query_guards
+from app.models.grade import Grade
+from app.models.student import Student
+from main import app
+
+# Counts far enough that it would run for minutes if not interrupted
+SLOW_QUERY = text(
+    "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 1000000000) "
+    "SELECT count(*) FROM n"
+)
+
+
+@pytest.fixture
+async def guarded_sessions(tmp_path):
+    """Session factory on a file database with query guards installed."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'guarded.db'}")
+    install_query_guards(engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        # Enough rows for the list query to reach the progress handler
+        students = [{"id": uuid.uuid4(), "name": f"Student {i}"} for i in range(2000)]
+        await conn.execute(insert(Student), students)
+        await conn.execute(
+            insert(Grade),
+            [{"id": uuid.uuid4(), "student_id": s["id"], "score": 50 + i % 50} for i, s in enumerate(students)],
+        )
+    
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    
+    await engine.dispose()
+
+
+@pytest.fixture
+def guarded_app(guarded_sessions):
+    """The app with get_db served from the guarded database."""
+    async def override_get_db():
+        async with guarded_sessions() as session:
+            yield session
+    
+    app.dependency_overrides[get_db] = override_get_db
+    yield app
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.asyncio
+async def test_expired_guard_interrupts_sqlite_query(guarded_sessions):
+    """Test that a query running past the guard's deadline is interrupted."""
+    token = _current_guard.set(QueryGuard(deadline=time.monotonic() + 0.05))
+    try:
+        async with guarded_sessions() as session:
+            started = time.monotonic()
+            with pytest.raises(OperationalError, match="interrupted"):
+                await session.execute(SLOW_QUERY)
+    finally:
+        _current_guard.reset(token)
+    
+    assert time.monotonic() - started < 2
+
+
+@pytest.mark.asyncio
+async def test_connection_is_unguarded_outside_requests(guarded_sessions):
+    """Test that a connection checked out without a guard is not interrupted."""
+    token = _current_guard.set(QueryGuard(deadline=time.monotonic(), cancelled=True))
+    async with guarded_sessions() as session:
+        with pytest.raises(OperationalError):
+            await session.execute(SLOW_QUERY)
+    _current_guard.reset(token)
+    
+    # Same pooled connection, checked out again with no guard set
+    async with guarded_sessions() as session:
+        result = await session.execute(text("SELECT count(*) FROM students"))
+    assert result.scalar_one() == 2000
+
+
+@pytest.mark.asyncio
+async def test_list_timeout_returns_504(guarded_app, monkeypatch):
+    """Test that GET /students past its route timeout fails with 504."""
+    monkeypatch.setattr(settings, "query_timeouts", {"list_students": 1e-6})
+    
+    async with AsyncClient(transport=ASGITransport(app=guarded_app), base_url="http://test") as client:
+        response = await client.get("/students", params={"sort_by": "avg_grade"})
+    
+    assert response.status_code == 504
+    assert "timeout" in response.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_route_without_override_uses_default_timeout(guarded_app, monkeypatch):
+    """Test that other routes keep the default timeout."""
+    monkeypatch.setattr(settings, "query_timeouts", {"list_changes": 1e-6})
+    
+    async with AsyncClient(transport=ASGITransport(app=guarded_app), base_url="http://test") as client:
+        response = await client.get("/students", params={"sort_by": "avg_grade", "limit": 5})
+    
+    assert response.status_code == 200
+    assert len(response.json()) == 5
+
+
+@pytest.mark.asyncio
+async def test_client_disconnect_cancels_query(guarded_app):
+    """Test that in-flight queries stop as soon as the client disconnects."""
+    messages = []
+    requested = False
+    
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        return {"type": "http.disconnect"}
+    
+    async def send(message):
+        messages.append(message)
+    
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/students",
+        "raw_path": b"/students",
+        "query_string": b"sort_by=avg_grade",
+        "root_path": "",
+        "headers": [(b"host", b"test")],
+        "client": ("test", 1234),
+        "server": ("test", 80),
+    }
+    await guarded_app(scope, receive, send)
+    
+    assert messages[0]["status"] == CLIENT_CLOSED_REQUEST
@@ -0,0 +1,120 @@
+"""Tests for sampled request tracing."""
+import json
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.core.database import get_db
+from app.core.tracing import InMemoryExporter, JsonLinesExporter, Span, Trace, TracingMiddleware, _current_trace, install_sql_tracing, span, traced
+from app.dal.student import create_student
+from app.schemas.student import StudentCreate
+from main import app
+
+
+@traced
+async def outer():
+    return await inner()
+
+
+@traced
+async def inner():
+    with span("work", items=3):
+        return 42
+
+
+@pytest.fixture
+async def traced_client(db_session, test_engine):
+    """Client that samples every request into an in-memory exporter."""
+    async def override_get_db():
+        yield db_session
+    
+    install_sql_tracing(test_engine)
+    app.dependency_overrides[get_db] = override_get_db
+    exporter = InMemoryExporter()
+    transport = ASGITransport(app=TracingMiddleware(app, exporter, sample_rate=1.0))
+    
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        yield ac, exporter
+    
+    app.dependency_overrides.clear()
+
+
+def test_span_outside_trace_records_nothing():
+    """Test that spans are no-ops when the request is not sampled."""
+    with span("work") as current:
+        assert current is None
+
+
+@pytest.mark.asyncio
+async def test_traced_functions_nest():
+    """Test that @traced calls and spans nest under each other."""
+    trace = Trace(trace_id="t")
+    token = _current_trace.set(trace)
+    try:
+        assert await outer() == 42
+    finally:
+        _current_trace.reset(token)
+    
+    work, inner_span, outer_span = trace.spans
+    assert outer_span.name == "tests.core.test_tracing.outer"
+    assert outer_span.parent_id is None
+    assert inner_span.parent_id == outer_span.span_id
+    assert work.parent_id == inner_span.span_id
+    assert work.attributes == {"items": 3}
+    assert outer_span.duration >= inner_span.duration >= work.duration
+
+
+def test_json_lines_exporter(tmp_path):
+    """Test that each span becomes one JSON line."""
+    exporter = JsonLinesExporter(str(tmp_path / "traces.jsonl"))
+    spans = [Span(name=f"span{i}", trace_id="t", span_id=str(i), parent_id=None, start=0.0) for i in range(2)]
+    
+    exporter.export(spans)
+    exporter.export(spans[:1])
+    
+    lines = (tmp_path / "traces.jsonl").read_text().splitlines()
+    assert [json.loads(line)["name"] for line in lines] == ["span0", "span1", "span0"]
+
+
+@pytest.mark.asyncio
+async def test_request_spans_cover_every_layer(traced_client, db_session):
+    """Test that a sampled GET /students records http, api, service, dal and SQL spans."""
+    client, exporter = traced_client
+    await create_student(db_session, StudentCreate(name="Alice"))
+    
+    response = await client.get("/students", params={"sort_by": "avg_grade"})
+    
+    assert response.status_code == 200
+    by_name = {s.name: s for s in exporter.spans}
+    http = by_name["http GET /students"]
+    api = by_name["api.list_students"]
+    service = by_name["services.student.list_students_with_avg"]
+    dal = by_name["dal.student.list_students_with_avg"]
+    assert http.parent_id is None
+    assert http.attributes["status"] == 200
+    assert api.parent_id == http.span_id
+    assert service.parent_id == api.span_id
+    assert dal.parent_id == service.span_id
+    
+    statements = [s for s in exporter.spans if s.name == "db.execute" and s.parent_id == dal.span_id]
+    assert any("avg(grades.score)" in s.attributes["statement"] for s in statements)
+    assert {s.trace_id for s in exporter.spans} == {http.trace_id}
+
+
+@pytest.mark.asyncio
+async def test_unsampled_requests_are_not_traced(db_session):
+    """Test that sample_rate=0 exports nothing."""
+    async def override_get_db():
+        yield db_session
+    
+    app.dependency_overrides[get_db] = override_get_db
+    exporter = InMemoryExporter()
+    transport = ASGITransport(app=TracingMiddleware(app, exporter, sample_rate=0.0))
+    try:
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/students")
+    finally:
+        app.dependency_overrides.clear()
+    
+    assert response.status_code == 200
+    assert exporter.spans == []
@@ -0,0 +1,101 @@
+"""Tests for the startup warm-up."""
+import asyncio
+from collections import Counter
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.cache import count_cache, list_cache
+from app.core.config import settings
+from app.core.database import Base
+from app.core.ranking import average_index
+from app.core.warmup import ShapeStats, WarmUp, parse_shape, prime_page_cache, shape_stats
+from app.dal.student import create_student
+from app.models.grade import Grade
+from app.models.student import Student
+from app.schemas.student import StudentCreate
+from app.services.warmup import warm_up
+
+
+def test_parse_shape():
+    """Test that list query strings become typed arguments and others are refused."""
+    assert parse_shape("sort_by=avg_grade&order=desc&min_avg_grade=70&limit=20") == {
+        "sort_by": "avg_grade",
+        "order": "desc",
+        "min_avg_grade": 70.0,
+        "limit": 20,
+    }
+    with pytest.raises(ValueError):
+        parse_shape("sort_by=name&fields=id")
+
+
+def test_shape_stats_round_trip(tmp_path):
+    """Test that first pages are counted, later pages ignored, and the top shapes saved and loaded."""
+    stats = ShapeStats(max_shapes=2)
+    for _ in range(3):
+        stats.record(min_avg_grade=None, sort_by="name", order="asc", limit=100, offset=0)
+    stats.record(min_avg_grade=70.0, sort_by="avg_grade", order="desc", limit=20, offset=0)
+    stats.record(min_avg_grade=None, sort_by="name", order="asc", limit=100, offset=100)
+    stats.record(min_avg_grade=None, sort_by="created_at", order="asc", limit=100, offset=0)  # Over max_shapes
+    assert stats.most_common(5) == [
+        "sort_by=name&order=asc&limit=100",
+        "min_avg_grade=70.0&sort_by=avg_grade&order=desc&limit=20",
+    ]
+    
+    path = tmp_path / "shapes.json"
+    stats.save(path, n=1)
+    loaded = ShapeStats()
+    loaded.load(path)
+    loaded.load(tmp_path / "missing.json")
+    assert loaded.most_common(5) == ["sort_by=name&order=asc&limit=100"]
+    assert parse_shape(loaded.most_common(1)[0]) == {"sort_by": "name", "order": "asc", "limit": 100}
+
+
+@pytest.mark.asyncio
+async def test_prime_page_cache_reads_tables_and_indexes(tmp_path):
+    """Test that every table and index b-tree is read, skipping indexes the database lacks."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'warm.db'}")
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.exec_driver_sql("DROP INDEX ix_grades_created_at")
+        tables = [Student.__table__, Grade.__table__]
+        expected = sum(1 + len(table.indexes) for table in tables) - 1
+        assert await prime_page_cache(engine, tables) == expected
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_warm_up_ends_on_timeout():
+    """Test that a warm-up exceeding its timeout stops and the worker no longer waits for it."""
+    state = WarmUp()
+    state.start(lambda: asyncio.sleep(10), timeout=0.05)
+    assert state.running
+    await state.wait()
+    assert not state.running
+    assert state.seconds < 1
+
+
+@pytest.mark.asyncio
+async def test_warm_up_fills_caches(db_session, test_engine, monkeypatch):
+    """Test that warm-up builds the percentile index and caches each shape with its count."""
+    monkeypatch.setattr(settings, "list_cache_enabled", True)
+    monkeypatch.setattr(shape_stats, "counts", Counter())
+    list_cache.clear()
+    count_cache.clear()
+    await create_student(db_session, StudentCreate(name="Alice"))
+    
+    await warm_up(
+        db_session,
+        {"0": test_engine},
+        [parse_shape("sort_by=name&order=asc"), parse_shape("sort_by=avg_grade&order=desc&min_avg_grade=70")],
+    )
+    
+    assert average_index.version is not None
+    assert len(list_cache) == 2
+    assert count_cache.get(70.0) == 0
+    # Warm-up runs are not requests: learned shapes stay what clients asked for
+    assert shape_stats.most_common(10) == []
+    list_cache.clear()
+    count_cache.clear()
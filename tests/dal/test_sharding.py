@@ -0,0 +1,163 @@
+"""Tests for sharded storage and scatter-gather listing."""
+import uuid
+from pathlib import Path
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.database import Base
+from app.core.sharding import shard_of, sharded_sessionmaker
+from app.dal.change import list_changes
+from app.dal.counter import get_counter
+from app.dal.grade import add_grade
+from app.dal.student import count_students, create_student, list_student_fields, list_students_with_avg
+from app.models.counter import DATA_VERSION
+from app.models.grade import Grade
+from app.models.student import Student
+from app.schemas.grade import GradeCreate
+from app.schemas.student import StudentCreate
+from app.services.grade import add_grade as service_add_grade
+
+SHARD_COUNT = 3
+
+# name -> scores; averages are distinct so the expected order is unambiguous
+GRADES = {
+    "Alice": [80, 90, 100],
+    "Bob": [70, 80],
+    "Charlie": [],
+    "Diana": [95],
+    "Eve": [60],
+    "Frank": [85, 86],
+    "Grace": [],
+    "Heidi": [40, 50],
+}
+
+
+def _avg(scores: list[int]) -> float | None:
+    return sum(scores) / len(scores) if scores else None
+
+
+@pytest.fixture
+async def shards(tmp_path: Path):
+    """Create one engine per shard, each with the full schema."""
+    engines = {
+        str(i): create_async_engine(f"sqlite+aiosqlite:///{tmp_path / f'shard{i}.db'}")
+        for i in range(SHARD_COUNT)
+    }
+    for engine in engines.values():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    yield engines
+    for engine in engines.values():
+        await engine.dispose()
+
+
+@pytest.fixture
+async def sharded_session(shards):
+    """Session over all shards, loaded with GRADES through the DAL."""
+    async with sharded_sessionmaker(shards, expire_on_commit=False)() as session:
+        for name, scores in GRADES.items():
+            student = await create_student(session, StudentCreate(name=name))
+            for score in scores:
+                await add_grade(session, GradeCreate(student_id=student.id, score=score))
+        yield session
+
+
+@pytest.mark.asyncio
+async def test_students_and_grades_share_a_shard(shards, sharded_session):
+    """Test that every row lands on its student's shard and data is spread out."""
+    placed = 0
+    used = 0
+    for shard_id, engine in shards.items():
+        async with engine.connect() as conn:
+            student_ids = (await conn.execute(select(Student.id))).scalars().all()
+            grade_owners = (await conn.execute(select(Grade.student_id))).scalars().all()
+        assert all(shard_of(student_id, SHARD_COUNT) == shard_id for student_id in student_ids)
+        assert set(grade_owners) <= set(student_ids)
+        placed += len(student_ids)
+        used += bool(student_ids)
+    assert placed == len(GRADES)
+    assert used > 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("sort_by", ["name", "avg_grade", "created_at"])
+@pytest.mark.parametrize("order", ["asc", "desc"])
+async def test_list_merges_shards_in_order(sharded_session, sort_by, order):
+    """Test that scatter-gather returns the same order as a single database."""
+    results = await list_students_with_avg(sharded_session, sort_by=sort_by, order=order, limit=100)
+    
+    assert len(results) == len(GRADES)
+    assert {student.name: avg for student, avg in results} == {
+        name: _avg(scores) for name, scores in GRADES.items()
+    }
+    if sort_by == "name":
+        names = [student.name for student, _ in results]
+        assert names == sorted(GRADES, reverse=order == "desc")
+    elif sort_by == "avg_grade":
+        averages = [avg for _, avg in results]
+        graded = sorted((a for a in averages if a is not None), reverse=order == "desc")
+        nulls = [None] * (len(averages) - len(graded))
+        # SQLite sorts NULL first ascending and last descending
+        assert averages == (nulls + graded if order == "asc" else graded + nulls)
+
+
+@pytest.mark.asyncio
+async def test_list_pages_across_shards(sharded_session):
+    """Test that limit/offset pages cover the merged order without gaps or repeats."""
+    expected = sorted(GRADES)
+    pages = [
+        await list_students_with_avg(sharded_session, sort_by="name", limit=3, offset=offset)
+        for offset in range(0, len(GRADES), 3)
+    ]
+    assert [student.name for page in pages for student, _ in page] == expected
+
+
+@pytest.mark.asyncio
+async def test_sparse_fields_sorted_by_unselected_column(sharded_session):
+    """Test that the merge works when the sort column is not requested."""
+    rows = await list_student_fields(sharded_session, ["name"], sort_by="avg_grade", order="desc", limit=2)
+    assert rows == [{"name": "Diana"}, {"name": "Alice"}]
+
+
+@pytest.mark.asyncio
+async def test_counts_are_summed_over_shards(sharded_session):
+    """Test that per-shard counters add up to the totals."""
+    assert await count_students(sharded_session) == len(GRADES)
+    assert await count_students(sharded_session, min_avg_grade=80) == 3
+    writes = len(GRADES) + sum(len(scores) for scores in GRADES.values())
+    assert await get_counter(sharded_session, DATA_VERSION) == writes
+
+
+@pytest.mark.asyncio
+async def test_grade_for_unknown_student_is_rejected(sharded_session):
+    """Test that the student existence check works against the routed shard."""
+    student = (await sharded_session.execute(select(Student).where(Student.name == "Eve"))).scalar_one()
+    grade = await service_add_grade(sharded_session, GradeCreate(student_id=student.id, score=70))
+    assert grade.student_id == student.id
+    
+    with pytest.raises(ValueError):
+        await service_add_grade(sharded_session, GradeCreate(student_id=uuid.uuid4(), score=70))
+
+
+@pytest.mark.asyncio
+async def test_change_feed_covers_every_shard_once(sharded_session):
+    """Test that paging the change feed returns each row once, students before their grades."""
+    after: dict[str, int] = {}
+    seen = []
+    while True:
+        changes, has_more = await list_changes(sharded_session, after=after, limit=4)
+        for shard_id, row in changes:
+            after[shard_id] = row.change_seq
+            seen.append(row)
+        if not has_more:
+            break
+    
+    students = [row for row in seen if isinstance(row, Student)]
+    grades = [row for row in seen if isinstance(row, Grade)]
+    assert sorted(student.name for student in students) == sorted(GRADES)
+    assert len(grades) == sum(len(scores) for scores in GRADES.values())
+    position = {id(row): i for i, row in enumerate(seen)}
+    owner = {student.id: student for student in students}
+    assert all(position[id(owner[grade.student_id])] < position[id(grade)] for grade in grades)
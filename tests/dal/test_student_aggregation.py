@@ -4,7 +4,7 @@ import uuid
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.dal.student import list_students_with_avg
+from app.dal.student import _students_with_avg_statement, list_student_fields, list_students_with_avg
 from app.models.grade import Grade
 from app.models.student import Student
 
@@ -177,3 +177,45 @@ async def test_aggregation_with_single_grade(
     diana = next((s, avg) for s, avg in results if s.name == "Diana")
     assert diana[1] == 95.0, "Single grade should return that grade as average"
 
+
+@pytest.mark.asyncio
+async def test_list_student_fields_matches_full_query(
+    db_session: AsyncSession,
+    test_students: list[Student],
+    test_grades: list[Grade],
+):
+    """Test that sparse field queries return the same rows as the full query."""
+    full = await list_students_with_avg(db_session, sort_by="avg_grade", order="desc")
+    sparse = await list_student_fields(db_session, ["id", "avg_grade"], sort_by="avg_grade", order="desc")
+    
+    assert sparse == [{"id": s.id, "avg_grade": avg} for s, avg in full]
+
+
+@pytest.mark.asyncio
+async def test_list_student_fields_without_grades_join(
+    db_session: AsyncSession,
+    test_students: list[Student],
+    test_grades: list[Grade],
+):
+    """Test that selecting only student columns returns one row per student."""
+    results = await list_student_fields(db_session, ["name"])
+    
+    assert results == [{"name": name} for name in ["Alice", "Bob", "Charlie", "Diana"]]
+
+
+@pytest.mark.asyncio
+async def test_statement_variant_reused_with_new_values(
+    db_session: AsyncSession,
+    test_students: list[Student],
+    test_grades: list[Grade],
+):
+    """Test that one prebuilt statement serves different thresholds and pages."""
+    _students_with_avg_statement.cache_clear()
+    
+    high = await list_students_with_avg(db_session, min_avg_grade=90.0, sort_by="avg_grade")
+    low = await list_students_with_avg(db_session, min_avg_grade=70.0, sort_by="avg_grade", limit=2, offset=1)
+    
+    assert [s.name for s, _ in high] == ["Alice", "Diana"]
+    assert [s.name for s, _ in low] == ["Alice", "Diana"]
+    info = _students_with_avg_statement.cache_info()
+    assert (info.misses, info.hits) == (1, 1)